@@ -0,0 +1,202 @@
+import gzip
+import json
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Tuple
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # headers and body are written separately, avoid the delayed ACK stall of Nagle
+    disable_nagle_algorithm = True
+    server: "_Server"
+
+    def _read_json(self) -> Any:
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        self.server.mock.bytes_received += length
+        encoding = self.headers.get("Content-Encoding")
+        if body and encoding:
+            body = _decompress(body, encoding)
+        return json.loads(body) if body else None
+
+    def _reply(self, status: int, payload: Any) -> None:
+        mock = self.server.mock
+        body = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+        encoding = mock._response_encoding(self.headers.get("Accept-Encoding"))
+        if encoding is not None:
+            body = _compress(body, encoding)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        if encoding is not None:
+            self.send_header("Content-Encoding", encoding)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        # counted before writing, the client may check it as soon as it read the body
+        with mock._lock:
+            mock.bytes_sent += len(body)
+        self.wfile.write(body)
+
+    def _route(self, method: str) -> None:
+        mock = self.server.mock
+        with mock._lock:
+            mock.request_count += 1
+        if mock.latency:
+            time.sleep(mock.latency)
+        params = self._read_json() if method == "POST" else None
+        status, payload = mock.respond(method, self.path, params)
+        self._reply(status, payload)
+
+    def do_GET(self) -> None:
+        self._route("GET")
+
+    def do_POST(self) -> None:
+        self._route("POST")
+
+    def do_DELETE(self) -> None:
+        self._route("DELETE")
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+def _compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "zstd":
+        import zstandard
+
+        return zstandard.ZstdCompressor().compress(body)
+    return gzip.compress(body, mtime=0)
+
+
+def _decompress(body: bytes, encoding: str) -> bytes:
+    if encoding == "zstd":
+        import zstandard
+
+        return zstandard.ZstdDecompressor().decompressobj().decompress(body)
+    if encoding == "gzip":
+        return gzip.decompress(body)
+    raise ValueError(f"unsupported Content-Encoding {encoding}")
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    mock: "MockRecommendServer"
+
+
+class MockRecommendServer:
+    """
+    Local stand-in for the Weaviate Recommend service, implementing the `/v1` routes called by
+    the client with canned responses.
+
+    Args:
+        latency (float): Seconds every request is delayed by, to simulate network and server
+            time. Defaults to 0.
+        property_size (int): Approximate size in bytes of the properties of every recommended
+            item. Defaults to 256.
+        max_results (int): Cap on the number of results returned, whatever the requested
+            limit. Defaults to 1000.
+        compress_responses (bool): Compress the responses with zstd or gzip when the request
+            accepts it, like a server behind a compressing proxy. Request bodies are always
+            decompressed according to their `Content-Encoding`. Defaults to False.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        property_size: int = 256,
+        max_results: int = 1000,
+        compress_responses: bool = False,
+    ):
+        self.latency = latency
+        self.property_size = property_size
+        self.max_results = max_results
+        self.compress_responses = compress_responses
+        self.request_count = 0
+        # bytes of the request and response bodies, as sent over the network
+        self.bytes_received = 0
+        self.bytes_sent = 0
+        self._lock = threading.Lock()
+        # responses are built once per limit, so the server is not the bottleneck
+        self._recommendations: Dict[Tuple[str, int], bytes] = {}
+        self._httpd: Optional[_Server] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        assert self._httpd is not None, "the server is not started"
+        return f"http://127.0.0.1:{self._httpd.server_port}"
+
+    def start(self) -> "MockRecommendServer":
+        self._httpd = _Server(("127.0.0.1", 0), _Handler)
+        self._httpd.mock = self
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def __enter__(self) -> "MockRecommendServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def _response_encoding(self, accept_encoding: Optional[str]) -> Optional[str]:
+        if not self.compress_responses or not accept_encoding:
+            return None
+        accepted = {value.split(";")[0].strip() for value in accept_encoding.split(",")}
+        for encoding in ("zstd", "gzip"):
+            if encoding in accepted:
+                return encoding
+        return None
+
+    def _results(self, key: str, score: str, limit: int) -> bytes:
+        limit = max(0, min(limit, self.max_results))
+        if (key, limit) not in self._recommendations:
+            self._recommendations[(key, limit)] = json.dumps(
+                {
+                    key: [
+                        {
+                            "uuid": str(uuid.uuid4()),
+                            score: i / max(limit, 1),
+                            "properties": {
+                                "title": f"item {i}",
+                                "description": "x" * self.property_size,
+                                "tags": ["mock", "benchmark"],
+                            },
+                        }
+                        for i in range(limit)
+                    ]
+                }
+            ).encode()
+        return self._recommendations[(key, limit)]
+
+    def respond(self, method: str, path: str, params: Any) -> Tuple[int, Any]:
+        """
+        Returns the status code and response of a request, override it to add routes.
+        """
+        if method == "GET":
+            if path == "/health":
+                return 200, {}
+            if path == "/v1/train/status":
+                return 200, {"status": "trained"}
+        if method == "POST":
+            if path == "/v1/item/batch":
+                return 200, {"message": "ok", "num_items_added": len(params)}
+            if path == "/v1/user/batch":
+                return 200, {"message": "ok", "num_interactions_added": len(params)}
+            if path.startswith("/v1/item-recommendations/"):
+                return 200, self._results(
+                    "recommendations", "distance", params.get("limit", 10)
+                )
+            if path == "/v1/search/":
+                return 200, self._results("results", "score", params.get("limit", 10))
+            if path == "/v1/train/":
+                return 200, {"message": "training started"}
+        return 404, {"detail": "Not Found"}
@@ -0,0 +1,340 @@
+"""
+Benchmarks of the client overhead against a local mock of the Recommend service.
+
+    python -m benchmarks.run --output benchmark-results.json
+
+Every benchmark reports its throughput and the p50/p99 latency of a single operation. Results
+are written as JSON, so runs of different releases can be compared.
+"""
+
+import argparse
+import itertools
+import json
+import platform
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from benchmarks.mock_server import MockRecommendServer
+from weaviate_recommend import WeaviateRecommendClient
+from weaviate_recommend.batching import bounded_map
+from weaviate_recommend.compression import zstd_available
+from weaviate_recommend.config import CompressionConfig, ConnectionConfig
+from weaviate_recommend.decoding import decode_recommendations, loads
+from weaviate_recommend.models.data import RecommenderItem, UserInteraction
+from weaviate_recommend.models.filter import CompiledFilters, FilterConfig
+from weaviate_recommend.post_filter import RecommendationCandidates
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, round(q * (len(sorted_values) - 1)))
+    return sorted_values[index]
+
+
+def _summary(
+    name: str, latencies: List[float], elapsed: float, operations: int
+) -> Dict[str, Any]:
+    latencies = sorted(latencies)
+    return {
+        "name": name,
+        "operations": operations,
+        "elapsed_s": elapsed,
+        "throughput_per_s": operations / elapsed if elapsed else 0.0,
+        "p50_ms": _percentile(latencies, 0.5) * 1000,
+        "p99_ms": _percentile(latencies, 0.99) * 1000,
+        "mean_ms": sum(latencies) / len(latencies) * 1000 if latencies else 0.0,
+    }
+
+
+def _timed(fn: Callable[[], Any]) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def _measure(name: str, fn: Callable[[], Any], iterations: int) -> Dict[str, Any]:
+    fn()  # warm up the connection pool and the server side caches
+    start = time.perf_counter()
+    latencies = [_timed(fn) for _ in range(iterations)]
+    return _summary(name, latencies, time.perf_counter() - start, iterations)
+
+
+def bench_single_calls(
+    client: WeaviateRecommendClient, iterations: int, limit: int
+) -> List[Dict[str, Any]]:
+    item_id, user_id = uuid.uuid4(), uuid.uuid4()
+    return [
+        _measure("single.train_status", lambda: client.train_status(), iterations),
+        _measure(
+            "single.from_item",
+            lambda: client.recommendation.item.from_item(item_id, limit=limit),
+            iterations,
+        ),
+        _measure(
+            "single.search",
+            lambda: client.search("benchmark", user_id, limit=limit),
+            iterations,
+        ),
+    ]
+
+
+def bench_batch_ingestion(
+    client: WeaviateRecommendClient, num_records: int, batch_size: int
+) -> List[Dict[str, Any]]:
+    items = [
+        RecommenderItem(id=str(uuid.uuid4()), properties={"title": f"item {i}"})
+        for i in range(num_records)
+    ]
+    interactions = [
+        UserInteraction(
+            user_id=str(uuid.uuid4()),
+            item_id=str(uuid.uuid4()),
+            interaction_property_name="purchased",
+        )
+        for _ in range(num_records)
+    ]
+    results = []
+    for name, send in [
+        ("ingest.items", lambda: client.item.add_batch_stream(items, batch_size)),
+        (
+            "ingest.interactions",
+            lambda: [
+                client.user.add_interactions(interactions[i : i + batch_size])
+                for i in range(0, num_records, batch_size)
+            ],
+        ),
+    ]:
+        elapsed = _timed(send)
+        # a single measurement, the latency is the time of a record in the whole import
+        results.append(_summary(name, [elapsed / num_records], elapsed, num_records))
+    return results
+
+
+def bench_fan_out(
+    client: WeaviateRecommendClient, num_calls: int, concurrency: int, limit: int
+) -> List[Dict[str, Any]]:
+    def recommend(user_id: uuid.UUID) -> float:
+        return _timed(
+            lambda: client.recommendation.item.from_user(user_id, limit=limit)
+        )
+
+    user_ids: Iterable[uuid.UUID] = [uuid.uuid4() for _ in range(num_calls)]
+    start = time.perf_counter()
+    latencies = [
+        result
+        for _, result in bounded_map(recommend, user_ids, concurrency)
+        if isinstance(result, float)
+    ]
+    return [
+        _summary(
+            f"fan_out.from_user.c{concurrency}",
+            latencies,
+            time.perf_counter() - start,
+            len(latencies),
+        )
+    ]
+
+
+def bench_decoding(
+    server: MockRecommendServer, iterations: int, limit: int
+) -> List[Dict[str, Any]]:
+    body = server._results("recommendations", "distance", limit)
+    return [
+        _measure(
+            f"decode.{mode}.limit{limit}",
+            lambda mode=mode: decode_recommendations(loads(body), mode),
+            iterations,
+        )
+        for mode in ("fast", "validate")
+    ]
+
+
+def bench_post_filter(
+    server: MockRecommendServer, iterations: int, limit: int
+) -> List[Dict[str, Any]]:
+    response = decode_recommendations(
+        loads(server._results("recommendations", "distance", 500)), "fast"
+    )
+    toggles = [
+        CompiledFilters(filters)
+        for filters in (
+            [FilterConfig(property_name="title", operator="Like", value="item 1*")],
+            [
+                FilterConfig(
+                    property_name="tags", operator="ContainsAny", value=["mock"]
+                )
+            ],
+        )
+    ]
+    candidates = RecommendationCandidates(response)
+    toggle = itertools.cycle(toggles)
+    return [
+        _measure(
+            "post_filter.first.candidates500",
+            lambda: RecommendationCandidates(response).filter(toggles[0], limit),
+            iterations,
+        ),
+        _measure(
+            "post_filter.toggle.candidates500",
+            lambda: candidates.filter(next(toggle), limit),
+            iterations,
+        ),
+    ]
+
+
+def bench_compression(
+    latency: float,
+    property_size: int,
+    iterations: int,
+    num_records: int,
+    batch_size: int,
+) -> List[Dict[str, Any]]:
+    """
+    Compares uncompressed, gzip and, when `zstandard` is installed, zstd bodies, reporting the
+    bytes sent over the network per operation with the latency.
+    """
+    items = [
+        RecommenderItem(
+            id=str(uuid.uuid4()),
+            properties={"title": f"item {i}", "category": "benchmark", "price": i},
+        )
+        for i in range(num_records)
+    ]
+    item_ids = [uuid.uuid4() for _ in range(10)]
+    algorithms: List[Optional[str]] = [None, "gzip"]
+    if zstd_available():
+        algorithms.append("zstd")
+    results = []
+    for algorithm in algorithms:
+        compression = CompressionConfig(algorithm=algorithm) if algorithm else None
+        with MockRecommendServer(
+            latency, property_size, compress_responses=compression is not None
+        ) as server:
+            with WeaviateRecommendClient(
+                server.url,
+                "key",
+                connection_config=ConnectionConfig(compression=compression),
+            ) as client:
+                name = algorithm or "none"
+                result = _measure(
+                    f"compression.{name}.from_items.limit100",
+                    lambda: client.recommendation.item.from_items(item_ids, limit=100),
+                    iterations,
+                )
+                # the warm up call is counted too
+                result["response_bytes"] = server.bytes_sent / (iterations + 1)
+                results.append(result)
+
+                sent = server.bytes_received
+                elapsed = _timed(
+                    lambda: client.item.add_batch_stream(items, batch_size)
+                )
+                result = _summary(
+                    f"compression.{name}.ingest.items",
+                    [elapsed / num_records],
+                    elapsed,
+                    num_records,
+                )
+                result["request_bytes"] = (server.bytes_received - sent) / num_records
+                results.append(result)
+    return results
+
+
+def run(
+    latency: float = 0.0,
+    property_size: int = 256,
+    iterations: int = 200,
+    limit: int = 10,
+    num_records: int = 10_000,
+    batch_size: int = 1000,
+    concurrency: int = 8,
+) -> Dict[str, Any]:
+    """
+    Runs every benchmark against a fresh mock server and returns the results.
+    """
+    config = {
+        "latency": latency,
+        "property_size": property_size,
+        "iterations": iterations,
+        "limit": limit,
+        "num_records": num_records,
+        "batch_size": batch_size,
+        "concurrency": concurrency,
+    }
+    benchmarks: List[Dict[str, Any]] = []
+    with MockRecommendServer(latency, property_size) as server:
+        connection_config = ConnectionConfig(pool_maxsize=max(10, concurrency))
+        with WeaviateRecommendClient(
+            server.url, "key", connection_config=connection_config
+        ) as client:
+            benchmarks += bench_single_calls(client, iterations, limit)
+            benchmarks += bench_batch_ingestion(client, num_records, batch_size)
+            benchmarks += bench_fan_out(client, iterations, concurrency, limit)
+        benchmarks += bench_decoding(server, iterations, max(limit, 100))
+        benchmarks += bench_post_filter(server, iterations, limit)
+    benchmarks += bench_compression(
+        latency, property_size, iterations, num_records, batch_size
+    )
+    return {
+        "metadata": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "client_version": _client_version(),
+            "orjson": "orjson" in sys.modules,
+            "config": config,
+        },
+        "benchmarks": benchmarks,
+    }
+
+
+def _client_version() -> str:
+    from importlib.metadata import PackageNotFoundError, version
+
+    try:
+        return version("weaviate-recommend-client")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--output", default="benchmark-results.json")
+    parser.add_argument(
+        "--latency-ms", type=float, default=0.0, help="simulated server latency"
+    )
+    parser.add_argument(
+        "--property-size", type=int, default=256, help="bytes of properties per item"
+    )
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--num-records", type=int, default=10_000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args(argv)
+
+    results = run(
+        latency=args.latency_ms / 1000,
+        property_size=args.property_size,
+        iterations=args.iterations,
+        limit=args.limit,
+        num_records=args.num_records,
+        batch_size=args.batch_size,
+        concurrency=args.concurrency,
+    )
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    for result in results["benchmarks"]:
+        print(
+            f"{result['name']:<32} {result['throughput_per_s']:>12.1f}/s"
+            f" p50 {result['p50_ms']:>8.3f}ms p99 {result['p99_ms']:>8.3f}ms"
+        )
+    print(f"results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
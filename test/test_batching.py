@@ -0,0 +1,86 @@
+import asyncio
+import json
+import threading
+import uuid
+
+import pytest
+
+from weaviate_recommend import AsyncWeaviateRecommendClient, WeaviateRecommendClient
+from weaviate_recommend.batching import iter_chunks
+from weaviate_recommend.exceptions import RecommendApiException
+from weaviate_recommend.models.data import RecommenderItem
+
+
+class _FakeTransport:
+    def __init__(self, fail_chunk_containing=None):
+        self.bodies = []
+        self.fail_chunk_containing = fail_chunk_containing
+        self.lock = threading.Lock()
+
+    def _handle(self, url, data):
+        records = json.loads(data)
+        with self.lock:
+            self.bodies.append(data)
+        if self.fail_chunk_containing in [record["id"] for record in records]:
+            raise RecommendApiException("boom")
+        return {"message": "ok", "num_items_added": len(records)}
+
+    def post(self, url, json=None, data=None, **kwargs):
+        return self._handle(url, data)
+
+
+class _AsyncFakeTransport(_FakeTransport):
+    async def post(self, url, json=None, data=None, **kwargs):
+        await asyncio.sleep(0)
+        return self._handle(url, data)
+
+
+def _items(n):
+    for _ in range(n):
+        yield RecommenderItem(id=str(uuid.uuid4()), properties={"title": "x" * 10})
+
+
+def test_iter_chunks_respects_count_and_bytes():
+    records = [(i, b"x" * 10) for i in range(10)]
+    assert [len(chunk) for chunk in iter_chunks(records, 4, 1000)] == [4, 4, 2]
+    # "[" + 3 * 10 bytes + 2 commas + "]" == 34 bytes
+    assert [len(chunk) for chunk in iter_chunks(records, 100, 34)] == [3, 3, 3, 1]
+    assert [len(chunk) for chunk in iter_chunks(records, 100, 5)] == [1] * 10
+
+
+@pytest.mark.parametrize("value", [float("nan"), float("inf")])
+def test_non_finite_properties_are_rejected(value):
+    client = WeaviateRecommendClient("http://localhost", "key")
+    client._transport = _FakeTransport()
+    items = [RecommenderItem(id=str(uuid.uuid4()), properties={"price": value})]
+    # like the body of `add_batch`, rather than sent as invalid JSON
+    with pytest.raises(ValueError):
+        client.item.add_batch_stream(items)
+    assert client._transport.bodies == []
+
+
+def test_add_batch_stream_aggregates_and_reports_failures():
+    items = list(_items(25))
+    client = WeaviateRecommendClient("http://localhost", "key")
+    client._transport = _FakeTransport(fail_chunk_containing=str(items[12].id))
+
+    response = client.item.add_batch_stream(items, batch_size=10, max_in_flight=2)
+
+    assert response.num_chunks == 3
+    assert response.num_items_added == 15
+    assert len(response.failures) == 1
+    assert response.failures[0].chunk_index == 1
+    assert response.failures[0].ids == [str(item.id) for item in items[10:20]]
+    assert all(len(body) <= 8 * 1024 * 1024 for body in client._transport.bodies)
+
+
+def test_async_add_batch_stream():
+    async def run():
+        client = AsyncWeaviateRecommendClient("http://localhost", "key")
+        client._transport = _AsyncFakeTransport()
+        return await client.item.add_batch_stream(_items(25), batch_size=10)
+
+    response = asyncio.run(run())
+    assert response.num_chunks == 3
+    assert response.num_items_added == 25
+    assert response.failures == []
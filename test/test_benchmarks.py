@@ -0,0 +1,41 @@
+import json
+
+from benchmarks.mock_server import MockRecommendServer
+from benchmarks.run import main
+from weaviate_recommend import WeaviateRecommendClient
+
+
+def test_mock_server_serves_client_routes():
+    with MockRecommendServer(property_size=8) as server:
+        with WeaviateRecommendClient(server.url, "key") as client:
+            assert client.train_status().status == "trained"
+            response = client.recommendation.item.from_user(
+                "0f8fad5b-d9cb-469f-a165-70867728950e", limit=3
+            )
+            assert len(response.recommendations) == 3
+        assert server.request_count == 2
+
+
+def test_benchmarks_write_results(tmp_path):
+    output = tmp_path / "results.json"
+    main(
+        [
+            "--output",
+            str(output),
+            "--iterations",
+            "5",
+            "--num-records",
+            "20",
+            "--batch-size",
+            "10",
+            "--concurrency",
+            "2",
+        ]
+    )
+    results = json.loads(output.read_text())
+    names = {benchmark["name"] for benchmark in results["benchmarks"]}
+    assert {"single.from_item", "ingest.items", "fan_out.from_user.c2"} <= names
+    for benchmark in results["benchmarks"]:
+        assert benchmark["operations"] > 0
+        assert benchmark["p99_ms"] >= benchmark["p50_ms"] >= 0
+    assert results["metadata"]["config"]["iterations"] == 5
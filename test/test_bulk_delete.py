@@ -0,0 +1,102 @@
+import asyncio
+import threading
+import uuid
+
+import pytest
+
+from weaviate_recommend import AsyncWeaviateRecommendClient, WeaviateRecommendClient
+from weaviate_recommend.exceptions import RecommendApiException
+
+IDS = [str(uuid.uuid4()) for _ in range(30)]
+
+
+class _FakeTransport:
+    def __init__(self, missing=(), broken=()):
+        self.missing = set(missing)
+        self.broken = set(broken)
+        self.deleted = []
+        self.lock = threading.Lock()
+
+    def delete(self, url, **kwargs):
+        path = url.split("/v1/", 1)[1]
+        if any(target in path for target in self.broken):
+            raise RecommendApiException("internal error", 500)
+        if any(target in path for target in self.missing):
+            raise RecommendApiException("not found", 404)
+        with self.lock:
+            self.deleted.append(path)
+        return {"message": "deleted"}
+
+
+class _AsyncFakeTransport(_FakeTransport):
+    async def delete(self, url, **kwargs):
+        await asyncio.sleep(0)
+        return super().delete(url, **kwargs)
+
+
+def test_delete_item_batch_reports_outcomes():
+    transport = _FakeTransport(missing=[IDS[3]], broken=[IDS[10], IDS[20]])
+    client = WeaviateRecommendClient("http://localhost", "key")
+    client._transport = transport
+    outcomes = []
+
+    response = client.item.delete_batch(
+        iter(IDS + ["not-a-uuid"]), max_in_flight=4, on_outcome=outcomes.append
+    )
+
+    assert response.num_deleted == 27
+    assert response.num_not_found == 1
+    assert response.num_failed == 3
+    assert [failure.index for failure in response.failures] == [10, 20, 30]
+    assert response.failures[-1].id == "not-a-uuid"
+    assert len(outcomes) == 31
+    assert sorted(transport.deleted) == sorted(
+        f"item/{item_id}"
+        for item_id in IDS
+        if item_id not in (IDS[3], IDS[10], IDS[20])
+    )
+
+
+def test_delete_interactions_batch_paths():
+    transport = _FakeTransport()
+    client = WeaviateRecommendClient("http://localhost", "key")
+    client._transport = transport
+
+    client.user.delete_interactions_batch(IDS[:2])
+    client.user.delete_interactions_batch(IDS[:1], interaction_property_name="purchase")
+    response = client.user.delete_interactions_batch(
+        [(IDS[0], IDS[1])], interaction_property_name="purchase"
+    )
+
+    assert response.num_deleted == 1
+    assert transport.deleted == [
+        f"user/{IDS[0]}/interactions",
+        f"user/{IDS[1]}/interactions",
+        f"user/{IDS[0]}/interactions/purchase",
+        f"user/{IDS[0]}/interactions/purchase/{IDS[1]}",
+    ]
+
+    # a pair without a property name fails, without stopping the other targets
+    response = client.user.delete_interactions_batch([(IDS[0], IDS[1]), IDS[2]])
+    assert response.num_deleted == 1
+    assert response.failures[0].id == f"{IDS[0]}/{IDS[1]}"
+
+
+def test_async_delete_users():
+    transport = _AsyncFakeTransport(missing=[IDS[0]])
+    client = AsyncWeaviateRecommendClient("http://localhost", "key")
+    client._transport = transport
+
+    response = asyncio.run(client.user.delete_users(IDS, max_in_flight=8))
+
+    assert response.num_deleted == 29
+    assert response.num_not_found == 1
+    assert response.failures == []
+
+
+@pytest.mark.parametrize("max_in_flight", [0, -1])
+def test_delete_batch_rejects_invalid_concurrency(max_in_flight):
+    client = WeaviateRecommendClient("http://localhost", "key")
+    client._transport = _FakeTransport()
+    with pytest.raises(ValueError):
+        client.item.delete_batch(IDS, max_in_flight=max_in_flight)
@@ -0,0 +1,130 @@
+import json
+import time
+import uuid
+
+import pytest
+
+from weaviate_recommend import WeaviateRecommendClient
+from weaviate_recommend.batching import RateLimiter
+from weaviate_recommend.exceptions import RecommendApiException
+from weaviate_recommend.sinks import JsonlSink
+
+
+class _FakeTransport:
+    def __init__(self, failing=(), status_code=None):
+        self.failing = set(failing)
+        self.status_code = status_code
+        self.requested = []
+
+    def post(self, url, json=None, data=None, decode=None, **kwargs):
+        self.requested.append(json["user_id"])
+        if json["user_id"] in self.failing:
+            raise RecommendApiException("boom", self.status_code)
+        return decode(
+            {
+                "recommendations": [
+                    {"uuid": str(uuid.uuid4()), "distance": 0.5, "properties": {"a": 1}}
+                ]
+            }
+        )
+
+
+def _client(transport):
+    client = WeaviateRecommendClient("http://localhost", "key")
+    client._transport = transport
+    return client
+
+
+USER_IDS = [str(uuid.uuid4()) for _ in range(50)]
+
+
+def test_from_user_bulk_streams_to_callback_and_reports_failures():
+    client = _client(_FakeTransport(failing=[USER_IDS[3]]))
+    results = {}
+    response = client.recommendation.item.from_user_bulk(
+        iter(USER_IDS),
+        lambda user_id, recommendations: results.update({user_id: recommendations}),
+        max_concurrency=8,
+    )
+    assert response.num_succeeded == 49
+    assert response.failed_user_ids == [USER_IDS[3]]
+    assert set(results) == set(USER_IDS) - {USER_IDS[3]}
+
+
+def test_from_user_bulk_resumes_from_checkpoint(tmp_path):
+    checkpoint = str(tmp_path / "checkpoint.json")
+    output = str(tmp_path / "out.jsonl")
+
+    class _Crash(Exception):
+        pass
+
+    def crashing_ids():
+        for i, user_id in enumerate(USER_IDS):
+            if i == 30:
+                raise _Crash()
+            yield user_id
+
+    sink = JsonlSink(output)
+    with pytest.raises(_Crash):
+        _client(_FakeTransport()).recommendation.item.from_user_bulk(
+            crashing_ids(), sink, checkpoint_path=checkpoint, checkpoint_every=10
+        )
+    sink.close()
+    assert json.load(open(checkpoint))["completed"] >= 10
+
+    transport = _FakeTransport()
+    sink = JsonlSink(output)
+    response = _client(transport).recommendation.item.from_user_bulk(
+        USER_IDS, sink, checkpoint_path=checkpoint, checkpoint_every=10
+    )
+    sink.close()
+    assert response.num_skipped + response.num_succeeded == 50
+    assert set(transport.requested) == set(USER_IDS[response.num_skipped :])
+    written = {json.loads(line)["user_id"] for line in open(output)}
+    assert written == set(USER_IDS)
+    assert json.load(open(checkpoint))["completed"] == 50
+
+
+def test_from_user_bulk_resume_retries_failed_users(tmp_path):
+    checkpoint = str(tmp_path / "checkpoint.json")
+    item = _client(_FakeTransport(failing=[USER_IDS[12]])).recommendation.item
+    response = item.from_user_bulk(
+        USER_IDS, lambda *_: None, checkpoint_path=checkpoint, checkpoint_every=5
+    )
+    assert response.failed_user_ids == [USER_IDS[12]]
+    assert json.load(open(checkpoint))["completed"] == 12
+
+    transport = _FakeTransport()
+    response = _client(transport).recommendation.item.from_user_bulk(
+        USER_IDS, lambda *_: None, checkpoint_path=checkpoint
+    )
+    assert response.num_skipped == 12
+    assert response.num_failed == 0
+    assert USER_IDS[12] in transport.requested
+    assert json.load(open(checkpoint))["completed"] == 50
+
+
+def test_from_user_bulk_checkpoint_moves_past_permanent_failures(tmp_path):
+    checkpoint = str(tmp_path / "checkpoint.json")
+    transport = _FakeTransport(failing=[USER_IDS[12]], status_code=404)
+    response = _client(transport).recommendation.item.from_user_bulk(
+        USER_IDS, lambda *_: None, checkpoint_path=checkpoint, checkpoint_every=5
+    )
+    assert response.failed_user_ids == [USER_IDS[12]]
+    assert json.load(open(checkpoint))["completed"] == 50
+    assert open(checkpoint + ".failed").read() == USER_IDS[12] + "\n"
+
+    transport = _FakeTransport()
+    response = _client(transport).recommendation.item.from_user_bulk(
+        USER_IDS, lambda *_: None, checkpoint_path=checkpoint
+    )
+    assert response.num_skipped == 50
+    assert transport.requested == []
+
+
+def test_rate_limiter_spaces_calls():
+    limiter = RateLimiter(100)
+    start = time.monotonic()
+    for _ in range(11):
+        limiter.acquire()
+    assert time.monotonic() - start >= 0.09
@@ -0,0 +1,105 @@
+import time
+import uuid
+
+from weaviate_recommend import WeaviateRecommendClient
+from weaviate_recommend.cache import RecommendationCache
+from weaviate_recommend.models.filter import FilterConfig
+
+RECOMMENDATIONS = {
+    "recommendations": [{"uuid": str(uuid.uuid4()), "distance": 0.1, "properties": {}}]
+}
+
+
+class _FakeTransport:
+    def __init__(self):
+        self.calls = []
+        self.status = "trained"
+
+    def post(self, url, json=None, data=None, decode=None, **kwargs):
+        self.calls.append(url)
+        if url.endswith("/train/"):
+            return {"message": "training"}
+        return decode(RECOMMENDATIONS)
+
+    def get(self, url, **kwargs):
+        self.calls.append(url)
+        return {"status": self.status}
+
+
+def _client(cache):
+    client = WeaviateRecommendClient(
+        "http://localhost", "key", recommendation_cache=cache
+    )
+    client._transport = _FakeTransport()
+    return client
+
+
+def test_lru_eviction_and_stats():
+    cache = RecommendationCache(max_size=2, ttl=None)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.evictions, stats.size) == (2, 1, 1, 2)
+
+
+def test_ttl_expiry():
+    cache = RecommendationCache(ttl=0.01)
+    cache.put("a", 1)
+    time.sleep(0.02)
+    assert cache.get("a") is None
+    assert cache.stats().expirations == 1
+
+
+def test_item_recommendations_are_cached_by_normalised_params():
+    cache = RecommendationCache()
+    client = _client(cache)
+    item_id = uuid.uuid4()
+    filters = [FilterConfig(property_name="price", operator="LessThan", value=10)]
+    first = client.recommendation.item.from_item(item_id, filters=filters)
+    second = client.recommendation.item.from_item(str(item_id), filters=list(filters))
+    assert first is second
+    assert len(client._transport.calls) == 1
+    client.recommendation.item.from_item(item_id, limit=5, filters=filters)
+    assert len(client._transport.calls) == 2
+    client.recommendation.item.from_user(uuid.uuid4())
+    client.recommendation.item.from_user(uuid.uuid4())
+    assert len(client._transport.calls) == 4
+
+
+def test_cache_is_invalidated_by_training():
+    cache = RecommendationCache()
+    client = _client(cache)
+    item_id = uuid.uuid4()
+    client.recommendation.item.from_item(item_id)
+    client.train()
+    assert cache.stats().size == 0
+
+    client.recommendation.item.from_item(item_id)
+    client.train_status()
+    assert cache.stats().size == 1
+    client._transport.status = "training"
+    client.train_status()
+    assert cache.stats().size == 0
+
+
+def test_response_requested_before_training_is_not_cached():
+    cache = RecommendationCache()
+    client = _client(cache)
+    transport = client._transport
+
+    class _TrainingTransport(_FakeTransport):
+        def post(self, url, json=None, data=None, **kwargs):
+            # training starts while the recommendation request is in flight
+            cache.clear()
+            return transport.post(url, json, data, **kwargs)
+
+    client._transport = _TrainingTransport()
+    client.recommendation.item.from_item(uuid.uuid4())
+    assert cache.stats().size == 0
+
+    cache.put("a", 1, cache.generation)
+    assert cache.get("a") == 1
@@ -0,0 +1,165 @@
+import asyncio
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from weaviate_recommend import AsyncWeaviateRecommendClient, WeaviateRecommendClient
+from weaviate_recommend.coalescing import _AsyncSingleFlight, _SingleFlight
+from weaviate_recommend.exceptions import RecommendApiException
+
+ITEM_ID = str(uuid.uuid4())
+RESPONSE = {
+    "recommendations": [{"uuid": str(uuid.uuid4()), "properties": {}, "score": 1.0}]
+}
+
+
+class _FakeTransport:
+    def __init__(self, latency=0.1):
+        self.latency = latency
+        self.requests = []
+        self.lock = threading.Lock()
+
+    def post(self, url, json=None, decode=None, **kwargs):
+        with self.lock:
+            self.requests.append(json)
+        time.sleep(self.latency)
+        return decode(RESPONSE)
+
+
+class _AsyncFakeTransport(_FakeTransport):
+    async def post(self, url, json=None, decode=None, **kwargs):
+        self.requests.append(json)
+        await asyncio.sleep(self.latency)
+        return decode(RESPONSE)
+
+
+def test_identical_calls_send_one_request():
+    transport = _FakeTransport()
+    client = WeaviateRecommendClient("http://localhost", "key", coalesce_requests=True)
+    client._transport = transport
+
+    barrier = threading.Barrier(16)
+
+    def recommend(index):
+        barrier.wait()
+        return client.recommendation.item.from_item(ITEM_ID, limit=5 + index % 2)
+
+    with ThreadPoolExecutor(16) as executor:
+        responses = list(executor.map(recommend, range(16)))
+
+    assert len(transport.requests) == 2
+    assert all(
+        response is responses[index % 2] for index, response in enumerate(responses)
+    )
+    # a call made after the shared one completed is sent again
+    client.recommendation.item.from_item(ITEM_ID, limit=5)
+    assert len(transport.requests) == 3
+
+
+@pytest.mark.parametrize(
+    "coalesce_requests, recommend",
+    [
+        (False, lambda item: item.from_item(ITEM_ID)),
+        (True, lambda item: item.from_user(ITEM_ID, shuffle=True)),
+    ],
+)
+def test_calls_not_coalesced(coalesce_requests, recommend):
+    transport = _FakeTransport(latency=0.05)
+    client = WeaviateRecommendClient(
+        "http://localhost", "key", coalesce_requests=coalesce_requests
+    )
+    client._transport = transport
+
+    with ThreadPoolExecutor(4) as executor:
+        list(executor.map(lambda _: recommend(client.recommendation.item), range(4)))
+
+    assert len(transport.requests) == 4
+
+
+def test_waiters_receive_the_exception():
+    single_flight = _SingleFlight()
+    started = threading.Event()
+
+    def fail():
+        started.set()
+        time.sleep(0.1)
+        raise RecommendApiException("unavailable", 503)
+
+    def waiter():
+        started.wait()
+        return single_flight.do("key", lambda: "not called")
+
+    with ThreadPoolExecutor(2) as executor:
+        leader = executor.submit(single_flight.do, "key", fail)
+        follower = executor.submit(waiter)
+        for future in (leader, follower):
+            with pytest.raises(RecommendApiException):
+                future.result()
+    assert single_flight.do("key", lambda: "called") == "called"
+
+
+def test_async_identical_calls_send_one_request():
+    async def main():
+        transport = _AsyncFakeTransport()
+        client = AsyncWeaviateRecommendClient(
+            "http://localhost", "key", coalesce_requests=True
+        )
+        client._transport = transport
+        responses = await asyncio.gather(
+            *(client.recommendation.item.from_item(ITEM_ID) for _ in range(32))
+        )
+        return transport, responses
+
+    transport, responses = asyncio.run(main())
+    assert len(transport.requests) == 1
+    assert all(response is responses[0] for response in responses)
+
+
+def test_async_cancelled_waiter_does_not_cancel_the_call():
+    async def main():
+        single_flight = _AsyncSingleFlight()
+
+        async def slow():
+            await asyncio.sleep(0.05)
+            return "done"
+
+        leader = asyncio.ensure_future(single_flight.do("key", slow))
+        await asyncio.sleep(0)
+        waiter = asyncio.ensure_future(single_flight.do("key", slow))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        return await leader
+
+    assert asyncio.run(main()) == "done"
+
+
+def test_async_cancelled_leader_does_not_cancel_the_waiters():
+    async def main():
+        single_flight = _AsyncSingleFlight()
+        calls = []
+
+        async def slow():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return "done"
+
+        leader = asyncio.ensure_future(
+            asyncio.wait_for(single_flight.do("key", slow), timeout=0.01)
+        )
+        await asyncio.sleep(0)
+        waiter = asyncio.ensure_future(single_flight.do("key", slow))
+        with pytest.raises(asyncio.TimeoutError):
+            await leader
+        result = await waiter
+
+        # the call is cancelled once every caller gave up on it
+        lone = asyncio.ensure_future(single_flight.do("other", slow))
+        await asyncio.sleep(0)
+        lone.cancel()
+        await asyncio.sleep(0)
+        return result, len(calls), single_flight._calls
+
+    assert asyncio.run(main()) == ("done", 2, {})
@@ -0,0 +1,105 @@
+import asyncio
+import gzip
+import json
+import uuid
+
+import pytest
+
+from benchmarks.mock_server import MockRecommendServer
+from weaviate_recommend import AsyncWeaviateRecommendClient, WeaviateRecommendClient
+from weaviate_recommend.compression import _Compressor, zstd_available
+from weaviate_recommend.config import CompressionConfig, ConnectionConfig
+from weaviate_recommend.models.data import RecommenderItem
+
+ITEM_IDS = [str(uuid.uuid4()) for _ in range(5)]
+
+
+def _config(**kwargs):
+    return ConnectionConfig(compression=CompressionConfig(**kwargs))
+
+
+def test_compressor_skips_small_bodies():
+    compressor = _Compressor(CompressionConfig(min_size=100))
+    assert compressor.compress(b"[]") == (b"[]", None)
+    assert compressor.compress(None) == (None, None)
+    body = json.dumps([{"id": str(i), "title": "item"} for i in range(50)]).encode()
+    compressed, encoding = compressor.compress(body)
+    assert encoding == "gzip"
+    assert gzip.decompress(compressed) == body
+    assert len(compressed) < len(body) / 2
+
+
+def test_compressed_requests_and_responses():
+    items = [
+        RecommenderItem(id=str(uuid.uuid4()), properties={"title": f"item {i}"})
+        for i in range(200)
+    ]
+    with MockRecommendServer(compress_responses=True) as server:
+        with WeaviateRecommendClient(
+            server.url, "key", connection_config=_config()
+        ) as client:
+            response = client.item.add_batch(items)
+            assert response.num_items_added == 200
+            uncompressed = len(
+                json.dumps([item.model_dump(mode="json") for item in items]).encode()
+            )
+            assert server.bytes_received < uncompressed / 2
+
+            sent = server.bytes_sent
+            response = client.recommendation.item.from_items(ITEM_IDS, limit=50)
+            assert len(response.recommendations) == 50
+            assert (
+                server.bytes_sent - sent
+                < len(server._results("recommendations", "distance", 50)) / 2
+            )
+
+
+def test_responses_not_compressed_when_disabled():
+    with MockRecommendServer(compress_responses=True) as server:
+        with WeaviateRecommendClient(
+            server.url, "key", connection_config=_config(compress_responses=False)
+        ) as client:
+            client.recommendation.item.from_items(ITEM_IDS, limit=50)
+            body = server._results("recommendations", "distance", 50)
+            assert server.bytes_sent == len(body)
+
+
+def test_async_compressed_requests_and_responses():
+    async def main(url):
+        async with AsyncWeaviateRecommendClient(
+            url, "key", connection_config=_config(min_size=0)
+        ) as client:
+            return await client.recommendation.item.from_items(ITEM_IDS, limit=50)
+
+    with MockRecommendServer(compress_responses=True) as server:
+        response = asyncio.run(main(server.url))
+        assert len(response.recommendations) == 50
+        assert server.bytes_sent < len(
+            server._results("recommendations", "distance", 50)
+        )
+
+
+@pytest.mark.skipif(zstd_available(), reason="zstandard is installed")
+def test_zstd_requires_zstandard():
+    with pytest.raises(ImportError, match="zstandard"):
+        WeaviateRecommendClient("http://localhost", "key", _config(algorithm="zstd"))
+
+
+@pytest.mark.parametrize("decodes_zstd", [False, True])
+def test_zstd_accepted_only_when_decodable(monkeypatch, decodes_zstd):
+    import httpx._decoders
+    import urllib3.response
+
+    decoders = dict(httpx._decoders.SUPPORTED_DECODERS)
+    if decodes_zstd:
+        decoders["zstd"] = object
+    else:
+        decoders.pop("zstd", None)
+    monkeypatch.setattr(httpx._decoders, "SUPPORTED_DECODERS", decoders)
+    monkeypatch.setattr(urllib3.response, "HAS_ZSTD", decodes_zstd, raising=False)
+    expected = "zstd, gzip" if decodes_zstd else "gzip"
+
+    client = WeaviateRecommendClient("http://localhost", "key", _config())
+    assert client._transport._session.headers["Accept-Encoding"] == expected
+    async_client = AsyncWeaviateRecommendClient("http://localhost", "key", _config())
+    assert async_client._transport._client.headers["Accept-Encoding"] == expected
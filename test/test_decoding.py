@@ -0,0 +1,63 @@
+import uuid
+
+import pytest
+from pydantic import ValidationError
+
+from weaviate_recommend import WeaviateRecommendClient
+from weaviate_recommend.decoding import decode_recommendations, decode_search_results
+from weaviate_recommend.models.responses import (
+    PersonalisedSearchResponse,
+    RecommendationsResponse,
+)
+
+RECOMMENDATIONS = {
+    "recommendations": [
+        {
+            "uuid": str(uuid.uuid4()),
+            "distance": 0.1 * i,
+            "properties": {"title": f"item {i}", "tags": ["a", "b"]},
+        }
+        for i in range(5)
+    ]
+}
+
+SEARCH_RESULTS = {
+    "results": [{"uuid": str(uuid.uuid4()), "score": 0.5, "properties": {"x": 1}}]
+}
+
+
+class _FakeTransport:
+    def post(self, url, json=None, data=None, decode=None, **kwargs):
+        return decode(SEARCH_RESULTS if url.endswith("/search/") else RECOMMENDATIONS)
+
+
+def test_fast_decode_matches_validated_models():
+    fast = decode_recommendations(RECOMMENDATIONS, "fast")
+    assert isinstance(fast, RecommendationsResponse)
+    assert fast == RecommendationsResponse.model_validate(RECOMMENDATIONS)
+    assert fast.model_dump() == RECOMMENDATIONS
+    assert fast.recommendations[2].properties["title"] == "item 2"
+
+    search = decode_search_results(SEARCH_RESULTS, "fast")
+    assert isinstance(search, PersonalisedSearchResponse)
+    assert search == PersonalisedSearchResponse.model_validate(SEARCH_RESULTS)
+
+
+def test_validate_mode_rejects_invalid_responses():
+    invalid = {"recommendations": [{"uuid": "x", "distance": "far", "properties": {}}]}
+    assert decode_recommendations(invalid, "fast").recommendations[0].distance == "far"
+    with pytest.raises(ValidationError):
+        decode_recommendations(invalid, "validate")
+
+
+@pytest.mark.parametrize("mode", ["fast", "validate"])
+def test_client_decode_mode(mode):
+    client = WeaviateRecommendClient("http://localhost", "key", decode_mode=mode)
+    client._transport = _FakeTransport()
+    user_id = uuid.uuid4()
+    assert client.recommendation.item.from_user(
+        user_id
+    ) == RecommendationsResponse.model_validate(RECOMMENDATIONS)
+    assert client.search("text", user_id) == PersonalisedSearchResponse.model_validate(
+        SEARCH_RESULTS
+    )
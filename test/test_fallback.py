@@ -0,0 +1,237 @@
+import asyncio
+import threading
+import time
+import uuid
+
+import pytest
+
+from weaviate_recommend import AsyncWeaviateRecommendClient, WeaviateRecommendClient
+from weaviate_recommend.cache import RecommendationCache
+from weaviate_recommend.exceptions import RecommendApiException
+from weaviate_recommend.fallback import (
+    DiskFallbackStore,
+    MemoryFallbackStore,
+    RecommendationFallback,
+)
+
+ITEM_ID = str(uuid.uuid4())
+
+
+def _response(score):
+    return {
+        "recommendations": [
+            {"uuid": str(uuid.uuid4()), "properties": {}, "score": score}
+        ]
+    }
+
+
+class _FakeTransport:
+    def __init__(self):
+        self.error = None
+        self.latency = 0.0
+        self.calls = 0
+        self.done = threading.Event()
+
+    def post(self, url, **kwargs):
+        self.calls += 1
+        time.sleep(self.latency)
+        self.done.set()
+        if self.error is not None:
+            raise self.error
+        return _response(float(self.calls))
+
+    def close(self):
+        pass
+
+
+class _AsyncFakeTransport(_FakeTransport):
+    async def post(self, url, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        if self.error is not None:
+            raise self.error
+        return _response(float(self.calls))
+
+    async def close(self):
+        pass
+
+
+def _client(transport, fallback):
+    client = WeaviateRecommendClient(
+        "http://localhost", "key", recommendation_fallback=fallback
+    )
+    client._transport = transport
+    return client
+
+
+def test_serves_stored_response_on_error():
+    transport = _FakeTransport()
+    fallback = RecommendationFallback()
+    client = _client(transport, fallback)
+
+    fresh = client.recommendation.item.from_item(ITEM_ID)
+    transport.error = RecommendApiException("unavailable", 503)
+    stale = client.recommendation.item.from_item(ITEM_ID)
+
+    assert stale.recommendations[0].score == fresh.recommendations[0].score
+    # another request has no stored response
+    with pytest.raises(RecommendApiException):
+        client.recommendation.item.from_item(ITEM_ID, limit=5)
+    # errors caused by the request are not hidden
+    transport.error = RecommendApiException("invalid filter", 422)
+    with pytest.raises(RecommendApiException):
+        client.recommendation.item.from_item(ITEM_ID)
+    assert fallback.stats().model_dump() == {
+        "stored": 1,
+        "served_on_error": 1,
+        "served_on_slow": 0,
+        "misses": 1,
+    }
+
+
+def test_served_responses_do_not_share_state_with_the_store():
+    transport = _FakeTransport()
+    client = _client(transport, RecommendationFallback())
+
+    fresh = client.recommendation.item.from_item(ITEM_ID)
+    fresh.recommendations[0].properties["title"] = "changed"
+    transport.error = RecommendApiException("unavailable", 503)
+    stale = client.recommendation.item.from_item(ITEM_ID)
+    stale.recommendations.pop()
+
+    assert stale.recommendations == []
+    assert (
+        client.recommendation.item.from_item(ITEM_ID).recommendations[0].properties
+        == {}
+    )
+
+
+def test_client_close_writes_the_disk_store(tmp_path):
+    path = str(tmp_path / "fallback.db")
+    fallback = RecommendationFallback(store=DiskFallbackStore(path, flush_interval=60))
+    client = _client(_FakeTransport(), fallback)
+    client.recommendation.item.from_item(ITEM_ID)
+    client.close()
+
+    reopened = DiskFallbackStore(path)
+    [(key,)] = reopened._db.execute("SELECT key FROM responses").fetchall()
+    assert reopened.get(key) is not None
+    reopened.close()
+
+
+def test_async_client_close_writes_the_disk_store(tmp_path):
+    path = str(tmp_path / "fallback.db")
+    fallback = RecommendationFallback(store=DiskFallbackStore(path, flush_interval=60))
+
+    async def main():
+        client = AsyncWeaviateRecommendClient(
+            "http://localhost", "key", recommendation_fallback=fallback
+        )
+        client._transport = _AsyncFakeTransport()
+        await client.recommendation.item.from_item(ITEM_ID)
+        await client.close()
+
+    asyncio.run(main())
+    reopened = DiskFallbackStore(path)
+    assert reopened._db.execute("SELECT COUNT(*) FROM responses").fetchone() == (1,)
+    reopened.close()
+
+
+def test_stale_responses_are_not_cached():
+    transport = _FakeTransport()
+    client = WeaviateRecommendClient(
+        "http://localhost",
+        "key",
+        recommendation_cache=RecommendationCache(),
+        recommendation_fallback=RecommendationFallback(),
+    )
+    client._transport = transport
+    client.recommendation.item.from_item(ITEM_ID)
+    client.recommendation_cache.clear()
+
+    transport.error = RecommendApiException("unavailable", 503)
+    stale = client.recommendation.item.from_item(ITEM_ID)
+    transport.error = None
+    fresh = client.recommendation.item.from_item(ITEM_ID)
+
+    assert stale.recommendations[0].score == 1.0
+    assert fresh.recommendations[0].score == 3.0
+
+
+def test_serves_stored_response_when_slow_and_refreshes_it():
+    transport = _FakeTransport()
+    fallback = RecommendationFallback(slow_threshold=0.05)
+    client = _client(transport, fallback)
+    client.recommendation.item.from_item(ITEM_ID)
+
+    transport.latency = 0.3
+    transport.done.clear()
+    start = time.perf_counter()
+    stale = client.recommendation.item.from_item(ITEM_ID)
+
+    assert time.perf_counter() - start < 0.25
+    assert stale.recommendations[0].score == 1.0
+    transport.done.wait(1)
+    time.sleep(0.05)
+    transport.latency = 0.0
+    transport.error = RecommendApiException("unavailable", 503)
+    refreshed = client.recommendation.item.from_item(ITEM_ID)
+    assert refreshed.recommendations[0].score == 2.0
+    assert fallback.stats().served_on_slow == 1
+    fallback.close()
+
+
+def test_stale_responses_expire():
+    store = MemoryFallbackStore()
+    store.put("key", {"a": 1})
+    fallback = RecommendationFallback(store=store, max_age=-1)
+    with pytest.raises(RecommendApiException):
+        fallback.fetch("key", _raise)
+
+
+def _raise():
+    raise RecommendApiException("unavailable", 503)
+
+
+def test_disk_store_survives_reopen(tmp_path):
+    path = str(tmp_path / "fallback.db")
+    store = DiskFallbackStore(path, max_size=2, flush_interval=60)
+    for index in range(3):
+        store.put(f"key-{index}", {"index": index})
+        time.sleep(0.001)
+    # pending responses are readable before they are written
+    assert store.get("key-0")[1] == {"index": 0}
+    store.close()
+
+    reopened = DiskFallbackStore(path)
+    fallback = RecommendationFallback(store=reopened)
+    assert reopened.get("key-0") is None
+    assert fallback.fetch("key-2", _raise) == ({"index": 2}, True)
+    fallback.close()
+
+
+def test_async_serves_stored_response():
+    async def main():
+        transport = _AsyncFakeTransport()
+        fallback = RecommendationFallback(slow_threshold=0.05)
+        client = AsyncWeaviateRecommendClient(
+            "http://localhost", "key", recommendation_fallback=fallback
+        )
+        client._transport = transport
+        await client.recommendation.item.from_item(ITEM_ID)
+
+        transport.latency = 0.3
+        start = time.perf_counter()
+        stale = await client.recommendation.item.from_item(ITEM_ID)
+        elapsed = time.perf_counter() - start
+        await asyncio.sleep(0.4)
+
+        transport.latency = 0.0
+        transport.error = RecommendApiException("unavailable", 503)
+        refreshed = await client.recommendation.item.from_item(ITEM_ID)
+        return elapsed, stale, refreshed
+
+    elapsed, stale, refreshed = asyncio.run(main())
+    assert elapsed < 0.25
+    assert stale.recommendations[0].score == 1.0
+    assert refreshed.recommendations[0].score == 2.0
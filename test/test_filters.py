@@ -0,0 +1,92 @@
+import uuid
+
+import pytest
+
+from weaviate_recommend import WeaviateRecommendClient
+from weaviate_recommend.cache import RecommendationCache
+from weaviate_recommend.models.filter import (
+    CompiledFilters,
+    FilterConfig,
+    ItemPropertyReference,
+)
+from weaviate_recommend.models.search import SearchQuery
+
+FILTERS = [
+    FilterConfig(property_name="tenant", operator="Equal", value="acme"),
+    FilterConfig(property_name="price", operator="LessThan", value=100),
+    FilterConfig(
+        property_name="category",
+        operator="Equal",
+        value=ItemPropertyReference(type="ItemPropertyReference"),
+    ),
+]
+
+
+class _FakeTransport:
+    def __init__(self):
+        self.bodies = []
+
+    def post(self, url, json=None, data=None, decode=None, **kwargs):
+        self.bodies.append(json)
+        if url.endswith("/configured/"):
+            return {
+                "endpoint_name": "e",
+                "from": "item",
+                "to": "items",
+                "message": "ok",
+            }
+        if url.endswith("/search/"):
+            return decode({"results": []})
+        return decode({"recommendations": []})
+
+
+def _client(**kwargs):
+    client = WeaviateRecommendClient("http://localhost", "key", **kwargs)
+    client._transport = _FakeTransport()
+    return client
+
+
+def test_compiled_filters_are_immutable_values():
+    compiled = CompiledFilters(FILTERS)
+    assert compiled == CompiledFilters(list(FILTERS))
+    assert hash(compiled) == hash(CompiledFilters(list(FILTERS)))
+    assert compiled != CompiledFilters(FILTERS[:2])
+    assert list(compiled) == FILTERS and len(compiled) == 3
+    assert compiled.params == [f.model_dump() for f in FILTERS]
+    # params are copies, modifying them leaves the compiled filters intact
+    params = compiled.params
+    params[0]["value"] = "changed"
+    params[2]["value"]["type"] = "changed"
+    assert compiled.params == [f.model_dump() for f in FILTERS]
+    assert {compiled: 1}[CompiledFilters(FILTERS)] == 1
+    with pytest.raises(AttributeError):
+        compiled.filters = ()
+
+
+def test_services_send_the_same_filters():
+    compiled = CompiledFilters(FILTERS)
+    client = _client()
+    item_id, user_id = uuid.uuid4(), uuid.uuid4()
+    for filters in (FILTERS, compiled):
+        client.recommendation.item.from_item(item_id, filters=filters)
+        client.recommendation.item.from_items([item_id], filters=filters)
+        client.search("text", user_id, filters=filters)
+        client.search_many([SearchQuery(text="text", user_id=user_id, filters=filters)])
+        client.endpoint.create("e", "item", "items", filters)
+    bodies = client._transport.bodies
+    assert bodies[:5] == bodies[5:]
+    assert all(body["filters"] == compiled.params for body in bodies)
+
+
+def test_empty_compiled_filters_are_no_filters():
+    client = _client()
+    client.recommendation.item.from_item(uuid.uuid4(), filters=CompiledFilters([]))
+    assert client._transport.bodies[0]["filters"] is None
+
+
+def test_compiled_filters_share_cache_entries():
+    client = _client(recommendation_cache=RecommendationCache())
+    item_id = uuid.uuid4()
+    client.recommendation.item.from_item(item_id, filters=FILTERS)
+    client.recommendation.item.from_item(item_id, filters=CompiledFilters(FILTERS))
+    assert len(client._transport.bodies) == 1
@@ -0,0 +1,148 @@
+import asyncio
+import threading
+import time
+import uuid
+
+from benchmarks.mock_server import MockRecommendServer
+from weaviate_recommend import AsyncWeaviateRecommendClient, WeaviateRecommendClient
+from weaviate_recommend.config import ConnectionConfig, HedgeConfig, RetryConfig
+from weaviate_recommend.hedging import _HedgePolicy
+from weaviate_recommend.instrumentation import RequestMetrics
+
+ITEM_ID = str(uuid.uuid4())
+
+
+class _SlowFirstServer(MockRecommendServer):
+    """
+    Answers the first recommendation request after `slow_latency`, like a slow replica.
+    """
+
+    def __init__(self, slow_latency):
+        super().__init__()
+        self.slow_latency = slow_latency
+        self.recommendation_requests = 0
+        self.lock = threading.Lock()
+
+    def respond(self, method, path, params):
+        if path.startswith("/v1/item-recommendations/"):
+            with self.lock:
+                self.recommendation_requests += 1
+                first = self.recommendation_requests == 1
+            if first:
+                time.sleep(self.slow_latency)
+        return super().respond(method, path, params)
+
+
+def _config():
+    return ConnectionConfig(
+        hedge=HedgeConfig(initial_delay=0.05, max_hedge_ratio=1.0, min_samples=100)
+    )
+
+
+def test_policy_delay_follows_percentile():
+    policy = _HedgePolicy(HedgeConfig(percentile=0.9, min_samples=10, window=100))
+    assert policy.delay("search/") == 0.1
+    for latency in range(1, 101):
+        policy.observe("search/", latency / 1000)
+    assert abs(policy.delay("search/") - 0.09) < 1e-9
+    assert policy.delay("item-recommendations/item") == 0.1
+
+
+def test_policy_caps_hedge_rate():
+    policy = _HedgePolicy(HedgeConfig(max_hedge_ratio=0.25))
+    assert not policy.acquire()
+    for _ in range(8):
+        policy.delay("search/")
+    assert [policy.acquire() for _ in range(3)] == [True, True, False]
+
+
+def test_slow_request_is_hedged():
+    metrics, events = RequestMetrics(), []
+    with _SlowFirstServer(slow_latency=2.0) as server:
+        with WeaviateRecommendClient(
+            server.url,
+            "key",
+            connection_config=_config(),
+            request_hooks=[metrics, events.append],
+        ) as client:
+            start = time.perf_counter()
+            response = client.recommendation.item.from_item(ITEM_ID)
+            elapsed = time.perf_counter() - start
+
+            assert len(response.recommendations) == 10
+            assert elapsed < 1.0
+            assert server.recommendation_requests == 2
+            # a fast call is not hedged
+            client.recommendation.item.from_item(ITEM_ID)
+            assert server.recommendation_requests == 3
+    recommendations = metrics.snapshot()["item-recommendations/item"]
+    assert (recommendations.count, recommendations.hedged) == (2, 1)
+    # the duplicate is reported on its own, its bytes count but not as a call
+    [duplicate] = [event for event in events if event.duplicate]
+    assert duplicate.error is None and duplicate.response_bytes > 0
+    call_bytes = sum(event.response_bytes for event in events if not event.duplicate)
+    assert recommendations.response_bytes == call_bytes + duplicate.response_bytes
+
+
+def test_calls_are_not_hedged_when_no_worker_is_free():
+    with _SlowFirstServer(slow_latency=0.3) as server:
+        with WeaviateRecommendClient(
+            server.url, "key", connection_config=_config()
+        ) as client:
+            client._transport._hedge_max_workers = 1
+            client.recommendation.item.from_item(ITEM_ID)
+            # sent from the calling thread, without a duplicate
+            assert client._transport._hedge_executor is None
+        assert server.recommendation_requests == 1
+
+
+def test_latency_samples_exclude_retry_backoff():
+    class _UnavailableOnceServer(_SlowFirstServer):
+        def respond(self, method, path, params):
+            if path.startswith("/v1/item-recommendations/"):
+                with self.lock:
+                    self.recommendation_requests += 1
+                    if self.recommendation_requests == 1:
+                        return 503, {"detail": "unavailable"}
+            return MockRecommendServer.respond(self, method, path, params)
+
+    config = ConnectionConfig(
+        hedge=HedgeConfig(initial_delay=5.0),
+        retry=RetryConfig(backoff_factor=0.3, jitter=False),
+    )
+    with _UnavailableOnceServer(slow_latency=0) as server:
+        with WeaviateRecommendClient(
+            server.url, "key", connection_config=config
+        ) as client:
+            client.recommendation.item.from_item(ITEM_ID)
+            window = client._transport._hedging._windows["item-recommendations/item"]
+            assert len(window.latencies) == 2
+            assert max(window.latencies) < 0.3
+            assert client._transport._hedge_workers_busy == 0
+
+
+def test_hedging_disabled_by_default():
+    with _SlowFirstServer(slow_latency=0.2) as server:
+        with WeaviateRecommendClient(server.url, "key") as client:
+            client.recommendation.item.from_item(ITEM_ID)
+        assert server.recommendation_requests == 1
+
+
+def test_async_slow_request_is_hedged():
+    events = []
+
+    async def main(url):
+        async with AsyncWeaviateRecommendClient(
+            url, "key", connection_config=_config(), request_hooks=[events.append]
+        ) as client:
+            start = time.perf_counter()
+            await client.recommendation.item.from_item(ITEM_ID)
+            return time.perf_counter() - start
+
+    with _SlowFirstServer(slow_latency=2.0) as server:
+        elapsed = asyncio.run(main(server.url))
+        assert elapsed < 1.0
+        assert server.recommendation_requests == 2
+    call, duplicate = sorted(events, key=lambda event: event.duplicate)
+    assert call.hedged and not call.duplicate
+    assert duplicate.duplicate and duplicate.response_bytes == call.response_bytes
@@ -0,0 +1,79 @@
+import os
+import subprocess
+import sys
+
+# generous default, the budget is meant to catch heavy dependencies being imported eagerly
+IMPORT_BUDGET = float(os.environ.get("WEAVIATE_RECOMMEND_IMPORT_BUDGET", "1.0"))
+
+HEAVY_MODULES = ("weaviate", "grpc", "httpx", "asyncio")
+
+
+def _run(code: str) -> str:
+    return subprocess.run(
+        [sys.executable, "-c", code], check=True, capture_output=True, text=True
+    ).stdout.strip()
+
+
+def _cold_import_time(statement: str) -> float:
+    code = f"import time; t = time.perf_counter(); {statement}; print(time.perf_counter() - t)"
+    return min(float(_run(code)) for _ in range(3))
+
+
+def _loaded_heavy_modules(statement: str) -> list:
+    return _run(
+        f"import sys; {statement}; print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    ).split(",")
+
+
+def test_package_import_is_lazy():
+    assert _loaded_heavy_modules("import weaviate_recommend") == [""]
+    assert (
+        _run(
+            "import sys, weaviate_recommend; print('weaviate_recommend.client' in sys.modules)"
+        )
+        == "False"
+    )
+
+
+def test_sync_client_does_not_import_heavy_dependencies():
+    assert _loaded_heavy_modules(
+        "from weaviate_recommend import WeaviateRecommendClient;"
+        "WeaviateRecommendClient('http://localhost:8080', 'key')"
+    ) == [""]
+
+
+def test_first_service_access_only_loads_that_service():
+    loaded = _run(
+        "import sys; from weaviate_recommend import WeaviateRecommendClient;"
+        "WeaviateRecommendClient('http://localhost:8080', 'key').item;"
+        "print(','.join(sorted(m for m in sys.modules"
+        " if m.startswith('weaviate_recommend.services.'))))"
+    ).split(",")
+    assert "weaviate_recommend.services.data.item" in loaded
+    assert "weaviate_recommend.services.data.user" not in loaded
+    assert "weaviate_recommend.services.recommendations.item" not in loaded
+    assert "weaviate_recommend.services.trainer" not in loaded
+
+
+def test_sync_services_do_not_import_asyncio():
+    assert _loaded_heavy_modules(
+        "from weaviate_recommend import WeaviateRecommendClient;"
+        "client = WeaviateRecommendClient('http://localhost:8080', 'key');"
+        "client.item; client.user; client.recommendation.item; client._trainer"
+    ) == [""]
+
+
+def test_services_are_created_on_first_access():
+    from weaviate_recommend import WeaviateRecommendClient
+
+    client = WeaviateRecommendClient("http://localhost:8080", "key")
+    assert "item" not in vars(client)
+    assert client.item is client.item
+    assert client.item.client is client
+
+
+def test_cold_import_time_within_budget():
+    elapsed = _cold_import_time(
+        "from weaviate_recommend import WeaviateRecommendClient"
+    )
+    assert elapsed < IMPORT_BUDGET, f"import took {elapsed:.3f}s"
@@ -0,0 +1,176 @@
+import asyncio
+import time
+import uuid
+
+import pytest
+
+from benchmarks.mock_server import MockRecommendServer
+from weaviate_recommend import AsyncWeaviateRecommendClient, WeaviateRecommendClient
+from weaviate_recommend.config import ConnectionConfig, RetryConfig
+from weaviate_recommend.decoding import decode_recommendations
+from weaviate_recommend.exceptions import RecommendApiException
+from weaviate_recommend.instrumentation import (
+    OpenTelemetryHook,
+    RequestEvent,
+    RequestMetrics,
+    endpoint_name,
+)
+from weaviate_recommend.services.recommendations import item
+
+
+class _FlakyServer(MockRecommendServer):
+    def __init__(self):
+        super().__init__()
+        self.failures = 1
+
+    def respond(self, method, path, params):
+        if path == "/v1/train/status" and self.failures:
+            self.failures -= 1
+            return 503, {"detail": "unavailable"}
+        return super().respond(method, path, params)
+
+
+@pytest.fixture
+def server():
+    with _FlakyServer() as server:
+        yield server
+
+
+def _event(endpoint="item/batch", http_time=0.01, **kwargs):
+    return RequestEvent(
+        endpoint=endpoint,
+        method="POST",
+        start_time=0.0,
+        http_time=http_time,
+        **kwargs,
+    )
+
+
+def test_endpoint_name():
+    user_id = uuid.uuid4()
+    assert endpoint_name("http://h/v1/item-recommendations/item") == (
+        "item-recommendations/item"
+    )
+    assert endpoint_name(f"http://h/v1/user/{user_id}/interactions/likes") == (
+        "user/{id}/interactions/likes"
+    )
+    assert endpoint_name(f"http://h/v1/user/exists/{user_id.hex}") == "user/exists/{id}"
+
+
+def test_events_report_sizes_status_and_retries(server):
+    events = []
+    config = ConnectionConfig(retry=RetryConfig(backoff_factor=0))
+    with WeaviateRecommendClient(
+        server.url, "key", connection_config=config, request_hooks=[events.append]
+    ) as client:
+        client.recommendation.item.from_item(uuid.uuid4(), limit=3)
+        client.train_status()
+        with pytest.raises(RecommendApiException):
+            client.details()
+
+    recommend, status, details = events
+    assert (recommend.endpoint, recommend.method, recommend.status_code) == (
+        "item-recommendations/item",
+        "POST",
+        200,
+    )
+    assert recommend.request_bytes == server.bytes_received
+    assert recommend.response_bytes == len(
+        server._results("recommendations", "distance", 3)
+    )
+    assert recommend.http_time > 0 and recommend.duration >= recommend.http_time
+    assert (status.endpoint, status.retries, status.error) == ("train/status", 1, None)
+    assert (details.status_code, details.error) == (404, "RecommendApiException")
+
+
+def test_deserialize_time_includes_decoding(server, monkeypatch):
+    def slow_decode(*args):
+        time.sleep(0.05)
+        return decode_recommendations(*args)
+
+    monkeypatch.setattr(item, "decode_recommendations", slow_decode)
+    events = []
+    with WeaviateRecommendClient(
+        server.url, "key", request_hooks=[events.append]
+    ) as client:
+        client.recommendation.item.from_item(uuid.uuid4())
+    [event] = events
+    assert event.deserialize_time >= 0.05
+
+
+def test_failing_hook_does_not_fail_the_call(server):
+    def hook(event):
+        raise RuntimeError("broken exporter")
+
+    with WeaviateRecommendClient(server.url, "key", request_hooks=[hook]) as client:
+        client.request_hooks.append(metrics := RequestMetrics())
+        client.recommendation.item.from_item(uuid.uuid4())
+    assert metrics.snapshot()["item-recommendations/item"].count == 1
+
+
+def test_async_client_events(server):
+    metrics = RequestMetrics()
+
+    async def main():
+        async with AsyncWeaviateRecommendClient(
+            server.url, "key", request_hooks=[metrics]
+        ) as client:
+            await asyncio.gather(
+                *[client.search("text", uuid.uuid4()) for _ in range(3)]
+            )
+
+    asyncio.run(main())
+    search = metrics.snapshot()["search/"]
+    assert (search.count, search.errors) == (3, 0)
+    assert search.response_bytes > 0
+
+
+def test_request_metrics_histogram():
+    metrics = RequestMetrics(buckets=[0.01, 0.1, 1.0])
+    for _ in range(90):
+        metrics(_event(http_time=0.005, request_bytes=10))
+    for _ in range(10):
+        metrics(_event(http_time=0.5, retries=1, error="RecommendApiException"))
+    metrics(_event(endpoint="search/"))
+
+    snapshot = metrics.snapshot()
+    batch = snapshot["item/batch"]
+    assert (batch.count, batch.errors, batch.retries, batch.request_bytes) == (
+        100,
+        10,
+        10,
+        900,
+    )
+    assert batch.latency_p50 <= 0.01 < batch.latency_p99 <= 1.0
+    assert batch.latency_max == 0.5
+    assert batch.latency_buckets == [
+        (0.01, 90),
+        (0.1, 90),
+        (1.0, 100),
+        (float("inf"), 100),
+    ]
+    assert snapshot["search/"].count == 1
+
+    metrics.reset()
+    assert metrics.snapshot() == {}
+
+
+def test_open_telemetry_hook():
+    class _Span:
+        def set_attributes(self, attributes):
+            self.attributes = attributes
+
+        def end(self, end_time):
+            self.end_time = end_time
+
+    class _Tracer:
+        def start_span(self, name, start_time):
+            self.name, self.start_time = name, start_time
+            self.span = _Span()
+            return self.span
+
+    tracer = _Tracer()
+    OpenTelemetryHook(tracer)(_event(http_time=0.25, status_code=200))
+    assert tracer.name == "POST item/batch"
+    assert tracer.span.end_time - tracer.start_time == 250_000_000
+    assert tracer.span.attributes["http.response.status_code"] == 200
@@ -0,0 +1,173 @@
+import asyncio
+import time
+import uuid
+
+import pytest
+
+from weaviate_recommend import AsyncWeaviateRecommendClient, WeaviateRecommendClient
+from weaviate_recommend.exceptions import (
+    InteractionBufferFullException,
+    RecommendApiException,
+)
+from weaviate_recommend.services.data.interaction_buffer import InteractionBuffer
+
+
+class _FakeUser:
+    def __init__(self, fail=False, delay=0.0):
+        self.batches = []
+        self.fail = fail
+        self.delay = delay
+
+    def add_interactions(self, interactions):
+        time.sleep(self.delay)
+        if self.fail:
+            raise RecommendApiException("boom")
+        self.batches.append(list(interactions))
+
+
+def _add(buffer, n):
+    for _ in range(n):
+        buffer.add_interaction(str(uuid.uuid4()), str(uuid.uuid4()), "view")
+
+
+def test_flushes_on_batch_size():
+    user = _FakeUser()
+    buffer = InteractionBuffer(user, max_batch_size=10, max_delay=60)
+    _add(buffer, 25)
+    deadline = time.monotonic() + 5
+    while sum(map(len, user.batches)) < 20 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert [len(batch) for batch in user.batches] == [10, 10]
+    buffer.close()
+    assert [len(batch) for batch in user.batches] == [10, 10, 5]
+    assert buffer.num_sent == 25
+    assert all(i.created_at for batch in user.batches for i in batch)
+
+
+def test_flushes_on_max_delay():
+    user = _FakeUser()
+    with InteractionBuffer(user, max_batch_size=100, max_delay=0.05) as buffer:
+        _add(buffer, 3)
+        time.sleep(0.5)
+        assert [len(batch) for batch in user.batches] == [3]
+
+
+def test_flush_waits_for_queued_interactions():
+    user = _FakeUser()
+    with InteractionBuffer(user, max_batch_size=100, max_delay=60) as buffer:
+        _add(buffer, 7)
+        assert buffer.flush(timeout=5)
+        assert sum(map(len, user.batches)) == 7
+
+
+def test_failures_are_reported():
+    errors = []
+    user = _FakeUser(fail=True)
+    buffer = InteractionBuffer(
+        user, max_batch_size=5, on_error=lambda e, batch: errors.append(len(batch))
+    )
+    _add(buffer, 5)
+    buffer.close()
+    assert errors == [5]
+    assert buffer.num_failed == 5
+
+
+def test_failing_callback_does_not_stop_the_worker():
+    def on_error(e, batch):
+        raise ValueError("callback bug")
+
+    user = _FakeUser(fail=True)
+    buffer = InteractionBuffer(
+        user, max_batch_size=1, max_delay=0, max_queue_size=2, on_error=on_error
+    )
+    _add(buffer, 10)
+    assert buffer.flush(timeout=5)
+    buffer.close(timeout=5)
+    assert buffer.num_failed == 10
+    assert not buffer._thread.is_alive()
+
+
+def test_backpressure_policies():
+    user = _FakeUser(delay=0.5)
+    buffer = InteractionBuffer(
+        user, max_batch_size=1, max_delay=0, max_queue_size=1, on_full="raise"
+    )
+    with pytest.raises(InteractionBufferFullException):
+        _add(buffer, 5)
+    buffer.on_full = "drop"
+    _add(buffer, 5)
+    assert buffer.num_dropped > 0
+    buffer.close()
+
+
+def test_client_close_flushes_buffers():
+    client = WeaviateRecommendClient("http://localhost", "key")
+    user = _FakeUser()
+    client.user.add_interactions = user.add_interactions
+    buffer = client.user.interaction_buffer(max_delay=60)
+    _add(buffer, 3)
+    client.close()
+    assert sum(map(len, user.batches)) == 3
+    assert not buffer._thread.is_alive()
+
+
+def test_uuid_ids_are_serialized():
+    requests = []
+
+    class _Transport:
+        def post(self, url, json=None, **kwargs):
+            requests.append(json)
+            return {"message": "ok", "num_interactions_added": len(json)}
+
+    client = WeaviateRecommendClient("http://localhost", "key")
+    client._transport = _Transport()
+    user_id, item_id = uuid.uuid4(), uuid.uuid4()
+    with client.user.interaction_buffer(max_delay=60) as buffer:
+        buffer.add_interaction(user_id, item_id, "view")
+    assert buffer.num_sent == 1
+    assert requests[0][0]["user_id"] == str(user_id)
+    assert requests[0][0]["item_id"] == str(item_id)
+
+
+def test_async_failing_callback_does_not_stop_the_worker():
+    async def run():
+        client = AsyncWeaviateRecommendClient("http://localhost", "key")
+
+        async def add_interactions(interactions):
+            raise RecommendApiException("boom")
+
+        def on_error(e, batch):
+            raise ValueError("callback bug")
+
+        client.user.add_interactions = add_interactions
+        buffer = client.user.interaction_buffer(
+            max_batch_size=1, max_delay=0, max_queue_size=2, on_error=on_error
+        )
+        for _ in range(10):
+            await buffer.add_interaction(str(uuid.uuid4()), str(uuid.uuid4()), "view")
+        await asyncio.wait_for(buffer.flush(), 5)
+        await client.close()
+        return buffer.num_failed
+
+    assert asyncio.run(run()) == 10
+
+
+def test_async_buffer():
+    async def run():
+        client = AsyncWeaviateRecommendClient("http://localhost", "key")
+        batches = []
+
+        async def add_interactions(interactions):
+            batches.append(list(interactions))
+
+        client.user.add_interactions = add_interactions
+        buffer = client.user.interaction_buffer(max_batch_size=4, max_delay=60)
+        for _ in range(10):
+            await buffer.add_interaction(str(uuid.uuid4()), str(uuid.uuid4()), "view")
+        await buffer.flush()
+        assert sum(map(len, batches)) == 10
+        await buffer.add_interaction(str(uuid.uuid4()), str(uuid.uuid4()), "view")
+        await client.close()
+        return [len(batch) for batch in batches]
+
+    assert asyncio.run(run()) == [4, 4, 2, 1]
@@ -0,0 +1,136 @@
+import asyncio
+import json
+import uuid
+
+from benchmarks.mock_server import MockRecommendServer
+from weaviate_recommend import AsyncWeaviateRecommendClient, WeaviateRecommendClient
+from weaviate_recommend.decoding import iter_json_array
+from weaviate_recommend.instrumentation import RequestMetrics
+from weaviate_recommend.sinks import JsonlSink
+
+USER_IDS = [str(uuid.uuid4()) for _ in range(20)]
+BROKEN_USER_ID = USER_IDS[7]
+
+
+class _InteractionServer(MockRecommendServer):
+    broken = frozenset([BROKEN_USER_ID])
+    broken_status = 404
+
+    def respond(self, method, path, params):
+        prefix = "/v1/user/interactions/"
+        if method == "GET" and path.startswith(prefix):
+            user_id = path[len(prefix) :]
+            if user_id in self.broken:
+                return self.broken_status, {"detail": "user not found"}
+            count = USER_IDS.index(user_id) * 150
+            return 200, [
+                {
+                    "id": user_id,
+                    "item_id": str(uuid.UUID(int=i)),
+                    "interaction_property_name": "purchase",
+                    "weight": 1.0,
+                    "created_at": "2024-01-01T00:00:00.000000",
+                }
+                for i in range(count)
+            ]
+        return super().respond(method, path, params)
+
+
+def test_iter_json_array_across_chunks():
+    values = [{"text": 'é "quoted" ' * i, "n": i * 1000} for i in range(30)]
+    body = json.dumps(values, ensure_ascii=False).encode()
+    for size in (1, 3, 100):
+        chunks = (body[i : i + size] for i in range(0, len(body), size))
+        assert list(iter_json_array(chunks)) == values
+
+
+def test_iter_user_interactions_streams_the_response():
+    metrics = RequestMetrics()
+    with _InteractionServer() as server:
+        with WeaviateRecommendClient(
+            server.url, "key", request_hooks=[metrics]
+        ) as client:
+            interactions = client.user.iter_user_interactions(USER_IDS[19])
+            first = next(interactions)
+            assert first.user_id == USER_IDS[19]
+            assert sum(1 for _ in interactions) == 19 * 150 - 1
+    endpoint = metrics.snapshot()["user/interactions/{id}"]
+    assert endpoint.count == 1
+    assert endpoint.response_bytes > 100_000
+
+
+def test_export_interactions_to_sink_with_checkpoint(tmp_path):
+    output = str(tmp_path / "interactions.jsonl")
+    checkpoint = str(tmp_path / "checkpoint.json")
+    with _InteractionServer() as server:
+        with WeaviateRecommendClient(server.url, "key") as client:
+            sink = JsonlSink(output)
+            response = client.user.export_interactions(
+                USER_IDS, sink, checkpoint_path=checkpoint, checkpoint_every=5
+            )
+            sink.close()
+
+            assert response.num_succeeded == 19
+            assert response.failed_user_ids == [BROKEN_USER_ID]
+            expected = sum(i * 150 for i in range(20)) - 7 * 150
+            assert response.num_interactions == expected
+            with open(output) as f:
+                records = [json.loads(line) for line in f]
+            assert len(records) == expected
+            assert set(records[0]) == {
+                "user_id",
+                "item_id",
+                "interaction_property_name",
+                "weight",
+                "created_at",
+            }
+
+            # the user was not found, so the checkpoint moved past it
+            with open(checkpoint + ".failed") as f:
+                assert f.read() == BROKEN_USER_ID + "\n"
+            resumed = client.user.export_interactions(
+                USER_IDS, lambda interaction: None, checkpoint_path=checkpoint
+            )
+            assert resumed.num_skipped == 20
+
+
+def test_export_resume_retries_transient_failures(tmp_path):
+    checkpoint = str(tmp_path / "checkpoint.json")
+    with _InteractionServer() as server:
+        server.broken_status = 500
+        with WeaviateRecommendClient(server.url, "key") as client:
+            response = client.user.export_interactions(
+                USER_IDS, lambda interaction: None, checkpoint_path=checkpoint
+            )
+            assert response.failed_user_ids == [BROKEN_USER_ID]
+            assert json.load(open(checkpoint))["completed"] == 7
+
+            server.broken = frozenset()
+            resumed = client.user.export_interactions(
+                USER_IDS, lambda interaction: None, checkpoint_path=checkpoint
+            )
+            assert resumed.num_skipped == 7
+            assert resumed.num_succeeded == 13
+            assert resumed.num_interactions == sum(i * 150 for i in range(7, 20))
+
+
+def test_async_export_interactions():
+    exported = []
+
+    async def main(url):
+        async with AsyncWeaviateRecommendClient(url, "key") as client:
+            streamed = [
+                interaction
+                async for interaction in client.user.iter_user_interactions(USER_IDS[3])
+            ]
+            assert len(streamed) == 450
+            return await client.user.export_interactions(
+                USER_IDS[:10], exported.append, max_in_flight=3
+            )
+
+    with _InteractionServer() as server:
+        response = asyncio.run(main(server.url))
+
+    assert response.num_succeeded == 9
+    assert response.failed_user_ids == [BROKEN_USER_ID]
+    assert len(exported) == response.num_interactions == sum(range(10)) * 150 - 7 * 150
@@ -0,0 +1,188 @@
+import asyncio
+import json
+import os
+import threading
+import time
+import uuid
+
+import pytest
+
+from weaviate_recommend.exceptions import (
+    InteractionSpoolFullException,
+    InteractionSpoolLockedException,
+    RecommendApiException,
+)
+from weaviate_recommend.services.data.interaction_spool import (
+    AsyncInteractionSpool,
+    InteractionSpool,
+    _SpoolLog,
+)
+
+
+class _FakeUser:
+    def __init__(self, error=None):
+        self.batches = []
+        self.error = error
+
+    def _add_interactions_data(self, data):
+        if self.error is not None:
+            raise self.error
+        self.batches.append(json.loads(data))
+
+
+class _AsyncFakeUser(_FakeUser):
+    async def _add_interactions_data(self, data):
+        await asyncio.sleep(0)
+        return super()._add_interactions_data(data)
+
+
+def _add(spool, n):
+    for _ in range(n):
+        spool.add_interaction(str(uuid.uuid4()), str(uuid.uuid4()), "view")
+
+
+def _segments(directory):
+    return sorted(name for name in os.listdir(directory) if name.endswith(".log"))
+
+
+def test_ships_in_batches_and_removes_segments(tmp_path):
+    user = _FakeUser()
+    spool = InteractionSpool(
+        user,
+        str(tmp_path),
+        max_batch_size=100,
+        max_delay=60,
+        segment_bytes=4096,
+        max_bytes=None,
+    )
+    _add(spool, 250)
+    assert len(_segments(tmp_path)) > 2
+    assert spool.flush(timeout=5)
+    assert [len(batch) for batch in user.batches] == [100, 100, 50]
+    assert all(record["created_at"] for batch in user.batches for record in batch)
+    spool.close()
+    assert spool.num_sent == 250
+    # only the segment being written is left
+    assert len(_segments(tmp_path)) == 1
+
+
+def test_replays_after_outage_and_restart(tmp_path):
+    user = _FakeUser(error=RecommendApiException("unavailable", 503))
+    spool = InteractionSpool(user, str(tmp_path), max_delay=0.01)
+    start = time.perf_counter()
+    _add(spool, 500)
+    assert time.perf_counter() - start < 1
+    assert not spool.flush(timeout=0.1)
+    spool.close()
+    assert spool.num_sent == 0
+
+    user.error = None
+    with InteractionSpool(user, str(tmp_path)) as spool:
+        assert spool.flush(timeout=5)
+    assert sum(map(len, user.batches)) == 500
+
+
+def test_rejected_batches_are_skipped(tmp_path):
+    errors = []
+    user = _FakeUser(error=RecommendApiException("invalid", 422))
+    with InteractionSpool(
+        user, str(tmp_path), on_error=lambda e, batch: errors.append(len(batch))
+    ) as spool:
+        _add(spool, 3)
+        assert spool.flush(timeout=5)
+    assert errors == [3]
+    assert spool.num_failed == 3
+
+
+def test_failing_callback_does_not_stop_the_shipper(tmp_path):
+    def on_error(e, batch):
+        raise ValueError("callback bug")
+
+    user = _FakeUser(error=RecommendApiException("invalid", 422))
+    with InteractionSpool(
+        user, str(tmp_path), max_batch_size=2, on_error=on_error
+    ) as spool:
+        _add(spool, 3)
+        assert spool.flush(timeout=5)
+        user.error = None
+        _add(spool, 2)
+        assert spool.flush(timeout=5)
+    assert spool.num_failed == 3
+    assert spool.num_sent == 2
+
+
+def test_torn_line_is_removed(tmp_path):
+    log = _SpoolLog(str(tmp_path), 1024, None)
+    log.append(b'{"a": 1}\n')
+    log.close()
+    with open(tmp_path / "0000000000000000.log", "ab") as f:
+        f.write(b'{"a": ')
+
+    log = _SpoolLog(str(tmp_path), 1024, None)
+    lines, position = log.read(10)
+    assert lines == [b'{"a": 1}\n']
+    log.commit(position)
+    log.close()
+    assert _SpoolLog(str(tmp_path), 1024, None).read(10) == ([], position)
+
+
+def test_disk_cap(tmp_path):
+    user = _FakeUser(error=RecommendApiException("unavailable", 503))
+    spool = InteractionSpool(
+        user, str(tmp_path), segment_bytes=1024, max_bytes=2048, on_full="raise"
+    )
+    with pytest.raises(InteractionSpoolFullException):
+        _add(spool, 100)
+    spool.on_full = "drop"
+    _add(spool, 10)
+    assert spool.num_dropped == 10
+    assert spool.size <= 2048
+    spool.close()
+
+
+def test_async_spool(tmp_path):
+    async def main():
+        user = _AsyncFakeUser()
+        spool = AsyncInteractionSpool(user, str(tmp_path), max_batch_size=40)
+        for _ in range(100):
+            await spool.add_interaction(str(uuid.uuid4()), str(uuid.uuid4()), "view")
+        assert await spool.flush(timeout=5)
+        await spool.close()
+        return user, spool
+
+    user, spool = asyncio.run(main())
+    assert [len(batch) for batch in user.batches] == [40, 40, 20]
+    assert spool.num_sent == 100
+
+
+def test_directory_is_locked_while_a_spool_uses_it(tmp_path):
+    spool = InteractionSpool(_FakeUser(), str(tmp_path))
+    with pytest.raises(InteractionSpoolLockedException):
+        InteractionSpool(_FakeUser(), str(tmp_path))
+    spool.close()
+    InteractionSpool(_FakeUser(), str(tmp_path)).close()
+
+
+def test_async_spool_reads_and_commits_off_the_event_loop(tmp_path):
+    threads = set()
+
+    class _Log(_SpoolLog):
+        def read(self, max_lines):
+            threads.add(threading.current_thread())
+            return super().read(max_lines)
+
+        def commit(self, position):
+            threads.add(threading.current_thread())
+            super().commit(position)
+
+    async def main():
+        spool = AsyncInteractionSpool(_AsyncFakeUser(), str(tmp_path))
+        spool._log.close()
+        spool._log = _Log(str(tmp_path), 1024 * 1024, None)
+        await spool.add_interaction(str(uuid.uuid4()), str(uuid.uuid4()), "view")
+        assert await spool.flush(timeout=5)
+        await spool.close()
+        return spool
+
+    assert asyncio.run(main()).num_sent == 1
+    assert threads and threading.main_thread() not in threads
@@ -0,0 +1,153 @@
+import asyncio
+import datetime
+import json
+import math
+import threading
+import uuid
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+
+from weaviate_recommend import AsyncWeaviateRecommendClient, WeaviateRecommendClient
+from weaviate_recommend.exceptions import RecommendApiException
+from weaviate_recommend.loaders import json_values, normalize_uuids, read_batches
+
+
+class _FakeTransport:
+    def __init__(self, fail_chunk=None):
+        self.bodies = []
+        self.fail_chunk = fail_chunk
+        self.lock = threading.Lock()
+
+    def _handle(self, url, data):
+        records = json.loads(data)
+        with self.lock:
+            index = len(self.bodies)
+            self.bodies.append(records)
+        if index == self.fail_chunk:
+            raise RecommendApiException("boom")
+        if url.endswith("user/batch"):
+            return {"message": "ok", "num_interactions_added": len(records)}
+        return {"message": "ok", "num_items_added": len(records)}
+
+    def post(self, url, json=None, data=None, **kwargs):
+        return self._handle(url, data)
+
+
+class _AsyncFakeTransport(_FakeTransport):
+    async def post(self, url, json=None, data=None, **kwargs):
+        await asyncio.sleep(0)
+        return self._handle(url, data)
+
+
+def _ids(n):
+    return [str(uuid.uuid4()) for _ in range(n)]
+
+
+def test_json_values_match_json_dumps():
+    strings = ["plain", 'quote " and \\ backslash', "new\nline\ttab\x01", "é ✓", None]
+    floats = [1.5, float("nan"), float("inf"), None, 2e20]
+    for values in (strings, floats, [1, None, -3], [True, None], [[1, 2], None]):
+        decoded = [
+            json.loads(value) for value in json_values(pa.array(values)).to_pylist()
+        ]
+        # JSON has no NaN nor infinity
+        expected = [
+            None if isinstance(value, float) and not math.isfinite(value) else value
+            for value in values
+        ]
+        assert decoded == expected
+
+    timestamps = pa.array([datetime.datetime(2024, 5, 1, 12, 30)], pa.timestamp("s"))
+    assert json_values(timestamps).to_pylist() == ['"2024-05-01T12:30:00.000000"']
+
+
+def test_normalize_uuids():
+    value = uuid.uuid4()
+    canonical, valid = normalize_uuids(
+        pa.array([str(value), value.hex.upper(), "not-a-uuid", None])
+    )
+    assert canonical.to_pylist()[:2] == [str(value), str(value)]
+    assert valid.to_pylist() == [True, True, False, False]
+
+
+def test_add_batch_columnar_chunks_and_reports():
+    ids = _ids(25)
+    ids[3] = "invalid"
+    table = pa.table({"id": ids, "title": [f"item {i}" for i in range(25)]})
+    client = WeaviateRecommendClient("http://localhost", "key")
+    client._transport = _FakeTransport(fail_chunk=1)
+
+    response = client.item.add_batch_columnar(table, batch_size=10, max_in_flight=1)
+
+    assert response.invalid_rows == [3]
+    assert response.num_chunks == 3
+    assert response.num_items_added == 14
+    assert response.failures[0].chunk_index == 1
+    assert response.failures[0].ids == ids[11:21]
+    assert client._transport.bodies[0][0] == {
+        "id": ids[0],
+        "properties": {"title": "item 0"},
+    }
+
+
+def test_add_batch_columnar_respects_max_batch_bytes():
+    table = pa.table({"id": _ids(20), "title": ["x" * 100] * 20})
+    client = WeaviateRecommendClient("http://localhost", "key")
+    client._transport = _FakeTransport()
+
+    response = client.item.add_batch_columnar(table, max_batch_bytes=1000)
+
+    assert response.num_items_added == 20
+    for records in client._transport.bodies:
+        assert len(json.dumps(records, separators=(",", ":"))) <= 1000
+
+
+def test_read_files(tmp_path):
+    import pyarrow.csv as pa_csv
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+
+    table = pa.table({"id": _ids(3), "price": [1.0, 2.5, None]})
+    pq.write_table(table, tmp_path / "items.parquet")
+    pa_csv.write_csv(table, tmp_path / "items.csv")
+    feather.write_feather(table, tmp_path / "items.feather")
+
+    for name in ("items.parquet", "items.csv", "items.feather"):
+        batches = list(read_batches(tmp_path / name))
+        assert pa.Table.from_batches(batches).to_pydict() == table.to_pydict()
+    with pytest.raises(ValueError):
+        list(read_batches(tmp_path / "items.unknown"))
+
+
+def test_add_interactions_columnar_defaults():
+    users, items = _ids(3), _ids(3)
+    table = pa.table({"user_id": users, "item_id": items, "weight": [1, 2, 3]})
+    client = WeaviateRecommendClient("http://localhost", "key")
+    client._transport = _FakeTransport()
+
+    response = client.user.add_interactions_columnar(table, "purchase")
+
+    assert response.num_interactions_added == 3
+    (records,) = client._transport.bodies
+    assert records[1]["user_id"] == users[1]
+    assert records[1]["item_id"] == items[1]
+    assert records[1]["interaction_property_name"] == "purchase"
+    assert records[1]["weight"] == 2.0
+    assert records[1]["created_at"]
+    assert records[1]["remove_previous_interactions"] is False
+
+    with pytest.raises(ValueError, match="interaction_property_name"):
+        client.user.add_interactions_columnar(table)
+
+
+def test_async_add_batch_columnar():
+    table = pa.table({"id": _ids(30), "title": ["x"] * 30})
+    client = AsyncWeaviateRecommendClient("http://localhost", "key")
+    client._transport = _AsyncFakeTransport()
+
+    response = asyncio.run(client.item.add_batch_columnar(table, batch_size=10))
+
+    assert response.num_items_added == 30
+    assert response.num_chunks == 3
@@ -0,0 +1,118 @@
+import uuid
+
+import pytest
+
+from weaviate_recommend.models.filter import (
+    CompiledFilters,
+    FilterConfig,
+    ItemPropertyReference,
+)
+from weaviate_recommend.models.responses import (
+    PersonalisedSearchResponse,
+    RecommendationResponse,
+    RecommendationResponseWithScore,
+    RecommendationsResponse,
+)
+from weaviate_recommend.post_filter import RecommendationCandidates, post_filter
+
+PROPERTIES = [
+    {"title": "Red Shoes", "price": 30, "brand": "acme", "tags": ["shoes", "red"]},
+    {"title": "Blue Shoes", "price": 80.5, "brand": "acme", "tags": ["shoes", "blue"]},
+    {"title": "Red Hat", "price": 15, "brand": "hatco", "tags": ["hat", "red"]},
+    {"title": "Scarf", "price": "n/a", "brand": None, "tags": []},
+    {"title": "Gloves", "price": 20},
+]
+
+RESPONSE = RecommendationsResponse(
+    recommendations=[
+        RecommendationResponse(
+            uuid=str(uuid.uuid4()), distance=index / 10, properties=properties
+        )
+        for index, properties in enumerate(PROPERTIES)
+    ]
+)
+
+
+def _titles(response):
+    return [result.properties["title"] for result in response.recommendations]
+
+
+def _filter(property_name, operator, value):
+    return FilterConfig(property_name=property_name, operator=operator, value=value)
+
+
+@pytest.mark.parametrize(
+    "filter_config, expected",
+    [
+        (_filter("brand", "Equal", "acme"), ["Red Shoes", "Blue Shoes"]),
+        (_filter("tags", "Equal", "red"), ["Red Shoes", "Red Hat"]),
+        (_filter("brand", "NotEqual", "acme"), ["Red Hat", "Scarf", "Gloves"]),
+        (_filter("price", "LessThan", 20), ["Red Hat"]),
+        (_filter("price", "LessThanEqual", 20), ["Red Hat", "Gloves"]),
+        (_filter("price", "GreaterThan", 30), ["Blue Shoes"]),
+        (_filter("price", "GreaterThanEqual", 30), ["Red Shoes", "Blue Shoes"]),
+        (_filter("title", "Like", "red*"), ["Red Shoes", "Red Hat"]),
+        (_filter("title", "Like", "?carf"), ["Scarf"]),
+        (_filter("brand", "IsNull", True), ["Scarf", "Gloves"]),
+        (_filter("tags", "ContainsAny", ["hat", "blue"]), ["Blue Shoes", "Red Hat"]),
+        (_filter("tags", "ContainsAll", ["shoes", "red"]), ["Red Shoes"]),
+        (_filter("brand", "ContainsAny", ["hatco"]), ["Red Hat"]),
+    ],
+)
+def test_operators(filter_config, expected):
+    assert _titles(post_filter(RESPONSE, [filter_config])) == expected
+
+
+@pytest.mark.parametrize(
+    "operator, value, matches",
+    [
+        ("NotEqual", "acme", True),
+        ("IsNull", True, True),
+        ("IsNull", False, False),
+        ("Equal", "acme", False),
+        ("LessThan", "zzz", False),
+        ("Like", "*", False),
+        ("ContainsAny", ["acme", "hatco"], False),
+        ("ContainsAll", ["acme"], False),
+    ],
+)
+def test_missing_and_null_properties(operator, value, matches):
+    titles = _titles(post_filter(RESPONSE, [_filter("brand", operator, value)]))
+    # Scarf has a null brand and Gloves none
+    assert ("Scarf" in titles, "Gloves" in titles) == (matches, matches)
+
+
+def test_filters_are_combined_and_truncated():
+    candidates = RecommendationCandidates(RESPONSE)
+    filters = [_filter("tags", "Equal", "red"), _filter("price", "LessThan", 100)]
+
+    assert _titles(candidates.filter(filters)) == ["Red Shoes", "Red Hat"]
+    assert _titles(candidates.filter(filters, limit=1)) == ["Red Shoes"]
+    assert _titles(candidates.filter(CompiledFilters(filters), limit=1)) == [
+        "Red Shoes"
+    ]
+    assert candidates.count(filters) == 2
+    assert len(candidates.filter(limit=3).recommendations) == 3
+    assert (
+        candidates.filter([_filter("brand", "Equal", "nobody")]).recommendations == []
+    )
+
+
+def test_search_responses():
+    response = PersonalisedSearchResponse(
+        results=[
+            RecommendationResponseWithScore(
+                uuid=str(uuid.uuid4()), score=1.0, properties=properties
+            )
+            for properties in PROPERTIES
+        ]
+    )
+    filtered = post_filter(response, [_filter("price", "GreaterThan", 50)])
+    assert isinstance(filtered, PersonalisedSearchResponse)
+    assert [result.properties["title"] for result in filtered.results] == ["Blue Shoes"]
+
+
+def test_reference_filters_are_rejected():
+    reference = ItemPropertyReference(type="ItemPropertyReference")
+    with pytest.raises(ValueError, match="ItemPropertyReference"):
+        post_filter(RESPONSE, [_filter("brand", "Equal", reference)])
@@ -0,0 +1,100 @@
+import asyncio
+import uuid
+
+import pytest
+
+from weaviate_recommend import AsyncWeaviateRecommendClient, WeaviateRecommendClient
+from weaviate_recommend.cache import RecommendationCache
+from weaviate_recommend.decoding import decode_recommendations
+from weaviate_recommend.models.search import SearchQuery
+
+ITEM_ID = str(uuid.uuid4())
+USER_ID = str(uuid.uuid4())
+PROPERTIES = {"title": "Red Shoes", "price": 30, "description": "x" * 1000}
+
+
+def _payload(key, score):
+    return {
+        key: [
+            {"uuid": str(uuid.uuid4()), score: 0.1, "properties": dict(PROPERTIES)}
+            for _ in range(3)
+        ]
+    }
+
+
+class _FakeTransport:
+    def __init__(self):
+        self.requests = []
+
+    def post(self, url, json=None, decode=None, **kwargs):
+        self.requests.append(json)
+        if url.endswith("/search/"):
+            payload = _payload("results", "score")
+        else:
+            payload = _payload("recommendations", "distance")
+        return decode(payload) if decode is not None else payload
+
+
+class _AsyncFakeTransport(_FakeTransport):
+    async def post(self, url, json=None, **kwargs):
+        return super().post(url, json, **kwargs)
+
+
+@pytest.mark.parametrize("mode", ["fast", "validate"])
+def test_decode_projects_without_modifying_the_payload(mode):
+    payload = _payload("recommendations", "distance")
+    response = decode_recommendations(payload, mode, ["title", "missing"])
+    assert [r.properties for r in response.recommendations] == [
+        {"title": "Red Shoes"}
+    ] * 3
+    assert payload["recommendations"][0]["properties"] == PROPERTIES
+
+    response = decode_recommendations(payload, mode, [])
+    assert all(r.properties == {} for r in response.recommendations)
+    assert decode_recommendations(payload, mode).recommendations[0].properties == (
+        PROPERTIES
+    )
+
+
+def test_recommendations_and_search():
+    transport = _FakeTransport()
+    client = WeaviateRecommendClient(
+        "http://localhost", "key", recommendation_cache=RecommendationCache()
+    )
+    client._transport = transport
+
+    item = client.recommendation.item
+    response = item.from_item(ITEM_ID, return_properties=["title", "price"])
+    assert transport.requests[-1]["return_properties"] == ["title", "price"]
+    assert response.recommendations[0].properties == {"title": "Red Shoes", "price": 30}
+    # the projection is part of the cache key
+    assert item.from_item(ITEM_ID).recommendations[0].properties == PROPERTIES
+    assert "return_properties" not in transport.requests[-1]
+    assert len(transport.requests) == 2
+    assert item.from_item(ITEM_ID, return_properties=["title", "price"]) is response
+
+    response = item.from_user(USER_ID, return_properties=[])
+    assert all(r.properties == {} for r in response.recommendations)
+
+    response = client.search("shoes", USER_ID, return_properties=["price"])
+    assert transport.requests[-1]["return_properties"] == ["price"]
+    assert response.results[0].properties == {"price": 30}
+    [response] = client.search_many(
+        [SearchQuery(text="shoes", user_id=USER_ID, return_properties=["title"])]
+    )
+    assert response.results[0].properties == {"title": "Red Shoes"}
+
+
+def test_async_recommendations_and_search():
+    async def main():
+        client = AsyncWeaviateRecommendClient("http://localhost", "key")
+        client._transport = _AsyncFakeTransport()
+        recommendations = await client.recommendation.item.from_items(
+            [ITEM_ID], return_properties=["title"]
+        )
+        results = await client.search("shoes", USER_ID, return_properties=[])
+        return recommendations, results
+
+    recommendations, results = asyncio.run(main())
+    assert recommendations.recommendations[0].properties == {"title": "Red Shoes"}
+    assert all(r.properties == {} for r in results.results)
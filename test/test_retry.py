@@ -0,0 +1,128 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from weaviate_recommend import WeaviateRecommendClient
+from weaviate_recommend.config import (
+    CircuitBreakerConfig,
+    ConnectionConfig,
+    RetryConfig,
+)
+from weaviate_recommend.exceptions import CircuitOpenException, RecommendApiException
+from weaviate_recommend.retry import parse_retry_after
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def _respond(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        self.rfile.read(length)
+        self.server.requests.append((self.command, self.path))
+        if self.path == "/health":
+            status = self.server.health
+        else:
+            status = self.server.statuses.pop(0) if self.server.statuses else 200
+        body = json.dumps(
+            {"status": "trained"} if self.command == "GET" else {"message": "ok"}
+        ).encode()
+        self.send_response(status)
+        if status == 429:
+            self.send_header("Retry-After", "0")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = _respond
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    httpd.statuses = []
+    httpd.requests = []
+    httpd.health = 200
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _client(server, **config):
+    config.setdefault("retry", RetryConfig(backoff_factor=0.001))
+    return WeaviateRecommendClient(
+        f"http://127.0.0.1:{server.server_port}",
+        "key",
+        connection_config=ConnectionConfig(**config),
+    )
+
+
+def test_idempotent_requests_are_retried(server):
+    server.statuses = [503, 429, 200]
+    with _client(server) as client:
+        assert client.train_status().status == "trained"
+    assert len(server.requests) == 3
+
+
+def test_gives_up_after_max_retries_with_status_code(server):
+    server.statuses = [503] * 10
+    with _client(server, retry=RetryConfig(max_retries=2, backoff_factor=0)) as client:
+        with pytest.raises(RecommendApiException) as e:
+            client.train_status()
+    assert e.value.status_code == 503
+    assert len(server.requests) == 3
+
+
+def test_non_idempotent_requests_are_not_retried(server):
+    server.statuses = [503, 200]
+    with _client(server) as client:
+        with pytest.raises(RecommendApiException):
+            client.train()
+    assert len(server.requests) == 1
+
+
+def test_client_errors_are_not_retried(server):
+    server.statuses = [404, 200]
+    with _client(server) as client:
+        with pytest.raises(RecommendApiException) as e:
+            client.train_status()
+    assert e.value.status_code == 404
+    assert len(server.requests) == 1
+
+
+def test_circuit_breaker_fails_fast_and_recovers(server):
+    server.statuses = [503] * 2
+    breaker = CircuitBreakerConfig(failure_threshold=2, recovery_timeout=0.05)
+    with _client(
+        server, retry=RetryConfig(max_retries=0), circuit_breaker=breaker
+    ) as client:
+        for _ in range(2):
+            with pytest.raises(RecommendApiException):
+                client.train_status()
+        with pytest.raises(CircuitOpenException):
+            client.train_status()
+        assert len(server.requests) == 2
+
+        time.sleep(0.06)
+        server.health = 503
+        with pytest.raises(CircuitOpenException):
+            client.train_status()
+        assert server.requests[-1] == ("GET", "/health")
+
+        time.sleep(0.06)
+        server.health = 200
+        assert client.train_status().status == "trained"
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("2.5") == 2.5
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("garbage") is None
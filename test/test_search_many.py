@@ -0,0 +1,59 @@
+import asyncio
+import time
+import uuid
+
+from weaviate_recommend import AsyncWeaviateRecommendClient, WeaviateRecommendClient
+from weaviate_recommend.exceptions import RecommendApiException
+from weaviate_recommend.models.search import SearchQuery
+
+
+def _response(text):
+    if text == "fail":
+        raise RecommendApiException("boom")
+    return {
+        "results": [
+            {"uuid": str(uuid.uuid4()), "score": 1.0, "properties": {"q": text}}
+        ]
+    }
+
+
+class _FakeTransport:
+    def post(self, url, json=None, data=None, decode=None, **kwargs):
+        # later queries answer first, results must still come back in input order
+        time.sleep(0.01 * (5 - int(json["text"]) if json["text"].isdigit() else 0))
+        return decode(_response(json["text"]))
+
+
+class _AsyncFakeTransport:
+    async def post(self, url, json=None, data=None, decode=None, **kwargs):
+        await asyncio.sleep(0)
+        return decode(_response(json["text"]))
+
+
+QUERIES = [
+    SearchQuery(text=text, user_id=str(uuid.uuid4()))
+    for text in ["0", "1", "fail", "3", "4"]
+]
+
+
+def _check(results):
+    assert [
+        r.results[0].properties["q"] if not isinstance(r, Exception) else "fail"
+        for r in results
+    ] == ["0", "1", "fail", "3", "4"]
+    assert isinstance(results[2], RecommendApiException)
+
+
+def test_search_many_keeps_order_and_isolates_failures():
+    client = WeaviateRecommendClient("http://localhost", "key")
+    client._transport = _FakeTransport()
+    _check(client.search_many(QUERIES, max_concurrency=5))
+
+
+def test_async_search_many():
+    async def run():
+        client = AsyncWeaviateRecommendClient("http://localhost", "key")
+        client._transport = _AsyncFakeTransport()
+        return await client.search_many(QUERIES)
+
+    _check(asyncio.run(run()))
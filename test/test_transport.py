@@ -0,0 +1,86 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from weaviate_recommend import AsyncWeaviateRecommendClient, WeaviateRecommendClient
+from weaviate_recommend.config import ConnectionConfig
+from weaviate_recommend.exceptions import RecommendApiException
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.server.ports.add(self.client_address[1])
+        status = 200 if self.path == "/v1/train/status" else 404
+        body = json.dumps({"status": "trained"}).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    httpd.ports = set()
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_connections_are_reused(server):
+    url = f"http://127.0.0.1:{server.server_port}"
+    with WeaviateRecommendClient(url, "key") as client:
+        for _ in range(5):
+            assert client.train_status().status == "trained"
+    assert len(server.ports) == 1
+
+
+def test_keep_alive_disabled(server):
+    url = f"http://127.0.0.1:{server.server_port}"
+    config = ConnectionConfig(keep_alive=False)
+    with WeaviateRecommendClient(url, "key", connection_config=config) as client:
+        for _ in range(3):
+            client.train_status()
+    assert len(server.ports) == 3
+
+
+def test_non_200_raises(server):
+    url = f"http://127.0.0.1:{server.server_port}"
+    with WeaviateRecommendClient(url, "key") as client:
+        with pytest.raises(RecommendApiException):
+            client.details()
+
+
+def test_async_client_fans_out_over_pool(server):
+    url = f"http://127.0.0.1:{server.server_port}"
+    config = ConnectionConfig(pool_maxsize=4)
+
+    async def run():
+        async with AsyncWeaviateRecommendClient(url, "key", config) as client:
+            return await asyncio.gather(*[client.train_status() for _ in range(20)])
+
+    statuses = asyncio.run(run())
+    assert [s.status for s in statuses] == ["trained"] * 20
+    assert len(server.ports) <= 4
+
+
+def test_async_non_200_raises(server):
+    url = f"http://127.0.0.1:{server.server_port}"
+
+    async def run():
+        async with AsyncWeaviateRecommendClient(url, "key") as client:
+            await client.details()
+
+    with pytest.raises(RecommendApiException):
+        asyncio.run(run())
@@ -0,0 +1,121 @@
+import asyncio
+import threading
+import uuid
+
+import pytest
+
+from weaviate_recommend import AsyncWeaviateRecommendClient, WeaviateRecommendClient
+from weaviate_recommend.exceptions import RecommendApiException
+from weaviate_recommend.models.data import User
+
+
+class _UserStore:
+    def __init__(self, existing=(), broken=(), status_code=500):
+        self.users = {str(user_id): {} for user_id in existing}
+        self.broken = {str(user_id) for user_id in broken}
+        self.status_code = status_code
+        self.requests = 0
+        self.lock = threading.Lock()
+
+    def post(self, url, json=None, **kwargs):
+        with self.lock:
+            self.requests += 1
+            user_id = json["id"]
+            if user_id in self.broken:
+                raise RecommendApiException("internal error", self.status_code)
+            exists = user_id in self.users
+            if url.endswith("/create") and exists:
+                raise RecommendApiException("user already exists", 409)
+            if url.endswith("/update") and not exists:
+                raise RecommendApiException("user not found", 404)
+            self.users[user_id] = json["properties"]
+            return {"message": "ok"}
+
+
+class _AsyncUserStore(_UserStore):
+    async def post(self, url, json=None, **kwargs):
+        return super().post(url, json=json, **kwargs)
+
+
+def _client(store):
+    client = WeaviateRecommendClient("http://localhost", "key")
+    client._transport = store
+    return client
+
+
+def test_upsert_creates_and_updates():
+    existing = [uuid.uuid4() for _ in range(3)]
+    new = [uuid.uuid4() for _ in range(3)]
+    store = _UserStore(existing)
+    outcomes = []
+    users = [
+        User(id=str(user_id), properties={"age": 30}) for user_id in new + existing
+    ]
+    response = _client(store).user.upsert_users(
+        users, max_in_flight=1, on_outcome=outcomes.append
+    )
+    assert (response.num_created, response.num_updated, response.num_failed) == (
+        3,
+        3,
+        0,
+    )
+    assert [outcome.operation for outcome in outcomes] == ["created"] * 3 + [
+        "updated"
+    ] * 3
+    # one wrong guess when switching from new to existing users
+    assert store.requests == 7
+    assert store.users[str(existing[0])] == {"age": 30}
+
+
+def test_upsert_prefer_update():
+    existing = [uuid.uuid4() for _ in range(4)]
+    store = _UserStore(existing)
+    response = _client(store).user.upsert_users(
+        [User(id=str(user_id), properties={}) for user_id in existing], prefer="update"
+    )
+    assert response.num_updated == 4 and store.requests == 4
+
+
+def test_upsert_columnar_input_and_failures():
+    ids = [str(uuid.uuid4()) for _ in range(4)]
+    store = _UserStore(existing=[ids[1]], broken=[ids[2]])
+    response = _client(store).user.upsert_users(
+        {"user": ids, "age": [20, 30, 40, 50], "country": ["fr", "de", "nl", "be"]},
+        id_column="user",
+    )
+    assert (response.num_created, response.num_updated, response.num_failed) == (
+        2,
+        1,
+        1,
+    )
+    assert [(f.index, f.user_id) for f in response.failures] == [(2, ids[2])]
+    assert "internal error" in response.failures[0].error
+    assert store.users[ids[3]] == {"age": 50, "country": "be"}
+
+    with pytest.raises(ValueError):
+        _client(store).user.upsert_users({"id": ids, "age": [1]})
+
+
+def test_async_upsert():
+    ids = [str(uuid.uuid4()) for _ in range(5)]
+    store = _AsyncUserStore(existing=ids[:2])
+
+    async def main():
+        client = AsyncWeaviateRecommendClient("http://localhost", "key")
+        client._transport = store
+        return await client.user.upsert_users(
+            {"id": ids, "properties": [{"n": i} for i in range(5)]}
+        )
+
+    response = asyncio.run(main())
+    assert (response.num_created, response.num_updated) == (3, 2)
+    assert store.users[ids[4]] == {"n": 4}
+
+
+@pytest.mark.parametrize("status_code", [400, 401, 403, 422])
+def test_upsert_does_not_retry_other_client_errors(status_code):
+    user_id = str(uuid.uuid4())
+    store = _UserStore(broken=[user_id], status_code=status_code)
+    response = _client(store).user.upsert_users([User(id=user_id, properties={})])
+    assert response.num_failed == 1
+    assert store.requests == 1
@@ -0,0 +1,216 @@
+import asyncio
+import gc
+import threading
+import time
+
+import pytest
+
+from weaviate_recommend import AsyncWeaviateRecommendClient, WeaviateRecommendClient
+from weaviate_recommend.exceptions import TrainingFailedException
+from weaviate_recommend.models.responses import TrainingStatusResponse
+from weaviate_recommend.services.trainer import _PollSchedule, _SharedTrainingStatus
+
+
+class _StatusService:
+    """
+    Training statuses shared by the fake transports of several clients.
+    """
+
+    def __init__(self, statuses, delay=0.0):
+        self.statuses = list(statuses)
+        self.delay = delay
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def _enter(self):
+        with self.lock:
+            self.calls += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            status = (
+                self.statuses.pop(0) if len(self.statuses) > 1 else self.statuses[0]
+            )
+        return {"status": status}
+
+    def _exit(self):
+        with self.lock:
+            self.in_flight -= 1
+
+
+class _FakeTransport:
+    def __init__(self, service):
+        self.service = service
+
+    def get(self, url, **kwargs):
+        response = self.service._enter()
+        time.sleep(self.service.delay)
+        self.service._exit()
+        return response
+
+    def post(self, url, **kwargs):
+        return {"message": "training started"}
+
+    def close(self):
+        pass
+
+
+class _AsyncFakeTransport(_FakeTransport):
+    async def get(self, url, **kwargs):
+        response = self.service._enter()
+        await asyncio.sleep(self.service.delay)
+        self.service._exit()
+        return response
+
+    async def post(self, url, **kwargs):
+        return {"message": "training started"}
+
+    async def close(self):
+        pass
+
+
+def _client(service, url="http://localhost"):
+    client = WeaviateRecommendClient(url, "key")
+    client._transport = _FakeTransport(service)
+    return client
+
+
+def test_waits_until_trained_with_progress():
+    service = _StatusService(["untrained", "training", "training", "trained"])
+    progress = []
+    status = _client(service, "http://progress").wait_until_trained(
+        timeout=5,
+        poll_interval=0.001,
+        on_progress=lambda status, elapsed: progress.append(status.status),
+    )
+    assert status.status == "trained"
+    assert progress == ["untrained", "training", "training", "trained"]
+
+
+def test_training_error_and_timeout():
+    with pytest.raises(TrainingFailedException):
+        _client(
+            _StatusService(["training", "error"]), "http://error"
+        ).wait_until_trained(poll_interval=0.001)
+    service = _StatusService(["training"])
+    start = time.monotonic()
+    with pytest.raises(TimeoutError):
+        _client(service, "http://timeout").wait_until_trained(
+            timeout=0.1, poll_interval=0.01
+        )
+    assert time.monotonic() - start < 1
+    # the intervals back off, instead of polling every 10ms
+    assert service.calls < 10
+
+
+def test_poll_schedule_backs_off_and_resets():
+    schedule = _PollSchedule(1.0, 3.0, None)
+    training = TrainingStatusResponse(status="training")
+    delays = [schedule.next_delay(training) for _ in range(5)]
+    assert delays == [1.0, 1.5, 2.25, 3.0, 3.0]
+    assert schedule.next_delay(TrainingStatusResponse(status="untrained")) == 1.0
+    with pytest.raises(ValueError):
+        _PollSchedule(0, 1, None)
+
+
+def test_clients_share_a_single_poller():
+    service = _StatusService(["training"] * 10 + ["trained"], delay=0.02)
+    clients = [_client(service, "http://shared") for _ in range(5)]
+    results = []
+    threads = [
+        threading.Thread(
+            target=lambda client=client: results.append(
+                client.wait_until_trained(timeout=10, poll_interval=0.005).status
+            )
+        )
+        for client in clients
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == ["trained"] * 5
+    assert service.max_in_flight == 1
+    assert service.calls <= 11
+
+
+def test_async_waiters_share_a_single_poller():
+    service = _StatusService(["untrained"] + ["training"] * 5 + ["trained"], delay=0.01)
+
+    async def main():
+        clients = []
+        for _ in range(4):
+            client = AsyncWeaviateRecommendClient("http://async-shared", "key")
+            client._transport = _AsyncFakeTransport(service)
+            clients.append(client)
+        return await asyncio.gather(
+            *[
+                client.wait_until_trained(timeout=10, poll_interval=0.005)
+                for client in clients
+            ]
+        )
+
+    statuses = asyncio.run(main())
+    assert [status.status for status in statuses] == ["trained"] * 4
+    assert service.max_in_flight == 1
+    assert service.calls <= 7
+
+
+def test_poll_in_flight_during_train_is_dropped():
+    service = _StatusService(["trained", "training", "trained"], delay=0.1)
+    client = _client(service, "http://retrained")
+    waiter = threading.Thread(
+        target=lambda: client.wait_until_trained(timeout=10, poll_interval=0.005)
+    )
+    waiter.start()
+    time.sleep(0.03)
+    client.train()
+    waiter.join()
+    # the status polled before training started was not trusted
+    assert service.calls == 3
+
+
+def test_async_poll_in_flight_during_train_is_dropped():
+    service = _StatusService(["trained", "training", "trained"], delay=0.1)
+
+    async def main():
+        client = AsyncWeaviateRecommendClient("http://async-retrained", "key")
+        client._transport = _AsyncFakeTransport(service)
+        waiter = asyncio.ensure_future(
+            client.wait_until_trained(timeout=10, poll_interval=0.005)
+        )
+        await asyncio.sleep(0.03)
+        await client.train()
+        await waiter
+
+    asyncio.run(main())
+    assert service.calls == 3
+
+
+def test_api_keys_do_not_share_a_poller():
+    service = _StatusService(["trained"])
+    for key in ("key-1", "key-2"):
+        client = WeaviateRecommendClient("http://keys", key)
+        client._transport = _FakeTransport(service)
+        client.wait_until_trained(timeout=10)
+    assert service.calls == 2
+
+
+def test_pollers_are_dropped_when_nobody_waits():
+    service = _StatusService(["trained"])
+    client = WeaviateRecommendClient("http://dropped", "secret-key")
+    client._transport = _FakeTransport(service)
+    client.wait_until_trained(timeout=10)
+    gc.collect()
+    assert client._trainer.endpoint_url not in {
+        url for url, _ in _SharedTrainingStatus._instances.keys()
+    }
+
+    shared = _SharedTrainingStatus.of("http://dropped", "secret-key")
+    [key] = [
+        key for key in _SharedTrainingStatus._instances if key[0] == "http://dropped"
+    ]
+    # the API key is not kept in plain text
+    assert "secret-key" not in key[1]
+    assert _SharedTrainingStatus.of("http://dropped", "secret-key") is shared
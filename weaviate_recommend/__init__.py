@@ -1 +1,28 @@
-from .client import WeaviateRecommendClient  # noqa: F401
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .async_client import AsyncWeaviateRecommendClient  # noqa: F401
+    from .client import WeaviateRecommendClient  # noqa: F401
+
+__all__ = ["AsyncWeaviateRecommendClient", "WeaviateRecommendClient"]
+
+# the clients are imported on first access, so `import weaviate_recommend` stays cheap and the
+# async client does not pull in httpx for sync users
+_LAZY_ATTRIBUTES = {
+    "AsyncWeaviateRecommendClient": ".async_client",
+    "WeaviateRecommendClient": ".client",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+
+    value = getattr(import_module(_LAZY_ATTRIBUTES[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,314 @@
+import weakref
+from functools import cached_property
+from types import TracebackType
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Type,
+    Union,
+)
+from uuid import UUID
+
+from weaviate_recommend.async_transport import _AsyncTransport
+from weaviate_recommend.batching import DEFAULT_MAX_IN_FLIGHT
+from weaviate_recommend.cache import RecommendationCache
+from weaviate_recommend.coalescing import _AsyncSingleFlight
+from weaviate_recommend.config import ConnectionConfig
+from weaviate_recommend.decoding import DECODE_MODE
+
+if TYPE_CHECKING:
+    from weaviate.classes.config import DataType
+
+    from weaviate_recommend.fallback import RecommendationFallback
+    from weaviate_recommend.instrumentation import RequestHook
+    from weaviate_recommend.models.filter import Filters
+    from weaviate_recommend.models.responses import (
+        TRAINING_STATE,
+        CreateRecommenderResponse,
+        DeleteRecommenderResponse,
+        PersonalisedSearchResponse,
+        RecommenderDetailsResponse,
+        TrainingStatusResponse,
+        TrainRecommenderResponse,
+    )
+    from weaviate_recommend.models.search import SearchQuery
+    from weaviate_recommend.services.configured_endpoints import (
+        _AsyncConfiguredEndpoints,
+    )
+    from weaviate_recommend.services.data.item import _AsyncItem
+    from weaviate_recommend.services.data.user import _AsyncUser
+    from weaviate_recommend.services.personalised_search import _AsyncPersonalisedSearch
+    from weaviate_recommend.services.recommendations.base import _AsyncRecommendation
+    from weaviate_recommend.services.recommender_management import (
+        _AsyncRecommenderManagement,
+    )
+    from weaviate_recommend.services.trainer import _AsyncTrainer
+
+
+class AsyncWeaviateRecommendClient:
+    """
+    The asyncio counterpart of `WeaviateRecommendClient`. Every endpoint method is a coroutine.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        api_key: str,
+        connection_config: Optional[ConnectionConfig] = None,
+        recommendation_cache: Optional[RecommendationCache] = None,
+        decode_mode: DECODE_MODE = "fast",
+        request_hooks: Optional[List["RequestHook"]] = None,
+        recommendation_fallback: Optional["RecommendationFallback"] = None,
+        coalesce_requests: bool = False,
+    ):
+        """
+        Args:
+            url (str): The URL of the Weaviate Recommend service.
+            api_key (str): The API key used to authenticate against the service.
+            connection_config (ConnectionConfig, optional): Pool size, keep-alive and timeout
+                settings of the HTTP transport shared by all services. Defaults to `ConnectionConfig()`.
+            recommendation_cache (RecommendationCache, optional): In-process cache for item based
+                recommendations. Defaults to None, which disables caching.
+            decode_mode (str, optional): "fast" builds recommendation and search results without
+                validating them, "validate" fully validates them with pydantic, to debug
+                unexpected responses. Defaults to "fast".
+            request_hooks (List[Callable[[RequestEvent], None]], optional): Functions called with
+                the endpoint, sizes, timings, status and retries of every request, like a
+                `RequestMetrics` aggregator. More hooks can be appended to `client.request_hooks`.
+            recommendation_fallback (RecommendationFallback, optional): Keeps the last good
+                recommendations of every request, served when the same request fails or is
+                slow. Defaults to None.
+            coalesce_requests (bool, optional): Send a single request for identical
+                recommendation calls made at the same time, and share its response between the
+                callers. Shuffled user recommendations are never coalesced. Defaults to False.
+        """
+        self._url = url
+        self.base_url = f"{url}/v1"
+        self._api_key = api_key
+        self.request_hooks: List["RequestHook"] = list(request_hooks or [])
+        self._transport = _AsyncTransport(
+            api_key,
+            connection_config or ConnectionConfig(),
+            url + "/health",
+            self.request_hooks,
+        )
+        self.recommendation_cache = recommendation_cache
+        self.recommendation_fallback = recommendation_fallback
+        self._single_flight = _AsyncSingleFlight() if coalesce_requests else None
+        self.decode_mode = decode_mode
+        self._last_training_state: Optional["TRAINING_STATE"] = None
+        # background writers, like interaction buffers, flushed when the client is closed
+        self._background_writers: "weakref.WeakSet[Any]" = weakref.WeakSet()
+
+    @cached_property
+    def _recommender_management(self) -> "_AsyncRecommenderManagement":
+        from weaviate_recommend.services.recommender_management import (
+            _AsyncRecommenderManagement,
+        )
+
+        return _AsyncRecommenderManagement(self)
+
+    @cached_property
+    def _trainer(self) -> "_AsyncTrainer":
+        from weaviate_recommend.services.trainer import _AsyncTrainer
+
+        return _AsyncTrainer(self)
+
+    @cached_property
+    def _search(self) -> "_AsyncPersonalisedSearch":
+        from weaviate_recommend.services.personalised_search import (
+            _AsyncPersonalisedSearch,
+        )
+
+        return _AsyncPersonalisedSearch(self)
+
+    @cached_property
+    def recommendation(self) -> "_AsyncRecommendation":
+        from weaviate_recommend.services.recommendations.base import (
+            _AsyncRecommendation,
+        )
+
+        return _AsyncRecommendation(self)
+
+    @cached_property
+    def endpoint(self) -> "_AsyncConfiguredEndpoints":
+        from weaviate_recommend.services.configured_endpoints import (
+            _AsyncConfiguredEndpoints,
+        )
+
+        return _AsyncConfiguredEndpoints(self)
+
+    @cached_property
+    def item(self) -> "_AsyncItem":
+        from weaviate_recommend.services.data.item import _AsyncItem
+
+        return _AsyncItem(self)
+
+    @cached_property
+    def user(self) -> "_AsyncUser":
+        from weaviate_recommend.services.data.user import _AsyncUser
+
+        return _AsyncUser(self)
+
+    async def __aenter__(self) -> "AsyncWeaviateRecommendClient":
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """
+        Flush and stop the background writers of the client, close its recommendation fallback,
+        then close its pooled connections.
+        """
+        import asyncio
+
+        for writer in list(self._background_writers):
+            await writer.close()
+        if self.recommendation_fallback is not None:
+            # writes the responses still buffered by a disk store, off the event loop
+            await asyncio.to_thread(self.recommendation_fallback.close)
+        await self._transport.close()
+
+    def _invalidate_recommendations(self) -> None:
+        if self.recommendation_cache is not None:
+            self.recommendation_cache.clear()
+
+    def _observe_training_state(self, state: "TRAINING_STATE") -> None:
+        """
+        Records the training state returned by the service, cached recommendations are dropped
+        when it changes.
+        """
+        previous, self._last_training_state = self._last_training_state, state
+        if previous is not None and previous != state:
+            self._invalidate_recommendations()
+
+    async def _perform_health_check(self) -> None:
+        await self._transport.ping(self._url + "/health")
+
+    async def _training_state(self) -> "TRAINING_STATE":
+        return (await self._trainer.status()).status
+
+    async def is_trained(self) -> bool:
+        return await self._training_state() == "trained"
+
+    async def is_training(self) -> bool:
+        return await self._training_state() == "training"
+
+    async def create(
+        self,
+        name: str,
+        properties: Dict[str, "DataType"],
+        user_properties: Dict[str, "DataType"],
+        user_interaction_property_names: List[str],
+        text_search_property_name: Union[str, List[str], None] = None,
+        trainable_properties: Union[List[str], None] = None,
+    ) -> "CreateRecommenderResponse":
+        """
+        Create a new recommender.
+        """
+        return await self._recommender_management.create(
+            name,
+            properties,
+            user_properties,
+            user_interaction_property_names,
+            text_search_property_name,
+            trainable_properties,
+        )
+
+    async def delete(self) -> "DeleteRecommenderResponse":
+        """
+        Delete the recommender.
+        """
+        return await self._recommender_management.delete()
+
+    async def details(self) -> "RecommenderDetailsResponse":
+        """
+        Get details about the recommender.
+        """
+        return await self._recommender_management.details()
+
+    async def train(self, overwrite: bool = False) -> "TrainRecommenderResponse":
+        """
+        Triggers the recommender training.
+        """
+        return await self._trainer.train(overwrite)
+
+    async def train_status(self) -> "TrainingStatusResponse":
+        """
+        Get the training status of the recommender.
+        """
+        return await self._trainer.status()
+
+    async def wait_until_trained(
+        self,
+        timeout: Optional[float] = None,
+        poll_interval: float = 1.0,
+        max_poll_interval: float = 30.0,
+        on_progress: Optional[Callable[["TrainingStatusResponse", float], None]] = None,
+    ) -> "TrainingStatusResponse":
+        """
+        Wait until the recommender is trained, polling the lightweight training status endpoint.
+
+        Polls start every `poll_interval` seconds, and back off up to `max_poll_interval` seconds
+        while the training state does not change. Clients waiting for the same recommender in
+        the process share their polls.
+
+        Args:
+            timeout (float, optional): Maximum number of seconds to wait. Defaults to None,
+                which waits forever.
+            on_progress (Callable[[TrainingStatusResponse, float], None], optional): Called
+                with every polled status and the seconds waited so far.
+
+        Raises:
+            TimeoutError: If the recommender is not trained after `timeout` seconds.
+            TrainingFailedException: If the training ends in the error state.
+        """
+        return await self._trainer.wait_until_trained(
+            timeout, poll_interval, max_poll_interval, on_progress
+        )
+
+    async def search(
+        self,
+        text: str,
+        user_id: str | UUID,
+        limit: int = 10,
+        influence_factor: float = 0.2,
+        filters: Optional["Filters"] = None,
+        return_properties: Optional[Sequence[str]] = None,
+    ) -> "PersonalisedSearchResponse":
+        """
+        Search for text in the Weaviate database and return the results personalised for the user.
+        Only the `return_properties` of the items are returned, when they are set.
+        """
+        return await self._search.search(
+            text, user_id, limit, influence_factor, filters, return_properties
+        )
+
+    async def search_many(
+        self,
+        queries: Sequence["SearchQuery"],
+        max_concurrency: int = DEFAULT_MAX_IN_FLIGHT,
+    ) -> List[Union["PersonalisedSearchResponse", Exception]]:
+        """
+        Run multiple personalised searches concurrently over the client's connection pool.
+
+        Args:
+            queries (Sequence[SearchQuery]): The text, user and options of every search.
+            max_concurrency (int, optional): Maximum number of searches in flight. Defaults to 4.
+
+        Returns:
+            One result per query, in the order of `queries`. A query that failed is returned as
+            the exception it raised, without failing the other queries.
+        """
+        return await self._search.search_many(queries, max_concurrency)
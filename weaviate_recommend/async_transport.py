@@ -0,0 +1,358 @@
+import asyncio
+import time
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Set, Tuple
+
+import httpx
+
+from weaviate_recommend.compression import _Compressor
+from weaviate_recommend.config import STREAM_CHUNK_SIZE, ConnectionConfig
+from weaviate_recommend.decoding import dumps, loads
+from weaviate_recommend.exceptions import CircuitOpenException, RecommendApiException
+from weaviate_recommend.hedging import _HedgePolicy
+from weaviate_recommend.instrumentation import (
+    RequestHook,
+    _RequestRecorder,
+    endpoint_name,
+)
+from weaviate_recommend.retry import _CircuitBreaker, _RetryPolicy, parse_retry_after
+from weaviate_recommend.utils import get_auth_header
+
+
+def _decodes_zstd() -> bool:
+    # httpx decodes zstd responses from 0.27.1, and only when zstandard is installed
+    from httpx import _decoders
+
+    return "zstd" in getattr(_decoders, "SUPPORTED_DECODERS", {})
+
+
+class _AsyncTransport:
+    """
+    Pooled asyncio HTTP transport shared by all services of an `AsyncWeaviateRecommendClient`,
+    with the same retry and circuit breaker behaviour as the sync transport.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        config: ConnectionConfig,
+        health_url: str,
+        hooks: Optional[List[RequestHook]] = None,
+    ):
+        self.config = config
+        # called with a `RequestEvent` after every request, shared with the client
+        self.hooks: List[RequestHook] = hooks if hooks is not None else []
+        headers = get_auth_header(api_key)
+        if not config.keep_alive:
+            headers["Connection"] = "close"
+        self._compressor = (
+            _Compressor(config.compression, _decodes_zstd())
+            if config.compression is not None
+            else None
+        )
+        if self._compressor is not None:
+            headers["Accept-Encoding"] = self._compressor.accept_encoding
+        self._client = httpx.AsyncClient(
+            headers=headers,
+            limits=httpx.Limits(
+                max_connections=config.pool_maxsize,
+                max_keepalive_connections=(
+                    config.pool_maxsize if config.keep_alive else 0
+                ),
+                keepalive_expiry=config.keep_alive_expiry,
+            ),
+            timeout=httpx.Timeout(
+                config.read_timeout,
+                connect=config.connect_timeout,
+                pool=None if config.pool_block else config.connect_timeout,
+            ),
+        )
+        self._health_url = health_url
+        self._retry = _RetryPolicy(config.retry)
+        self._breaker = (
+            _CircuitBreaker(config.circuit_breaker)
+            if config.circuit_breaker is not None
+            else None
+        )
+        self._hedging = _HedgePolicy(config.hedge) if config.hedge is not None else None
+
+    async def _probe(self) -> None:
+        assert self._breaker is not None
+        try:
+            response = await self._client.get(self._health_url)
+            healthy = response.status_code == 200
+        except httpx.HTTPError:
+            healthy = False
+        if not healthy:
+            self._breaker.record_failure()
+            raise CircuitOpenException("The service is still unhealthy")
+        self._breaker.record_success()
+
+    def _record(self, failed: bool) -> None:
+        if self._breaker is not None:
+            if failed:
+                self._breaker.record_failure()
+            else:
+                self._breaker.record_success()
+
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        data: Optional[bytes] = None,
+        idempotent: Optional[bool] = None,
+        recorder: Optional[_RequestRecorder] = None,
+        stream: bool = False,
+        headers: Optional[Dict[str, str]] = None,
+        observe: Optional[Callable[[float], None]] = None,
+    ) -> httpx.Response:
+        """
+        Sends a request, retrying it according to the retry policy. `observe` is called with
+        the latency of every response received, without the backoff between retries.
+        """
+        retries = 0
+        while True:
+            if self._breaker is not None and self._breaker.before_request():
+                await self._probe()
+            retry_after = None
+            start = time.perf_counter()
+            try:
+                response = await self._client.send(
+                    self._client.build_request(
+                        method, url, content=data, headers=headers
+                    ),
+                    stream=stream,
+                )
+                if stream and response.status_code != 200:
+                    await response.aread()
+            except httpx.TransportError:
+                self._record(failed=True)
+                if not self._retry.can_retry(retries, method, idempotent):
+                    raise
+            except asyncio.CancelledError:
+                # a hedged attempt cancelled as the other one answered took at least this long
+                if observe is not None:
+                    observe(time.perf_counter() - start)
+                raise
+            else:
+                if observe is not None:
+                    observe(time.perf_counter() - start)
+                if recorder is not None:
+                    recorder.status_code = response.status_code
+                self._record(failed=response.status_code >= 500)
+                if response.status_code == 200:
+                    return response
+                if not (
+                    self._retry.is_retryable_status(response.status_code)
+                    and self._retry.can_retry(retries, method, idempotent)
+                ):
+                    raise RecommendApiException(response.text, response.status_code)
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            await asyncio.sleep(self._retry.backoff(retries, retry_after))
+            retries += 1
+            if recorder is not None:
+                recorder.retries = retries
+
+    def _body(
+        self, json: Optional[Any], data: Optional[bytes]
+    ) -> Tuple[Optional[bytes], Optional[Dict[str, str]]]:
+        """
+        Serializes and compresses a request body, returns it with its extra headers.
+        """
+        if json is not None:
+            data = dumps(json)
+        if self._compressor is None:
+            return data, None
+        data, encoding = self._compressor.compress(data)
+        return data, {"Content-Encoding": encoding} if encoding is not None else None
+
+    async def _send_hedged(
+        self,
+        method: str,
+        url: str,
+        data: Optional[bytes] = None,
+        idempotent: Optional[bool] = None,
+        recorder: Optional[_RequestRecorder] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> httpx.Response:
+        """
+        `_send`, duplicated when no response arrived within the hedging delay of the endpoint.
+        The first successful response is returned and the other attempt is cancelled.
+        """
+        hedging = self._hedging
+        assert hedging is not None
+        endpoint = endpoint_name(url)
+        delay = hedging.delay(endpoint)
+
+        def observe(latency: float) -> None:
+            hedging.observe(endpoint, latency)
+
+        async def attempt(
+            attempt_recorder: Optional[_RequestRecorder],
+        ) -> httpx.Response:
+            return await self._send(
+                method,
+                url,
+                data,
+                idempotent,
+                attempt_recorder,
+                headers=headers,
+                observe=observe,
+            )
+
+        async def duplicate_attempt(
+            duplicate_recorder: _RequestRecorder,
+        ) -> httpx.Response:
+            try:
+                response = await attempt(duplicate_recorder)
+                duplicate_recorder.received(response.content)
+            except BaseException as e:
+                # includes the cancellation of the losing duplicate
+                duplicate_recorder.finish(e)
+                raise
+            duplicate_recorder.finish()
+            return response
+
+        pending: Set["asyncio.Future[httpx.Response]"] = {
+            asyncio.ensure_future(attempt(recorder))
+        }
+        try:
+            done, _ = await asyncio.wait(pending, timeout=delay)
+            if not done and hedging.acquire():
+                if recorder is None:
+                    pending.add(asyncio.ensure_future(attempt(None)))
+                else:
+                    duplicate = recorder.hedge(data)
+                    pending.add(asyncio.ensure_future(duplicate_attempt(duplicate)))
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = error or task.exception()
+            assert error is not None
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        json: Optional[Any] = None,
+        data: Optional[bytes] = None,
+        idempotent: Optional[bool] = None,
+        hedge: bool = False,
+        decode: Optional[Callable[[Any], Any]] = None,
+    ) -> Any:
+        """
+        Send a request and return the decoded JSON body. `data` can be used instead of `json`
+        to send an already serialized JSON body.
+
+        `idempotent` marks whether the request can safely be retried, by default only GET and
+        DELETE requests are. POST requests that only read data should set it to True.
+        `hedge` allows duplicating a slow request when hedging is configured, it must only be
+        set for requests that only read data.
+        `decode` is applied to the JSON body and its result returned instead, it is measured as
+        part of the deserialization of the response.
+
+        Raises:
+            RecommendApiException: If the server does not answer with a 200.
+        """
+        send = self._send_hedged if hedge and self._hedging is not None else self._send
+        if not self.hooks:
+            data, headers = self._body(json, data)
+            response = await send(method, url, data, idempotent, headers=headers)
+            result = loads(response.content)
+            return decode(result) if decode is not None else result
+        recorder = _RequestRecorder(self.hooks, method, url)
+        try:
+            data, headers = self._body(json, data)
+            recorder.serialized(data)
+            response = await send(
+                method, url, data, idempotent, recorder, headers=headers
+            )
+            content = response.content
+            recorder.received(content)
+            result = loads(content)
+            if decode is not None:
+                result = decode(result)
+        except BaseException as e:
+            recorder.finish(e)
+            raise
+        recorder.finish()
+        return result
+
+    async def stream(
+        self, url: str, chunk_size: int = STREAM_CHUNK_SIZE
+    ) -> AsyncIterator[bytes]:
+        """
+        Send a GET request and lazily yield the chunks of the response body, see
+        `_Transport.stream`.
+        """
+        recorder = _RequestRecorder(self.hooks, "GET", url) if self.hooks else None
+        size = 0
+        try:
+            if recorder is not None:
+                recorder.serialized(None)
+            response = await self._send("GET", url, recorder=recorder, stream=True)
+            try:
+                async for chunk in response.aiter_bytes(chunk_size):
+                    size += len(chunk)
+                    yield chunk
+            finally:
+                await response.aclose()
+            if recorder is not None:
+                recorder.received_size(size)
+        except GeneratorExit:
+            # the caller stopped reading early
+            if recorder is not None:
+                recorder.received_size(size)
+                recorder.finish()
+            raise
+        except BaseException as e:
+            if recorder is not None:
+                recorder.finish(e)
+            raise
+        if recorder is not None:
+            recorder.finish()
+
+    async def ping(self, url: str) -> None:
+        """
+        Send a GET request to `url` and only check that it succeeded.
+        """
+        await self._send("GET", url)
+
+    async def get(self, url: str) -> Any:
+        return await self.request("GET", url)
+
+    async def post(
+        self,
+        url: str,
+        json: Optional[Any] = None,
+        data: Optional[bytes] = None,
+        idempotent: Optional[bool] = None,
+        hedge: bool = False,
+        decode: Optional[Callable[[Any], Any]] = None,
+    ) -> Any:
+        return await self.request(
+            "POST",
+            url,
+            json=json,
+            data=data,
+            idempotent=idempotent,
+            hedge=hedge,
+            decode=decode,
+        )
+
+    async def delete(self, url: str) -> Any:
+        return await self.request("DELETE", url)
+
+    async def close(self) -> None:
+        """
+        Close all pooled connections.
+        """
+        await self._client.aclose()
@@ -0,0 +1,166 @@
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+from weaviate_recommend.decoding import dumps
+
+if TYPE_CHECKING:
+    import asyncio
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_MAX_BATCH_BYTES = 8 * 1024 * 1024
+DEFAULT_MAX_IN_FLIGHT = 4
+
+
+def serialize_record(record: Any) -> bytes:
+    """
+    Serializes a single JSON record of a batch request, like the body of any other request:
+    NaN and infinite values are rejected with a `ValueError` rather than sent as invalid JSON.
+    """
+    return dumps(record)
+
+
+def join_json_array(records: List[bytes]) -> bytes:
+    """
+    Joins already serialized JSON records into the body of a JSON array.
+    """
+    return b"[" + b",".join(records) + b"]"
+
+
+def iter_chunks(
+    records: Iterable[Tuple[T, bytes]], max_count: int, max_bytes: int
+) -> Iterator[List[Tuple[T, bytes]]]:
+    """
+    Lazily groups `(key, serialized_record)` pairs into chunks holding at most `max_count`
+    records, and whose JSON array body is at most `max_bytes` long. A single record larger
+    than `max_bytes` is sent in a chunk of its own.
+    """
+    if max_count < 1 or max_bytes < 1:
+        raise ValueError("max_count and max_bytes must be positive")
+    chunk: List[Tuple[T, bytes]] = []
+    # the surrounding brackets of the JSON array
+    size = 2
+    for key, record in records:
+        # every record after the first is preceded by a comma
+        record_size = len(record) + (1 if chunk else 0)
+        if chunk and (len(chunk) >= max_count or size + record_size > max_bytes):
+            yield chunk
+            chunk, size, record_size = [], 2, len(record)
+        chunk.append((key, record))
+        size += record_size
+    if chunk:
+        yield chunk
+
+
+def _outcome(future: Union["Future[R]", "asyncio.Future[R]"]) -> Union[R, Exception]:
+    exception = future.exception()
+    if exception is not None:
+        if not isinstance(exception, Exception):
+            raise exception
+        return exception
+    return future.result()
+
+
+def bounded_map(
+    fn: Callable[[T], R], items: Iterable[T], max_in_flight: int
+) -> Iterator[Tuple[T, Union[R, Exception]]]:
+    """
+    Calls `fn` on every element of `items` from a thread pool, with at most `max_in_flight`
+    calls running at once. `items` is consumed lazily, so it can be an unbounded generator.
+
+    Yields `(item, result)` pairs in completion order. If `fn` raised, `result` is the
+    exception instead of the return value.
+    """
+    if max_in_flight < 1:
+        raise ValueError("max_in_flight must be positive")
+    with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+        pending: Dict["Future[R]", T] = {}
+        for item in items:
+            if len(pending) >= max_in_flight:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield pending.pop(future), _outcome(future)
+            pending[executor.submit(fn, item)] = item
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield pending.pop(future), _outcome(future)
+
+
+async def async_bounded_map(
+    fn: Callable[[T], Awaitable[R]], items: Iterable[T], max_in_flight: int
+) -> AsyncIterator[Tuple[T, Union[R, Exception]]]:
+    """
+    The asyncio counterpart of `bounded_map`, running at most `max_in_flight` coroutines at once.
+    """
+    import asyncio
+
+    if max_in_flight < 1:
+        raise ValueError("max_in_flight must be positive")
+    pending: Dict["asyncio.Future[R]", T] = {}
+    try:
+        for item in items:
+            if len(pending) >= max_in_flight:
+                done, _ = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    yield pending.pop(task), _outcome(task)
+            pending[asyncio.ensure_future(fn(item))] = item
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield pending.pop(task), _outcome(task)
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+class RateLimiter:
+    """
+    Spaces out calls to `acquire` so that at most `rate` of them return per second, across all
+    threads sharing the limiter.
+    """
+
+    def __init__(self, rate: float):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.interval = 1.0 / rate
+        self._next = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+            return start - now
+
+    def acquire(self) -> None:
+        delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self) -> None:
+        delay = self._reserve()
+        if delay > 0:
+            import asyncio
+
+            await asyncio.sleep(delay)
@@ -0,0 +1,120 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Generic, Optional, Tuple, TypeVar
+
+from pydantic import BaseModel
+
+V = TypeVar("V")
+
+
+class CacheStats(BaseModel):
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    size: int
+
+
+def make_cache_key(endpoint: str, params: Dict[str, Any]) -> str:
+    """
+    Builds a cache key from the endpoint and the JSON request parameters of a call.
+
+    Keys are sorted, so parameters built in a different order map to the same key.
+    """
+    return endpoint + " " + json.dumps(params, sort_keys=True, default=str)
+
+
+class RecommendationCache(Generic[V]):
+    """
+    A thread-safe, in-process LRU cache with a time to live, for recommendation responses.
+
+    Pass it to a client with `WeaviateRecommendClient(..., recommendation_cache=...)`. It is
+    cleared when the recommender is trained, or when the client observes a change of the
+    training state. Cached responses are shared between callers and must not be mutated.
+
+    Args:
+        max_size (int): Maximum number of cached responses. The least recently used response is
+            evicted when it is exceeded. Defaults to 1024.
+        ttl (float, optional): Seconds a response is served from the cache. `None` keeps
+            responses until they are evicted. Defaults to 60.0.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: Optional[float] = 60.0):
+        if max_size < 1:
+            raise ValueError("max_size must be positive")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("ttl must be positive")
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, V]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        # bumped by `clear`, so responses requested before it are not cached after it
+        self._generation = 0
+
+    @property
+    def generation(self) -> int:
+        """
+        The number of times the cache was cleared, read it before sending a request and pass it
+        to `put` with its response.
+        """
+        return self._generation
+
+    def get(self, key: str) -> Optional[V]:
+        """
+        Returns the cached value for `key`, or None if it is missing or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self._expirations += 1
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def put(self, key: str, value: V, generation: Optional[int] = None) -> None:
+        """
+        Caches `value` for `key`. It is dropped when `generation` is given and the cache was
+        cleared since it was read.
+        """
+        expires_at = (
+            time.monotonic() + self.ttl if self.ttl is not None else float("inf")
+        )
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def clear(self) -> None:
+        """
+        Removes all cached values, the counters are kept.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                expirations=self._expirations,
+                size=len(self._entries),
+            )
@@ -0,0 +1,103 @@
+import json
+import os
+from typing import List, Optional, Set
+
+from weaviate_recommend.exceptions import RecommendApiException
+
+# client errors that may succeed when sent again
+_TRANSIENT_CLIENT_STATUS_CODES = frozenset([408, 429])
+
+
+def _is_transient(error: BaseException) -> bool:
+    """
+    Whether an input that failed with `error` may succeed when the job is resumed.
+    """
+    if isinstance(error, RecommendApiException):
+        status_code = error.status_code
+        return (
+            status_code is None
+            or status_code >= 500
+            or status_code in _TRANSIENT_CLIENT_STATUS_CODES
+        )
+    # an input the client rejects, like an invalid UUID, is rejected again
+    return not isinstance(error, ValueError)
+
+
+class Checkpoint:
+    """
+    Tracks the progress of a bulk job over an ordered input, and persists it to `path` so an
+    interrupted job can resume where it stopped.
+
+    Inputs complete out of order when they are processed concurrently. The checkpoint only
+    records the length of the prefix of the input that completed entirely, so on resume no
+    input is skipped, but inputs completed after that prefix are processed again.
+
+    An input that failed with a transient error, like a connection error, a 5xx or a 429, is
+    not completed, so a resumed job retries it. An input that failed for good, like a user
+    that does not exist, is completed and its ID appended to the `failed_path` file next to
+    the checkpoint, so the checkpoint moves past it.
+    """
+
+    def __init__(self, path: Optional[str], every: int = 1000):
+        if every < 1:
+            raise ValueError("every must be positive")
+        self.path = path
+        self.failed_path = path + ".failed" if path is not None else None
+        self.every = every
+        # number of leading inputs completed by previous runs
+        self.start = self._read()
+        self.completed = self.start
+        self._done: Set[int] = set()
+        # IDs of the inputs failed for good since the last save
+        self._failed: List[str] = []
+        self._since_save = 0
+
+    def _read(self) -> int:
+        if self.path is None or not os.path.exists(self.path):
+            return 0
+        with open(self.path, encoding="utf-8") as f:
+            return int(json.load(f)["completed"])
+
+    def mark_done(self, index: int) -> bool:
+        """
+        Marks the input at `index` as completed, returns True when the checkpoint is due to be saved.
+        """
+        self._done.add(index)
+        while self.completed in self._done:
+            self._done.remove(self.completed)
+            self.completed += 1
+        self._since_save += 1
+        return self.path is not None and self._since_save >= self.every
+
+    def mark_failed(self, index: int, input_id: str, error: BaseException) -> bool:
+        """
+        Records the failure of the input at `index`, returns True when the checkpoint is due to
+        be saved. Only failures that will not succeed on resume complete the input.
+        """
+        if _is_transient(error):
+            return False
+        if self.failed_path is not None:
+            self._failed.append(input_id)
+        return self.mark_done(index)
+
+    def save(self) -> None:
+        """
+        Atomically writes the number of leading inputs completed so far, after appending the
+        IDs of the inputs that failed for good to `failed_path`.
+        """
+        self._since_save = 0
+        if self.path is None:
+            return
+        if self._failed:
+            assert self.failed_path is not None
+            with open(self.failed_path, "a", encoding="utf-8") as f:
+                f.writelines(input_id + "\n" for input_id in self._failed)
+                f.flush()
+                os.fsync(f.fileno())
+            self._failed = []
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"completed": self.completed}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
@@ -1,51 +1,190 @@
-from typing import Dict, List, Union
+import weakref
+from functools import cached_property
+from types import TracebackType
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Type,
+    Union,
+)
 from uuid import UUID
 
-import requests
-from weaviate.classes.config import DataType
-
-from weaviate_recommend.exceptions import RecommendApiException
-from weaviate_recommend.models.filter import FilterConfig
-from weaviate_recommend.models.responses import (
-    TRAINING_STATE,
-    CreateRecommenderResponse,
-    DeleteRecommenderResponse,
-    PersonalisedSearchResponse,
-    RecommenderDetailsResponse,
-    TrainingStatusResponse,
-    TrainRecommenderResponse,
-)
-from weaviate_recommend.services import (
-    _ConfiguredEndpoints,
-    _Item,
-    _PersonalisedSearch,
-    _Recommendation,
-    _RecommenderManagement,
-    _Trainer,
-    _User,
-)
+from weaviate_recommend.batching import DEFAULT_MAX_IN_FLIGHT
+from weaviate_recommend.cache import RecommendationCache
+from weaviate_recommend.coalescing import _SingleFlight
+from weaviate_recommend.config import ConnectionConfig
+from weaviate_recommend.decoding import DECODE_MODE
+from weaviate_recommend.transport import _Transport
+
+if TYPE_CHECKING:
+    from weaviate.classes.config import DataType
+
+    from weaviate_recommend.fallback import RecommendationFallback
+    from weaviate_recommend.instrumentation import RequestHook
+    from weaviate_recommend.models.filter import Filters
+    from weaviate_recommend.models.responses import (
+        TRAINING_STATE,
+        CreateRecommenderResponse,
+        DeleteRecommenderResponse,
+        PersonalisedSearchResponse,
+        RecommenderDetailsResponse,
+        TrainingStatusResponse,
+        TrainRecommenderResponse,
+    )
+    from weaviate_recommend.models.search import SearchQuery
+    from weaviate_recommend.services.configured_endpoints import _ConfiguredEndpoints
+    from weaviate_recommend.services.data.item import _Item
+    from weaviate_recommend.services.data.user import _User
+    from weaviate_recommend.services.personalised_search import _PersonalisedSearch
+    from weaviate_recommend.services.recommendations.base import _Recommendation
+    from weaviate_recommend.services.recommender_management import (
+        _RecommenderManagement,
+    )
+    from weaviate_recommend.services.trainer import _Trainer
 
 
 class WeaviateRecommendClient:
-    def __init__(self, url: str, api_key: str):
+    def __init__(
+        self,
+        url: str,
+        api_key: str,
+        connection_config: Optional[ConnectionConfig] = None,
+        recommendation_cache: Optional[RecommendationCache] = None,
+        decode_mode: DECODE_MODE = "fast",
+        request_hooks: Optional[List["RequestHook"]] = None,
+        recommendation_fallback: Optional["RecommendationFallback"] = None,
+        coalesce_requests: bool = False,
+    ):
+        """
+        Args:
+            url (str): The URL of the Weaviate Recommend service.
+            api_key (str): The API key used to authenticate against the service.
+            connection_config (ConnectionConfig, optional): Pool size, keep-alive and timeout
+                settings of the HTTP transport shared by all services. Defaults to `ConnectionConfig()`.
+            recommendation_cache (RecommendationCache, optional): In-process cache for item based
+                recommendations. Defaults to None, which disables caching.
+            decode_mode (str, optional): "fast" builds recommendation and search results without
+                validating them, "validate" fully validates them with pydantic, to debug
+                unexpected responses. Defaults to "fast".
+            request_hooks (List[Callable[[RequestEvent], None]], optional): Functions called with
+                the endpoint, sizes, timings, status and retries of every request, like a
+                `RequestMetrics` aggregator. More hooks can be appended to `client.request_hooks`.
+            recommendation_fallback (RecommendationFallback, optional): Keeps the last good
+                recommendations of every request, served when the same request fails or is
+                slow. Defaults to None.
+            coalesce_requests (bool, optional): Send a single request for identical
+                recommendation calls made at the same time, and share its response between the
+                callers. Shuffled user recommendations are never coalesced. Defaults to False.
+        """
         self._url = url
         self.base_url = f"{url}/v1"
         self._api_key = api_key
-        self._recommender_management = _RecommenderManagement(self)
-        self._trainer = _Trainer(self)
-        self._search = _PersonalisedSearch(self)
-        self.recommendation = _Recommendation(self)
-        self.endpoint = _ConfiguredEndpoints(self)
-        self.item = _Item(self)
-        self.user = _User(self)
+        self.request_hooks: List["RequestHook"] = list(request_hooks or [])
+        self._transport = _Transport(
+            api_key,
+            connection_config or ConnectionConfig(),
+            url + "/health",
+            self.request_hooks,
+        )
+        self.recommendation_cache = recommendation_cache
+        self.recommendation_fallback = recommendation_fallback
+        self._single_flight = _SingleFlight() if coalesce_requests else None
+        self.decode_mode = decode_mode
+        self._last_training_state: Optional["TRAINING_STATE"] = None
+        # background writers, like interaction buffers, flushed when the client is closed
+        self._background_writers: "weakref.WeakSet[Any]" = weakref.WeakSet()
+
+    @cached_property
+    def _recommender_management(self) -> "_RecommenderManagement":
+        from weaviate_recommend.services.recommender_management import (
+            _RecommenderManagement,
+        )
+
+        return _RecommenderManagement(self)
+
+    @cached_property
+    def _trainer(self) -> "_Trainer":
+        from weaviate_recommend.services.trainer import _Trainer
+
+        return _Trainer(self)
+
+    @cached_property
+    def _search(self) -> "_PersonalisedSearch":
+        from weaviate_recommend.services.personalised_search import _PersonalisedSearch
+
+        return _PersonalisedSearch(self)
+
+    @cached_property
+    def recommendation(self) -> "_Recommendation":
+        from weaviate_recommend.services.recommendations.base import _Recommendation
+
+        return _Recommendation(self)
+
+    @cached_property
+    def endpoint(self) -> "_ConfiguredEndpoints":
+        from weaviate_recommend.services.configured_endpoints import (
+            _ConfiguredEndpoints,
+        )
+
+        return _ConfiguredEndpoints(self)
+
+    @cached_property
+    def item(self) -> "_Item":
+        from weaviate_recommend.services.data.item import _Item
+
+        return _Item(self)
+
+    @cached_property
+    def user(self) -> "_User":
+        from weaviate_recommend.services.data.user import _User
+
+        return _User(self)
+
+    def __enter__(self) -> "WeaviateRecommendClient":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Flush and stop the background writers of the client, close its recommendation fallback,
+        then close its pooled connections.
+        """
+        for writer in list(self._background_writers):
+            writer.close()
+        if self.recommendation_fallback is not None:
+            self.recommendation_fallback.close()
+        self._transport.close()
+
+    def _invalidate_recommendations(self) -> None:
+        if self.recommendation_cache is not None:
+            self.recommendation_cache.clear()
+
+    def _observe_training_state(self, state: "TRAINING_STATE") -> None:
+        """
+        Records the training state returned by the service, cached recommendations are dropped
+        when it changes.
+        """
+        previous, self._last_training_state = self._last_training_state, state
+        if previous is not None and previous != state:
+            self._invalidate_recommendations()
 
     def _perform_health_check(self) -> None:
-        response = requests.get(self._url + "/health")
-        if response.status_code != 200:
-            raise RecommendApiException(response.text)
+        self._transport.ping(self._url + "/health")
 
-    def _training_state(self) -> TRAINING_STATE:
-        return self._recommender_management.details().training_state
+    def _training_state(self) -> "TRAINING_STATE":
+        return self._trainer.status().status
 
     def is_trained(self) -> bool:
         return self._training_state() == "trained"
@@ -56,19 +195,19 @@ class WeaviateRecommendClient:
     def create(
         self,
         name: str,
-        properties: Dict[str, DataType],
-        user_properties: Dict[str, DataType],
+        properties: Dict[str, "DataType"],
+        user_properties: Dict[str, "DataType"],
         user_interaction_property_names: List[str],
         text_search_property_name: Union[str, List[str], None] = None,
         trainable_properties: Union[List[str], None] = None,
-    ) -> CreateRecommenderResponse:
+    ) -> "CreateRecommenderResponse":
         """
         Create a new recommender.
 
         Args:
             name (str): _description_
-            properties (Dict[str, DataType]): _description_
-            user_properties (Dict[str, DataType]): _description_
+            properties (Dict[str, "DataType"]): _description_
+            user_properties (Dict[str, "DataType"]): _description_
             user_interaction_property_names (List[str]): _description_
             text_search_property_name (Union[str, List[str], None], optional): _description_. Defaults to None.
             trainable_properties (Union[List[str], None], optional): _description_. Defaults to None.
@@ -82,19 +221,19 @@ class WeaviateRecommendClient:
             trainable_properties,
         )
 
-    def delete(self) -> DeleteRecommenderResponse:
+    def delete(self) -> "DeleteRecommenderResponse":
         """
         Delete the recommender.
         """
         return self._recommender_management.delete()
 
-    def details(self) -> RecommenderDetailsResponse:
+    def details(self) -> "RecommenderDetailsResponse":
         """
         Get details about the recommender.
         """
         return self._recommender_management.details()
 
-    def train(self, overwrite: bool = False) -> TrainRecommenderResponse:
+    def train(self, overwrite: bool = False) -> "TrainRecommenderResponse":
         """
         Triggers the recommender training.
 
@@ -103,21 +242,71 @@ class WeaviateRecommendClient:
         """
         return self._trainer.train(overwrite)
 
-    def train_status(self) -> TrainingStatusResponse:
+    def train_status(self) -> "TrainingStatusResponse":
         """
         Get the training status of the recommender.
         """
         return self._trainer.status()
 
+    def wait_until_trained(
+        self,
+        timeout: Optional[float] = None,
+        poll_interval: float = 1.0,
+        max_poll_interval: float = 30.0,
+        on_progress: Optional[Callable[["TrainingStatusResponse", float], None]] = None,
+    ) -> "TrainingStatusResponse":
+        """
+        Wait until the recommender is trained, polling the lightweight training status endpoint.
+
+        Polls start every `poll_interval` seconds, and back off up to `max_poll_interval` seconds
+        while the training state does not change. Clients waiting for the same recommender in
+        the process share their polls.
+
+        Args:
+            timeout (float, optional): Maximum number of seconds to wait. Defaults to None,
+                which waits forever.
+            on_progress (Callable[[TrainingStatusResponse, float], None], optional): Called
+                with every polled status and the seconds waited so far.
+
+        Raises:
+            TimeoutError: If the recommender is not trained after `timeout` seconds.
+            TrainingFailedException: If the training ends in the error state.
+        """
+        return self._trainer.wait_until_trained(
+            timeout, poll_interval, max_poll_interval, on_progress
+        )
+
     def search(
         self,
         text: str,
         user_id: str | UUID,
         limit: int = 10,
         influence_factor: float = 0.2,
-        filters: list[FilterConfig] | None = None,
-    ) -> PersonalisedSearchResponse:
+        filters: Optional["Filters"] = None,
+        return_properties: Optional[Sequence[str]] = None,
+    ) -> "PersonalisedSearchResponse":
         """
         Search for text in the Weaviate database and return the results personalised for the user.
+        Only the `return_properties` of the items are returned, when they are set.
+        """
+        return self._search.search(
+            text, user_id, limit, influence_factor, filters, return_properties
+        )
+
+    def search_many(
+        self,
+        queries: Sequence["SearchQuery"],
+        max_concurrency: int = DEFAULT_MAX_IN_FLIGHT,
+    ) -> List[Union["PersonalisedSearchResponse", Exception]]:
+        """
+        Run multiple personalised searches concurrently over the client's connection pool.
+
+        Args:
+            queries (Sequence[SearchQuery]): The text, user and options of every search.
+            max_concurrency (int, optional): Maximum number of searches in flight. Defaults to 4.
+
+        Returns:
+            One result per query, in the order of `queries`. A query that failed is returned as
+            the exception it raised, without failing the other queries.
         """
-        return self._search.search(text, user_id, limit, influence_factor, filters)
+        return self._search.search_many(queries, max_concurrency)
@@ -0,0 +1,41 @@
+from typing import Any, Dict, Iterator, List, Mapping, Sequence
+
+# rows converted from a pandas DataFrame at once, to bound the memory used by the conversion
+PANDAS_CHUNK_SIZE = 10_000
+
+
+def is_columnar(data: Any) -> bool:
+    """
+    Whether `data` is a mapping of columns, a pyarrow Table or RecordBatch, or a pandas
+    DataFrame, detected without importing pyarrow or pandas.
+    """
+    return (
+        isinstance(data, Mapping)
+        or hasattr(data, "to_batches")
+        or (hasattr(data, "to_pylist") and hasattr(data, "num_rows"))
+        or (hasattr(data, "iloc") and hasattr(data, "columns"))
+    )
+
+
+def iter_rows(data: Any) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily iterates the rows of columnar data as dicts, see `is_columnar`.
+    """
+    if isinstance(data, Mapping):
+        columns: Dict[str, Sequence[Any]] = dict(data)
+        lengths = {len(column) for column in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError("all columns must have the same length")
+        names: List[str] = list(columns)
+        for values in zip(*columns.values()):
+            yield dict(zip(names, values))
+    elif hasattr(data, "to_batches"):
+        for batch in data.to_batches():
+            yield from batch.to_pylist()
+    elif hasattr(data, "to_pylist"):
+        yield from data.to_pylist()
+    elif hasattr(data, "iloc"):
+        for start in range(0, len(data), PANDAS_CHUNK_SIZE):
+            yield from data.iloc[start : start + PANDAS_CHUNK_SIZE].to_dict("records")
+    else:
+        raise TypeError(f"unsupported columnar data: {type(data).__name__}")
@@ -0,0 +1,70 @@
+"""
+Compression of request bodies, and the response encodings accepted by the client.
+
+gzip uses the standard library, zstd requires the optional `zstandard` dependency. zstd
+responses are only accepted when the HTTP library of the transport can decode them, which
+depends on its version as well as on `zstandard`.
+"""
+
+import gzip
+import importlib.util
+import threading
+from typing import Any, Optional, Tuple
+
+from weaviate_recommend.config import CompressionConfig
+
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+
+
+def zstd_available() -> bool:
+    return importlib.util.find_spec("zstandard") is not None
+
+
+def accept_encoding(config: CompressionConfig, decodes_zstd: bool) -> str:
+    """
+    The `Accept-Encoding` header of the requests, listing the encodings the transport can decode.
+    """
+    if not config.compress_responses:
+        return "identity"
+    return "zstd, gzip" if decodes_zstd else "gzip"
+
+
+class _Compressor:
+    """
+    Compresses the request bodies larger than the `min_size` of the config. Thread-safe.
+    `decodes_zstd` tells whether the HTTP library of the transport decodes zstd responses.
+    """
+
+    def __init__(self, config: CompressionConfig, decodes_zstd: bool = False):
+        self.config = config
+        self.accept_encoding = accept_encoding(config, decodes_zstd)
+        if config.algorithm == "zstd":
+            try:
+                import zstandard
+            except ImportError as e:
+                raise ImportError(
+                    "zstd compression requires zstandard, install it with "
+                    "`pip install zstandard`"
+                ) from e
+            self._zstd: Any = zstandard
+            # zstd compressors are not thread-safe, every thread gets its own
+            self._local = threading.local()
+
+    def _zstd_compressor(self) -> Any:
+        compressor = getattr(self._local, "compressor", None)
+        if compressor is None:
+            level = self.config.level if self.config.level is not None else ZSTD_LEVEL
+            compressor = self._local.compressor = self._zstd.ZstdCompressor(level=level)
+        return compressor
+
+    def compress(self, data: Optional[bytes]) -> Tuple[Optional[bytes], Optional[str]]:
+        """
+        Returns the body to send and its `Content-Encoding`, None if it is not compressed.
+        """
+        if data is None or len(data) < self.config.min_size:
+            return data, None
+        if self.config.algorithm == "zstd":
+            return self._zstd_compressor().compress(data), "zstd"
+        level = self.config.level if self.config.level is not None else GZIP_LEVEL
+        return gzip.compress(data, compresslevel=level, mtime=0), "gzip"
@@ -0,0 +1,130 @@
+from typing import Literal, Optional, Set
+
+from pydantic import BaseModel, Field
+
+# size of the chunks read from streamed response bodies
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+class RetryConfig(BaseModel):
+    """
+    Retry policy of the HTTP transport. The n-th retry waits a random duration between 0 and
+    `backoff_factor * 2 ** n` seconds, or the duration of the `Retry-After` header of the
+    response, capped by `max_backoff`.
+
+    Args:
+        max_retries (int): Maximum number of retries of a request, 0 disables retries. Defaults to 3.
+        backoff_factor (float): Base delay of the exponential backoff in seconds. Defaults to 0.5.
+        max_backoff (float): Maximum delay between two attempts in seconds. Defaults to 30.0.
+        jitter (bool): Randomize the delays, so clients don't retry in lockstep. Defaults to True.
+        retry_on_status (Set[int]): Response status codes that are retried. Defaults to
+            429, 502, 503 and 504.
+        retry_non_idempotent (bool): Also retry requests that are not idempotent, like adding
+            interactions, which may then be applied twice. Defaults to False.
+    """
+
+    max_retries: int = Field(default=3, ge=0)
+    backoff_factor: float = Field(default=0.5, ge=0)
+    max_backoff: float = Field(default=30.0, ge=0)
+    jitter: bool = True
+    retry_on_status: Set[int] = Field(default_factory=lambda: {429, 502, 503, 504})
+    retry_non_idempotent: bool = False
+
+
+class CircuitBreakerConfig(BaseModel):
+    """
+    Circuit breaker of the HTTP transport. After `failure_threshold` consecutive failed
+    attempts (server errors, timeouts or connection errors), requests fail fast with a
+    `CircuitOpenException` for `recovery_timeout` seconds. The next request then probes the
+    health endpoint of the service, and the circuit closes again if it is healthy.
+    """
+
+    failure_threshold: int = Field(default=5, gt=0)
+    recovery_timeout: float = Field(default=30.0, gt=0)
+
+
+class HedgeConfig(BaseModel):
+    """
+    Hedging of the read-only recommendation and search calls. When a call has not answered
+    within the `percentile` latency of the recent calls to its endpoint, a duplicate request is
+    sent and whichever response comes first is used, which cuts the tail latency caused by an
+    occasional slow server replica.
+
+    Args:
+        percentile (float): Quantile of the recent latencies of an endpoint after which a call
+            is hedged. Defaults to 0.95.
+        initial_delay (float): Seconds after which a call is hedged until `min_samples`
+            latencies of its endpoint were observed. Defaults to 0.1.
+        min_delay (float): Lower bound of the hedging delay in seconds. Defaults to 0.005.
+        max_hedge_ratio (float): Maximum fraction of the calls that are hedged, so hedging does
+            not overload a slow server. Defaults to 0.05.
+        window (int): Number of recent latencies kept per endpoint. Defaults to 1000.
+        min_samples (int): Number of latencies needed before the percentile is used.
+            Defaults to 20.
+    """
+
+    percentile: float = Field(default=0.95, gt=0, lt=1)
+    initial_delay: float = Field(default=0.1, ge=0)
+    min_delay: float = Field(default=0.005, ge=0)
+    max_hedge_ratio: float = Field(default=0.05, ge=0, le=1)
+    window: int = Field(default=1000, gt=0)
+    min_samples: int = Field(default=20, gt=0)
+
+
+class CompressionConfig(BaseModel):
+    """
+    Compression of the request bodies, and of the responses negotiated with the server, which
+    shrinks the large batch and recommendation payloads on slow or metered links at the cost of
+    some CPU time on both sides.
+
+    Args:
+        algorithm (str): "gzip", or "zstd" which is faster and compresses better but requires
+            the optional `zstandard` dependency. Defaults to "gzip".
+        min_size (int): Request bodies smaller than this many bytes are sent uncompressed, as
+            compressing them costs more than it saves. Defaults to 1024.
+        level (int, optional): Compression level of the algorithm. Defaults to None, which uses
+            6 for gzip and 3 for zstd.
+        compress_responses (bool): Ask the server for compressed responses. Defaults to True.
+    """
+
+    algorithm: Literal["gzip", "zstd"] = "gzip"
+    min_size: int = Field(default=1024, ge=0)
+    level: Optional[int] = None
+    compress_responses: bool = True
+
+
+class ConnectionConfig(BaseModel):
+    """
+    Connection settings for the HTTP transport shared by every service of a client.
+
+    Args:
+        pool_connections (int): Number of distinct hosts to keep connection pools for. Defaults to 10.
+        pool_maxsize (int): Maximum number of connections kept alive per host. Defaults to 10.
+        pool_block (bool): Block when the pool is exhausted instead of opening extra, non-pooled
+            connections. Defaults to False.
+        keep_alive (bool): Reuse connections between requests. Defaults to True.
+        keep_alive_expiry (float): Seconds an idle pooled connection is kept open. Only honoured
+            by the async client, the sync client relies on the server to close idle connections.
+            Defaults to 5.0.
+        connect_timeout (float): Seconds to wait for a connection to be established. Defaults to 10.0.
+        read_timeout (float): Seconds to wait for the server to send a response. Defaults to 60.0.
+        retry (RetryConfig): Retry policy of failed requests. Defaults to `RetryConfig()`.
+        circuit_breaker (CircuitBreakerConfig, optional): Fail fast while the service is
+            unhealthy. Defaults to None, which disables the circuit breaker.
+        hedge (HedgeConfig, optional): Hedge slow recommendation and search calls. Defaults to
+            None, which disables hedging.
+        compression (CompressionConfig, optional): Compress request bodies and negotiate
+            compressed responses. Defaults to None, which sends uncompressed bodies.
+    """
+
+    pool_connections: int = Field(default=10, gt=0)
+    pool_maxsize: int = Field(default=10, gt=0)
+    pool_block: bool = False
+    keep_alive: bool = True
+    keep_alive_expiry: float = Field(default=5.0, ge=0)
+    connect_timeout: float = Field(default=10.0, gt=0)
+    read_timeout: float = Field(default=60.0, gt=0)
+    retry: RetryConfig = Field(default_factory=RetryConfig)
+    circuit_breaker: Optional[CircuitBreakerConfig] = None
+    hedge: Optional[HedgeConfig] = None
+    compression: Optional[CompressionConfig] = None
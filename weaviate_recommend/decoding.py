@@ -0,0 +1,223 @@
+import codecs
+import json
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    Sequence,
+    Type,
+    TypeVar,
+)
+
+from pydantic import BaseModel
+
+from weaviate_recommend.models.responses import (
+    PersonalisedSearchResponse,
+    RecommendationResponse,
+    RecommendationResponseWithScore,
+    RecommendationsResponse,
+)
+
+try:
+    import orjson
+
+    loads: Callable[[bytes], Any] = orjson.loads
+except ImportError:  # pragma: no cover - orjson is optional
+    loads = json.loads
+
+
+def dumps(value: Any) -> bytes:
+    """
+    Serializes a JSON request body, like `requests` does for its `json` argument.
+    """
+    return json.dumps(value, allow_nan=False).encode("utf-8")
+
+
+# "fast" trusts the responses of the service and skips pydantic validation of recommendation and
+# search results, "validate" checks every field, which is useful to debug a misbehaving server
+DECODE_MODE = Literal["fast", "validate"]
+
+M = TypeVar("M", bound=BaseModel)
+
+
+def constructor(model: Type[M]) -> Callable[[Dict[str, Any]], M]:
+    """
+    Returns a function building instances of `model` from trusted values, without validating or
+    copying them.
+
+    Much cheaper than `model_validate`, and than `model_construct`, which still walks the fields
+    to fill defaults. The values must contain every field of the model with the right type.
+    """
+    fields = frozenset(model.model_fields)
+    new = object.__new__
+    set_attribute = object.__setattr__
+
+    def construct(values: Dict[str, Any]) -> M:
+        instance = new(model)
+        set_attribute(instance, "__dict__", values)
+        set_attribute(instance, "__pydantic_fields_set__", set(fields))
+        set_attribute(instance, "__pydantic_extra__", None)
+        set_attribute(instance, "__pydantic_private__", None)
+        return instance
+
+    return construct
+
+
+_construct_recommendations = constructor(RecommendationsResponse)
+_construct_recommendation = constructor(RecommendationResponse)
+_construct_search_results = constructor(PersonalisedSearchResponse)
+_construct_search_result = constructor(RecommendationResponseWithScore)
+
+
+def _project(
+    results: List[Dict[str, Any]], return_properties: Optional[Sequence[str]]
+) -> List[Dict[str, Any]]:
+    """
+    Keeps only the `return_properties` of each result, for servers returning every property.
+
+    Results are copied rather than modified, as the payload may be shared with a fallback store.
+    """
+    if return_properties is None:
+        return results
+    names = tuple(return_properties)
+    projected = []
+    for result in results:
+        properties = result["properties"]
+        projected.append(
+            dict(
+                result,
+                properties={
+                    name: properties[name] for name in names if name in properties
+                },
+            )
+        )
+    return projected
+
+
+def decode_recommendations(
+    payload: Dict[str, Any],
+    mode: DECODE_MODE,
+    return_properties: Optional[Sequence[str]] = None,
+) -> RecommendationsResponse:
+    recommendations = _project(payload["recommendations"], return_properties)
+    if mode == "validate":
+        return RecommendationsResponse.model_validate(
+            {"recommendations": recommendations}
+        )
+    return _construct_recommendations(
+        {
+            "recommendations": [
+                _construct_recommendation(recommendation)
+                for recommendation in recommendations
+            ]
+        }
+    )
+
+
+def decode_search_results(
+    payload: Dict[str, Any],
+    mode: DECODE_MODE,
+    return_properties: Optional[Sequence[str]] = None,
+) -> PersonalisedSearchResponse:
+    results = _project(payload["results"], return_properties)
+    if mode == "validate":
+        return PersonalisedSearchResponse.model_validate({"results": results})
+    return _construct_search_results(
+        {"results": [_construct_search_result(result) for result in results]}
+    )
+
+
+_WHITESPACE = " \t\n\r"
+
+
+class JsonArrayParser:
+    """
+    Incrementally parses the elements of a JSON array from the chunks of a streamed response
+    body, so only the elements being parsed are held in memory.
+    """
+
+    def __init__(self) -> None:
+        self._decoder = json.JSONDecoder()
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._started = False
+        self._ended = False
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        """
+        Returns the elements completed by `chunk`.
+        """
+        return self._parse(self._utf8.decode(chunk), final=False)
+
+    def close(self) -> List[Any]:
+        """
+        Returns the last elements, once the whole body was fed.
+
+        Raises:
+            ValueError: If the body is not a complete JSON array.
+        """
+        elements = self._parse(self._utf8.decode(b"", final=True), final=True)
+        if not self._ended:
+            raise ValueError("the JSON array is truncated")
+        return elements
+
+    def _parse(self, text: str, final: bool) -> List[Any]:
+        buffer, position, elements = self._buffer + text, 0, []
+        while True:
+            while position < len(buffer) and buffer[position] in _WHITESPACE:
+                position += 1
+            if position == len(buffer):
+                break
+            if not self._started:
+                if buffer[position] != "[":
+                    raise ValueError("the response is not a JSON array")
+                self._started, position = True, position + 1
+            elif self._ended:
+                raise ValueError("unexpected data after the JSON array")
+            elif buffer[position] in ",]":
+                self._ended = buffer[position] == "]"
+                position += 1
+            else:
+                try:
+                    element, end = self._decoder.raw_decode(buffer, position)
+                except json.JSONDecodeError:
+                    if final:
+                        raise
+                    # the element continues in the next chunk
+                    break
+                if end == len(buffer) and not final:
+                    # a number could continue in the next chunk
+                    break
+                elements.append(element)
+                position = end
+        self._buffer = buffer[position:]
+        return elements
+
+
+def iter_json_array(chunks: Iterable[bytes]) -> Iterator[Any]:
+    """
+    Lazily yields the elements of a JSON array streamed in `chunks`.
+    """
+    parser = JsonArrayParser()
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    yield from parser.close()
+
+
+async def aiter_json_array(chunks: AsyncIterable[bytes]) -> AsyncIterator[Any]:
+    """
+    The asyncio counterpart of `iter_json_array`.
+    """
+    parser = JsonArrayParser()
+    async for chunk in chunks:
+        for element in parser.feed(chunk):
+            yield element
+    for element in parser.close():
+        yield element
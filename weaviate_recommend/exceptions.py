@@ -1,2 +1,29 @@
+from typing import Optional
+
+
 class RecommendApiException(Exception):
     "An exception for API errors"
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class CircuitOpenException(RecommendApiException):
+    "Raised without contacting the server while the circuit breaker considers it unhealthy"
+
+
+class InteractionBufferFullException(Exception):
+    "Raised when an interaction buffer configured with on_full='raise' is full"
+
+
+class InteractionSpoolFullException(Exception):
+    "Raised when an interaction spool configured with on_full='raise' reached its disk cap"
+
+
+class InteractionSpoolLockedException(Exception):
+    "Raised when opening an interaction spool on a directory another spool is using"
+
+
+class TrainingFailedException(Exception):
+    "Raised while waiting for a training that ended in the error state"
@@ -0,0 +1,370 @@
+import atexit
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Optional,
+    Protocol,
+    Set,
+    Tuple,
+    Union,
+)
+
+from pydantic import BaseModel
+
+from weaviate_recommend.decoding import dumps, loads
+from weaviate_recommend.exceptions import RecommendApiException
+
+if TYPE_CHECKING:
+    import asyncio
+
+logger = logging.getLogger(__name__)
+
+# errors caused by the request itself, that a stored response must not hide
+_CLIENT_ERRORS = frozenset([400, 401, 403, 404, 422])
+
+
+class FallbackStats(BaseModel):
+    stored: int
+    served_on_error: int
+    served_on_slow: int
+    misses: int
+
+
+class FallbackStore(Protocol):
+    """
+    Storage of the last good response of every recommendation request.
+    """
+
+    def get(self, key: str) -> Optional[Tuple[float, Any]]:
+        """
+        Returns the Unix time a response was stored at, and the response.
+        """
+        ...
+
+    def put(self, key: str, payload: Any) -> None: ...
+
+    def close(self) -> None: ...
+
+
+class MemoryFallbackStore:
+    """
+    A thread-safe, in-process LRU fallback store. Responses are stored encoded, so a served
+    response never shares objects with the store or with the responses served before.
+
+    Args:
+        max_size (int): Maximum number of stored responses. Defaults to 10_000.
+    """
+
+    def __init__(self, max_size: int = 10_000):
+        if max_size < 1:
+            raise ValueError("max_size must be positive")
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Tuple[float, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return None
+        return entry[0], loads(entry[1])
+
+    def put(self, key: str, payload: Any) -> None:
+        data = dumps(payload)
+        with self._lock:
+            self._entries[key] = (time.time(), data)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def close(self) -> None:
+        pass
+
+
+class DiskFallbackStore:
+    """
+    A fallback store persisted to an SQLite file, so stored responses survive restarts. The
+    file is memory mapped for reads, and responses are written in batches by a background
+    thread, off the path of the recommendation calls.
+
+    Args:
+        path (str): Path of the database file, created if it does not exist.
+        max_size (int, optional): Maximum number of stored responses, the oldest are removed
+            first. Defaults to 100_000.
+        flush_interval (float): Seconds between two writes of the new responses. Defaults to 1.0.
+        mmap_size (int): Bytes of the file mapped in memory. Defaults to 256 MiB.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_size: Optional[int] = 100_000,
+        flush_interval: float = 1.0,
+        mmap_size: int = 256 * 1024 * 1024,
+    ):
+        if max_size is not None and max_size < 1:
+            raise ValueError("max_size must be positive")
+        self.path = path
+        self.max_size = max_size
+        self.flush_interval = flush_interval
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(f"PRAGMA mmap_size={int(mmap_size)}")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses "
+            "(key TEXT PRIMARY KEY, stored_at REAL NOT NULL, payload BLOB NOT NULL)"
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS responses_stored_at ON responses (stored_at)"
+        )
+        # encoded responses not written yet, and responses being written
+        self._pending: Dict[str, Tuple[float, bytes]] = {}
+        self._flushing: Dict[str, Tuple[float, bytes]] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="weaviate-recommend-fallback", daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.close)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Failed to write the fallback store %s", self.path)
+
+    def get(self, key: str) -> Optional[Tuple[float, Any]]:
+        with self._lock:
+            row = self._pending.get(key) or self._flushing.get(key)
+            if row is None:
+                row = self._db.execute(
+                    "SELECT stored_at, payload FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+        if row is None:
+            return None
+        return row[0], loads(row[1])
+
+    def put(self, key: str, payload: Any) -> None:
+        data = dumps(payload)
+        with self._lock:
+            self._pending[key] = (time.time(), data)
+
+    def flush(self) -> None:
+        """
+        Writes the responses stored since the last flush.
+        """
+        with self._flush_lock:
+            with self._lock:
+                self._flushing, self._pending = self._pending, {}
+            if not self._flushing:
+                return
+            rows = [
+                (key, stored_at, data)
+                for key, (stored_at, data) in self._flushing.items()
+            ]
+            with self._lock:
+                self._db.execute("BEGIN")
+                try:
+                    self._db.executemany(
+                        "INSERT OR REPLACE INTO responses VALUES (?, ?, ?)", rows
+                    )
+                    if self.max_size is not None:
+                        self._db.execute(
+                            "DELETE FROM responses WHERE key IN (SELECT key FROM "
+                            "responses ORDER BY stored_at DESC LIMIT -1 OFFSET ?)",
+                            (self.max_size,),
+                        )
+                    self._db.execute("COMMIT")
+                except BaseException:
+                    self._db.execute("ROLLBACK")
+                    raise
+                finally:
+                    self._flushing = {}
+
+    def close(self) -> None:
+        """
+        Writes the pending responses and closes the database.
+        """
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        atexit.unregister(self.close)
+        self._thread.join()
+        self.flush()
+        with self._lock:
+            self._db.close()
+
+
+class RecommendationFallback:
+    """
+    Keeps the last good response of every recommendation request, and serves it when the same
+    request fails, for instance while the recommender is retraining or the service is degraded.
+
+    Pass it to a client with `WeaviateRecommendClient(..., recommendation_fallback=...)`. Unlike
+    the recommendation cache, it is not cleared when the recommender is trained.
+
+    Args:
+        store (FallbackStore, optional): Where responses are kept. Defaults to a
+            `MemoryFallbackStore`, use a `DiskFallbackStore` to survive restarts.
+        slow_threshold (float, optional): Seconds after which the stored response is served
+            when the call has not answered yet. The call then completes in the background and
+            refreshes the store. Defaults to None, which only serves stored responses on errors.
+        max_age (float, optional): Stored responses older than this many seconds are not
+            served. Defaults to None, which serves them whatever their age.
+    """
+
+    def __init__(
+        self,
+        store: Optional[FallbackStore] = None,
+        slow_threshold: Optional[float] = None,
+        max_age: Optional[float] = None,
+    ):
+        if slow_threshold is not None and slow_threshold <= 0:
+            raise ValueError("slow_threshold must be positive")
+        self.store: FallbackStore = (
+            store if store is not None else MemoryFallbackStore()
+        )
+        self.slow_threshold = slow_threshold
+        self.max_age = max_age
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # calls completing in the background after a stored response was served
+        self._background: Set["asyncio.Future[Any]"] = set()
+        self._lock = threading.Lock()
+        self._stored = 0
+        self._served_on_error = 0
+        self._served_on_slow = 0
+        self._misses = 0
+
+    def _lookup(self, key: str) -> Optional[Any]:
+        entry = self.store.get(key)
+        if entry is None:
+            return None
+        stored_at, payload = entry
+        if self.max_age is not None and time.time() - stored_at > self.max_age:
+            return None
+        return payload
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def _completed(
+        self, key: str, future: Union["Future[Any]", "asyncio.Future[Any]"]
+    ) -> None:
+        if future.cancelled() or future.exception() is not None:
+            return
+        self.store.put(key, future.result())
+        self._count("_stored")
+
+    def _on_error(self, key: str, error: Exception) -> Tuple[Any, bool]:
+        if (
+            isinstance(error, RecommendApiException)
+            and error.status_code in _CLIENT_ERRORS
+        ):
+            raise error
+        payload = self._lookup(key)
+        if payload is None:
+            self._count("_misses")
+            raise error
+        logger.warning("Serving a stored recommendation response after: %r", error)
+        self._count("_served_on_error")
+        return payload, True
+
+    def _slow(self, key: str) -> Optional[Any]:
+        payload = self._lookup(key)
+        if payload is not None:
+            self._count("_served_on_slow")
+        return payload
+
+    def fetch(self, key: str, send: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Returns the response of `send`, or the stored response of `key` if it fails or is slow,
+        and whether the stored response was returned. Stale responses should not be cached.
+        """
+        if self.slow_threshold is None:
+            try:
+                payload = send()
+            except Exception as e:
+                return self._on_error(key, e)
+            self.store.put(key, payload)
+            self._count("_stored")
+            return payload, False
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    thread_name_prefix="weaviate-recommend-fallback"
+                )
+        future = self._executor.submit(send)
+        future.add_done_callback(lambda done: self._completed(key, done))
+        done, _ = wait([future], timeout=self.slow_threshold)
+        if not done:
+            payload = self._slow(key)
+            if payload is not None:
+                return payload, True
+        try:
+            return future.result(), False
+        except Exception as e:
+            return self._on_error(key, e)
+
+    async def afetch(
+        self, key: str, send: Callable[[], Awaitable[Any]]
+    ) -> Tuple[Any, bool]:
+        """
+        The asyncio counterpart of `fetch`.
+        """
+        import asyncio
+
+        if self.slow_threshold is None:
+            try:
+                payload = await send()
+            except Exception as e:
+                return self._on_error(key, e)
+            self.store.put(key, payload)
+            self._count("_stored")
+            return payload, False
+        task = asyncio.ensure_future(send())
+        task.add_done_callback(lambda done: self._completed(key, done))
+        done, _ = await asyncio.wait({task}, timeout=self.slow_threshold)
+        if not done:
+            payload = self._slow(key)
+            if payload is not None:
+                self._background.add(task)
+                task.add_done_callback(self._background.discard)
+                return payload, True
+        try:
+            return await task, False
+        except Exception as e:
+            return self._on_error(key, e)
+
+    def stats(self) -> FallbackStats:
+        with self._lock:
+            return FallbackStats(
+                stored=self._stored,
+                served_on_error=self._served_on_error,
+                served_on_slow=self._served_on_slow,
+                misses=self._misses,
+            )
+
+    def close(self) -> None:
+        """
+        Stops the executor of the slow calls and closes the store, writing its pending
+        responses. Called by the `close` method of the client it was passed to.
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+        self.store.close()
@@ -0,0 +1,76 @@
+import collections
+import math
+import threading
+from typing import Deque, Dict
+
+from weaviate_recommend.config import HedgeConfig
+
+# hedge tokens that can be saved up, the hedges that can be sent in a burst
+HEDGE_BURST = 10.0
+
+
+class _LatencyWindow:
+    """
+    Recent latencies of an endpoint, and their quantile, recomputed every tenth of the window
+    rather than on every call.
+    """
+
+    def __init__(self, size: int):
+        self.latencies: Deque[float] = collections.deque(maxlen=size)
+        self.quantile = 0.0
+        self._stale = 0
+        self._refresh_every = max(1, size // 10)
+
+    def observe(self, latency: float, percentile: float, min_samples: int) -> None:
+        self.latencies.append(latency)
+        self._stale += 1
+        count = len(self.latencies)
+        if count >= min_samples and (
+            self._stale >= self._refresh_every or count == min_samples
+        ):
+            ordered = sorted(self.latencies)
+            self.quantile = ordered[min(count - 1, math.ceil(percentile * count) - 1)]
+            self._stale = 0
+
+
+class _HedgePolicy:
+    """
+    Thread-safe hedging state shared by all requests of a transport: the hedging delay of every
+    endpoint, and a token bucket capping the fraction of calls that are hedged.
+    """
+
+    def __init__(self, config: HedgeConfig):
+        self.config = config
+        self._windows: Dict[str, _LatencyWindow] = {}
+        # hedges are earned by calls, so at most `max_hedge_ratio` of them are ever hedged
+        self._tokens = 0.0
+        self._lock = threading.Lock()
+
+    def delay(self, endpoint: str) -> float:
+        """
+        Seconds after which a call to `endpoint` is hedged. Every call earns a fraction of a
+        hedge token.
+        """
+        with self._lock:
+            self._tokens = min(HEDGE_BURST, self._tokens + self.config.max_hedge_ratio)
+            window = self._windows.get(endpoint)
+            if window is None or len(window.latencies) < self.config.min_samples:
+                return max(self.config.min_delay, self.config.initial_delay)
+            return max(self.config.min_delay, window.quantile)
+
+    def acquire(self) -> bool:
+        """
+        Takes a hedge token, returns False if the hedge rate is exhausted.
+        """
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+    def observe(self, endpoint: str, latency: float) -> None:
+        with self._lock:
+            window = self._windows.get(endpoint)
+            if window is None:
+                window = self._windows[endpoint] = _LatencyWindow(self.config.window)
+            window.observe(latency, self.config.percentile, self.config.min_samples)
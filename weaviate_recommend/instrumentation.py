@@ -0,0 +1,362 @@
+import bisect
+import logging
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+# IDs are replaced in endpoint names, so metrics are not split per user or item
+_ID_PATTERN = re.compile(
+    r"(?<=/)[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}(?=/|$)"
+)
+
+# upper bounds in seconds of the latency histogram buckets
+DEFAULT_LATENCY_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+class RequestEvent(BaseModel):
+    """
+    Measurements of a single call to the service, passed to the request hooks of a client.
+
+    Args:
+        endpoint (str): Path of the endpoint below `/v1`, with IDs replaced by `{id}`, for
+            instance `item-recommendations/item` or `user/{id}/interactions`.
+        method (str): The HTTP method.
+        status_code (int, optional): Status of the last response, None if no response was
+            received.
+        request_bytes (int): Size of the request body.
+        response_bytes (int): Size of the response body.
+        start_time (float): Unix time at which the call started.
+        serialize_time (float): Seconds spent serializing the request body to JSON.
+        http_time (float): Seconds spent sending the request and receiving the response,
+            including retries and their backoff.
+        deserialize_time (float): Seconds spent parsing the JSON response and building the
+            response models from it.
+        retries (int): Number of times the request was retried.
+        hedged (bool): Whether a duplicate request was sent because the response was slow, see
+            `HedgeConfig`.
+        duplicate (bool): Whether the event is the duplicate request of a hedged call. It is
+            reported in addition to the event of the call, with the bytes and timing of the
+            duplicate only.
+        error (str, optional): Name of the exception raised by the call, if it failed.
+    """
+
+    endpoint: str
+    method: str
+    status_code: Optional[int] = None
+    request_bytes: int = 0
+    response_bytes: int = 0
+    start_time: float
+    serialize_time: float = 0.0
+    http_time: float = 0.0
+    deserialize_time: float = 0.0
+    retries: int = 0
+    hedged: bool = False
+    duplicate: bool = False
+    error: Optional[str] = None
+
+    @property
+    def duration(self) -> float:
+        return self.serialize_time + self.http_time + self.deserialize_time
+
+
+RequestHook = Callable[[RequestEvent], None]
+
+
+def endpoint_name(url: str) -> str:
+    """
+    Returns the endpoint of a service URL, e.g. `item-recommendations/item`.
+    """
+    path = urlsplit(url).path
+    _, _, endpoint = path.partition("/v1/")
+    return _ID_PATTERN.sub("{id}", endpoint or path.lstrip("/"))
+
+
+class _RequestRecorder:
+    """
+    Times the phases of a request on behalf of a transport and reports them to the hooks.
+    """
+
+    __slots__ = (
+        "hooks",
+        "method",
+        "url",
+        "retries",
+        "hedged",
+        "duplicate",
+        "status_code",
+        "_wall",
+        "_start",
+        "_serialized",
+        "_received",
+        "_request_bytes",
+        "_response_bytes",
+    )
+
+    def __init__(self, hooks: List[RequestHook], method: str, url: str):
+        self.hooks = hooks
+        self.method = method
+        self.url = url
+        self.retries = 0
+        self.hedged = False
+        self.duplicate = False
+        self.status_code: Optional[int] = None
+        self._wall = time.time()
+        self._start = self._serialized = self._received = time.perf_counter()
+        self._request_bytes = self._response_bytes = 0
+
+    def serialized(self, data: Optional[bytes]) -> None:
+        self._serialized = self._received = time.perf_counter()
+        self._request_bytes = len(data) if data else 0
+
+    def hedge(self, data: Optional[bytes]) -> "_RequestRecorder":
+        """
+        Marks the call as hedged, returns the recorder of its duplicate request.
+        """
+        self.hedged = True
+        duplicate = _RequestRecorder(self.hooks, self.method, self.url)
+        duplicate.duplicate = True
+        duplicate.serialized(data)
+        return duplicate
+
+    def received(self, content: bytes) -> None:
+        self.received_size(len(content))
+
+    def received_size(self, size: int) -> None:
+        self._received = time.perf_counter()
+        self._response_bytes = size
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        end = time.perf_counter()
+        if error is not None and self._received == self._serialized:
+            # the request failed before a response was received
+            self._received = end
+        event = RequestEvent(
+            endpoint=endpoint_name(self.url),
+            method=self.method,
+            status_code=self.status_code,
+            request_bytes=self._request_bytes,
+            response_bytes=self._response_bytes,
+            start_time=self._wall,
+            serialize_time=self._serialized - self._start,
+            http_time=self._received - self._serialized,
+            deserialize_time=end - self._received,
+            retries=self.retries,
+            hedged=self.hedged,
+            duplicate=self.duplicate,
+            error=type(error).__name__ if error is not None else None,
+        )
+        for hook in self.hooks:
+            try:
+                hook(event)
+            except Exception:
+                # instrumentation must never fail the call it measures
+                logger.exception("Request hook %r failed", hook)
+
+
+class _Histogram:
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimates a quantile by linear interpolation within its bucket.
+        """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            if count and cumulative + count >= rank:
+                lower = self.buckets[index - 1] if index > 0 else 0.0
+                upper = self.buckets[index] if index < len(self.buckets) else self.max
+                return lower + (upper - lower) * (rank - cumulative) / count
+            cumulative += count
+        return self.max
+
+
+class EndpointMetrics(BaseModel):
+    """
+    Aggregated measurements of the calls to one endpoint. Latencies are in seconds.
+    """
+
+    count: int
+    errors: int
+    retries: int
+    hedged: int
+    request_bytes: int
+    response_bytes: int
+    latency_sum: float
+    latency_max: float
+    latency_p50: float
+    latency_p90: float
+    latency_p99: float
+    serialize_time_sum: float
+    http_time_sum: float
+    deserialize_time_sum: float
+    # cumulative number of calls faster than each bucket upper bound, like a Prometheus histogram
+    latency_buckets: List[Tuple[float, int]]
+
+
+class _EndpointAggregate:
+    def __init__(self, buckets: Sequence[float]):
+        self.latency = _Histogram(buckets)
+        self.errors = 0
+        self.retries = 0
+        self.hedged = 0
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.serialize_time = 0.0
+        self.http_time = 0.0
+        self.deserialize_time = 0.0
+
+    def add(self, event: RequestEvent) -> None:
+        if event.duplicate:
+            # the duplicate of a hedged call only adds traffic, the call is counted once
+            self.request_bytes += event.request_bytes
+            self.response_bytes += event.response_bytes
+            return
+        self.latency.observe(event.duration)
+        self.errors += event.error is not None
+        self.retries += event.retries
+        self.hedged += event.hedged
+        self.request_bytes += event.request_bytes
+        self.response_bytes += event.response_bytes
+        self.serialize_time += event.serialize_time
+        self.http_time += event.http_time
+        self.deserialize_time += event.deserialize_time
+
+    def metrics(self) -> EndpointMetrics:
+        latency = self.latency
+        cumulative, buckets = 0, []
+        for bound, count in zip(latency.buckets, latency.counts):
+            cumulative += count
+            buckets.append((bound, cumulative))
+        buckets.append((float("inf"), latency.count))
+        return EndpointMetrics(
+            count=latency.count,
+            errors=self.errors,
+            retries=self.retries,
+            hedged=self.hedged,
+            request_bytes=self.request_bytes,
+            response_bytes=self.response_bytes,
+            latency_sum=latency.sum,
+            latency_max=latency.max,
+            latency_p50=latency.quantile(0.5),
+            latency_p90=latency.quantile(0.9),
+            latency_p99=latency.quantile(0.99),
+            serialize_time_sum=self.serialize_time,
+            http_time_sum=self.http_time,
+            deserialize_time_sum=self.deserialize_time,
+            latency_buckets=buckets,
+        )
+
+
+class RequestMetrics:
+    """
+    A request hook aggregating the calls of a client per endpoint, in memory, into latency
+    histograms and byte, error and retry counters.
+
+    ```python
+    metrics = RequestMetrics()
+    client = WeaviateRecommendClient(url, api_key, request_hooks=[metrics])
+    ...
+    print(metrics.snapshot()["item-recommendations/item"].latency_p99)
+    ```
+
+    Args:
+        buckets (Sequence[float], optional): Upper bounds in seconds of the latency histogram
+            buckets. Defaults to `DEFAULT_LATENCY_BUCKETS`, from 1ms to 10s.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        if list(buckets) != sorted(buckets) or not buckets:
+            raise ValueError("buckets must be a non-empty sorted sequence")
+        self.buckets = tuple(buckets)
+        self._endpoints: Dict[str, _EndpointAggregate] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, event: RequestEvent) -> None:
+        with self._lock:
+            aggregate = self._endpoints.get(event.endpoint)
+            if aggregate is None:
+                aggregate = self._endpoints[event.endpoint] = _EndpointAggregate(
+                    self.buckets
+                )
+            aggregate.add(event)
+
+    def snapshot(self) -> Dict[str, EndpointMetrics]:
+        with self._lock:
+            return {
+                endpoint: aggregate.metrics()
+                for endpoint, aggregate in self._endpoints.items()
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._endpoints.clear()
+
+
+class OpenTelemetryHook:
+    """
+    A request hook recording every call as a span of an OpenTelemetry tracer, e.g.
+    `OpenTelemetryHook(trace.get_tracer("weaviate_recommend"))`. Spans are recorded when the call
+    finished, with its start and end time, and the measurements as `weaviate_recommend.*`
+    attributes.
+    """
+
+    def __init__(self, tracer: Any):
+        self.tracer = tracer
+
+    def __call__(self, event: RequestEvent) -> None:
+        start_ns = int(event.start_time * 1e9)
+        span = self.tracer.start_span(
+            f"{event.method} {event.endpoint}", start_time=start_ns
+        )
+        attributes = {
+            "http.request.method": event.method,
+            "weaviate_recommend.endpoint": event.endpoint,
+            "weaviate_recommend.request_bytes": event.request_bytes,
+            "weaviate_recommend.response_bytes": event.response_bytes,
+            "weaviate_recommend.serialize_time": event.serialize_time,
+            "weaviate_recommend.http_time": event.http_time,
+            "weaviate_recommend.deserialize_time": event.deserialize_time,
+            "weaviate_recommend.retries": event.retries,
+            "weaviate_recommend.hedged": event.hedged,
+            "weaviate_recommend.duplicate": event.duplicate,
+        }
+        if event.status_code is not None:
+            attributes["http.response.status_code"] = event.status_code
+        if event.error is not None:
+            attributes["error.type"] = event.error
+        span.set_attributes(attributes)
+        span.end(end_time=start_ns + int(event.duration * 1e9))
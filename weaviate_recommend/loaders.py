@@ -0,0 +1,345 @@
+"""
+Columnar loaders, streaming Parquet, CSV and Arrow data to the batch endpoints.
+
+Rows are validated and serialized to JSON with vectorized pyarrow compute kernels, the request
+bodies are sliced out of the resulting Arrow buffers, and no Python object is built per row.
+Requires the optional `pyarrow` dependency.
+"""
+
+import bisect
+import functools
+import json
+import os
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError as e:
+    raise ImportError(
+        "Columnar loading requires pyarrow, install it with `pip install pyarrow`"
+    ) from e
+
+from weaviate_recommend.models.batch import BatchChunkFailure
+from weaviate_recommend.utils import get_datetime
+
+# rows read from a file at once, independently of the size of the requests
+READ_BATCH_SIZE = 65_536
+
+DATETIME_FORMAT = "%Y-%m-%dT%H:%M:%S"
+
+_HEX_UUID_PATTERN = "^[0-9a-f]{32}$"
+_UUID_GROUPS_PATTERN = "^(.{8})(.{4})(.{4})(.{4})(.{12})$"
+_UUID_GROUPS_REPLACEMENT = r"\1-\2-\3-\4-\5"
+
+_JSON_ESCAPES = [
+    ("\\", "\\\\"),
+    ('"', '\\"'),
+    ("\n", "\\n"),
+    ("\r", "\\r"),
+    ("\t", "\\t"),
+]
+_CONTROL_CHARACTERS = "[\x00-\x1f]"
+
+# (ids of the rows of a chunk, JSON array body of the chunk)
+EncodedChunk = Tuple[pa.Array, bytes]
+
+
+def read_batches(
+    source: Any, format: Optional[str] = None, columns: Optional[List[str]] = None
+) -> Iterator[pa.RecordBatch]:
+    """
+    Lazily reads the record batches of `source`: a path to a Parquet, CSV or Arrow IPC/Feather
+    file, a pyarrow Table, RecordBatch or RecordBatchReader, or a pandas DataFrame.
+
+    Args:
+        format (str, optional): "parquet", "csv" or "arrow". Defaults to None, which infers it
+            from the extension of the path.
+        columns (List[str], optional): Only read these columns, when the format supports it.
+    """
+    if isinstance(source, pa.RecordBatch):
+        yield source
+    elif isinstance(source, pa.Table):
+        yield from source.to_batches(max_chunksize=READ_BATCH_SIZE)
+    elif isinstance(source, pa.RecordBatchReader):
+        yield from source
+    elif hasattr(source, "iloc") and hasattr(source, "columns"):
+        table = pa.Table.from_pandas(source, preserve_index=False)
+        yield from table.to_batches(max_chunksize=READ_BATCH_SIZE)
+    elif isinstance(source, (str, os.PathLike)):
+        path = os.fspath(source)
+        format = format or _infer_format(path)
+        if format == "parquet":
+            import pyarrow.parquet as pq
+
+            yield from pq.ParquetFile(path).iter_batches(
+                batch_size=READ_BATCH_SIZE, columns=columns
+            )
+        elif format == "csv":
+            import pyarrow.csv as pa_csv
+
+            convert_options = pa_csv.ConvertOptions(include_columns=columns)
+            yield from pa_csv.open_csv(path, convert_options=convert_options)
+        elif format == "arrow":
+            with pa.memory_map(path) as file:
+                try:
+                    reader = pa.ipc.open_file(file)
+                    for index in range(reader.num_record_batches):
+                        yield reader.get_batch(index)
+                except pa.ArrowInvalid:
+                    file.seek(0)
+                    yield from pa.ipc.open_stream(file)
+        else:
+            raise ValueError(f"unsupported format {format!r}")
+    else:
+        raise TypeError(f"unsupported source: {type(source).__name__}")
+
+
+def _infer_format(path: str) -> str:
+    name = path.lower()
+    for suffix in (".gz", ".bz2", ".zst", ".lz4"):
+        name = name.removesuffix(suffix)
+    extension = os.path.splitext(name)[1]
+    if extension in (".parquet", ".pq"):
+        return "parquet"
+    if extension in (".csv", ".tsv", ".txt"):
+        return "csv"
+    if extension in (".arrow", ".feather", ".ipc"):
+        return "arrow"
+    raise ValueError(f"cannot infer the format of {path!r}, pass `format`")
+
+
+def normalize_uuids(ids: pa.Array) -> Tuple[pa.Array, pa.Array]:
+    """
+    Returns the canonical form of the UUIDs of `ids`, lower case with hyphens, and a boolean
+    mask of the valid ones. Accepts the forms `uuid.UUID` accepts, except braces and URNs.
+    """
+    if pa.types.is_fixed_size_binary(ids.type) and ids.type.byte_width == 16:
+        ids = pc.binary_join_element_wise(pc.cast(ids, pa.binary()), "")
+    compact = pc.utf8_lower(pc.replace_substring(pc.cast(ids, pa.string()), "-", ""))
+    valid = pc.fill_null(pc.match_substring_regex(compact, _HEX_UUID_PATTERN), False)
+    canonical = pc.replace_substring_regex(
+        compact, _UUID_GROUPS_PATTERN, _UUID_GROUPS_REPLACEMENT
+    )
+    return canonical, valid
+
+
+def _json_strings(strings: pa.Array) -> pa.Array:
+    escaped = pc.cast(strings, pa.string())
+    for character, escape in _JSON_ESCAPES:
+        escaped = pc.replace_substring(escaped, character, escape)
+    if pc.any(pc.match_substring_regex(escaped, _CONTROL_CHARACTERS)).as_py():
+        # rare control characters, escaped one by one
+        for code in range(0x20):
+            escaped = pc.replace_substring(escaped, chr(code), f"\\u{code:04x}")
+    return pc.binary_join_element_wise('"', escaped, '"', "")
+
+
+def json_values(column: pa.Array) -> pa.Array:
+    """
+    Serializes every value of `column` to JSON, nulls and non finite floats become `null`.
+
+    Nested and other uncommon types fall back to serializing the values one by one.
+    """
+    kind = column.type
+    if isinstance(column, pa.ChunkedArray):
+        column = column.combine_chunks()
+    if pa.types.is_dictionary(kind):
+        return json_values(column.dictionary_decode())
+    if pa.types.is_string(kind) or pa.types.is_large_string(kind):
+        values = _json_strings(column)
+    elif pa.types.is_integer(kind) or pa.types.is_boolean(kind):
+        values = pc.cast(column, pa.string())
+    elif pa.types.is_floating(kind):
+        values = pc.if_else(
+            pc.is_finite(column),
+            pc.cast(column, pa.string()),
+            pa.scalar(None, pa.string()),
+        )
+    elif pa.types.is_timestamp(kind):
+        # microseconds, like the timestamps of the other methods of the client
+        column = pc.cast(column, pa.timestamp("us", kind.tz))
+        values = _json_strings(pc.strftime(column, format=DATETIME_FORMAT))
+    elif pa.types.is_date(kind):
+        values = _json_strings(pc.strftime(column, format="%Y-%m-%d"))
+    elif pa.types.is_null(kind):
+        values = pa.nulls(len(column), pa.string())
+    else:
+        values = pa.array(
+            [json.dumps(value, default=str) for value in column.to_pylist()],
+            pa.string(),
+        )
+    return pc.fill_null(values, "null")
+
+
+def _constant(value: Any) -> pa.Scalar:
+    return pa.scalar(json.dumps(value, default=str), pa.string())
+
+
+def _chunks(
+    rows: pa.Array, ids: pa.Array, max_count: int, max_bytes: int
+) -> Iterator[EncodedChunk]:
+    """
+    Slices JSON records, each followed by a comma, into JSON array bodies of at most
+    `max_count` records and `max_bytes` bytes.
+    """
+    _, offsets_buffer, data_buffer = rows.buffers()
+    offsets = memoryview(offsets_buffer).cast("i")[
+        rows.offset : rows.offset + len(rows) + 1
+    ]
+    data = memoryview(data_buffer) if data_buffer is not None else memoryview(b"")
+    start = 0
+    while start < len(rows):
+        end = min(len(rows), start + max_count)
+        # the brackets replace the last comma and add one byte
+        limit = offsets[start] + max_bytes - 1
+        if offsets[end] > limit:
+            end = max(start + 1, bisect.bisect_right(offsets, limit, start, end) - 1)
+        body = b"".join([b"[", data[offsets[start] : offsets[end] - 1], b"]"])
+        yield ids.slice(start, end - start), body
+        start = end
+
+
+def _objects(fields: Sequence[Tuple[str, Any]]) -> Any:
+    """
+    Joins `(key, JSON values or scalar)` pairs into one JSON object per row.
+    """
+    if not fields:
+        return pa.scalar("{}", pa.string())
+    parts: List[Any] = []
+    for index, (key, values) in enumerate(fields):
+        separator = "{" if index == 0 else ","
+        parts.extend([f"{separator}{json.dumps(key)}:", values])
+    parts.append("}")
+    return pc.binary_join_element_wise(*parts, "")
+
+
+def _records(fields: Sequence[Tuple[str, Any]]) -> pa.Array:
+    # every record is followed by a comma, the last one is dropped when slicing the bodies
+    return pc.binary_join_element_wise(_objects(fields), ",", "")
+
+
+def _valid_rows(
+    batch: pa.RecordBatch,
+    id_columns: Sequence[str],
+    first_row: int,
+    on_invalid: Callable[[List[int]], None],
+) -> Tuple[pa.RecordBatch, List[pa.Array]]:
+    canonical_ids, masks = zip(
+        *(normalize_uuids(batch.column(name)) for name in id_columns)
+    )
+    valid = functools.reduce(pc.and_, masks)
+    if not pc.all(valid).as_py():
+        invalid = pc.indices_nonzero(pc.invert(valid))
+        on_invalid([first_row + index for index in invalid.to_pylist()])
+        batch = batch.filter(valid)
+        canonical_ids = tuple(ids.filter(valid) for ids in canonical_ids)
+    return batch, list(canonical_ids)
+
+
+def _require_columns(batch: pa.RecordBatch, columns: Iterable[str]) -> None:
+    missing = [name for name in columns if name not in batch.schema.names]
+    if missing:
+        raise ValueError(f"missing columns: {', '.join(missing)}")
+
+
+def encode_items(
+    batches: Iterable[pa.RecordBatch],
+    id_column: str,
+    property_columns: Optional[List[str]],
+    max_count: int,
+    max_bytes: int,
+    on_invalid: Callable[[List[int]], None],
+) -> Iterator[EncodedChunk]:
+    """
+    Encodes the rows of `batches` to `item/batch` request bodies. Every column other than
+    `id_column` is a property, unless `property_columns` is given.
+    """
+    first_row = 0
+    for batch in batches:
+        _require_columns(batch, [id_column] + (property_columns or []))
+        num_rows = batch.num_rows
+        batch, (ids,) = _valid_rows(batch, [id_column], first_row, on_invalid)
+        first_row += num_rows
+        if not batch.num_rows:
+            continue
+        names = property_columns or [n for n in batch.schema.names if n != id_column]
+        properties = _objects(
+            [(name, json_values(batch.column(name))) for name in names]
+        )
+        rows = _records([("id", _json_strings(ids)), ("properties", properties)])
+        yield from _chunks(rows, ids, max_count, max_bytes)
+
+
+def encode_interactions(
+    batches: Iterable[pa.RecordBatch],
+    user_id_column: str,
+    item_id_column: str,
+    property_name_column: str,
+    weight_column: str,
+    created_at_column: str,
+    interaction_property_name: Optional[str],
+    remove_previous_interactions: bool,
+    max_count: int,
+    max_bytes: int,
+    on_invalid: Callable[[List[int]], None],
+) -> Iterator[EncodedChunk]:
+    """
+    Encodes the rows of `batches` to `user/batch` request bodies. The interaction property
+    name, weight and creation time columns are optional: `interaction_property_name` is used
+    when there is no property name column, weights default to 1.0, and the creation time to
+    the time the rows are read.
+    """
+    first_row = 0
+    for batch in batches:
+        names = batch.schema.names
+        required = [user_id_column, item_id_column]
+        if interaction_property_name is None:
+            required.append(property_name_column)
+        _require_columns(batch, required)
+        num_rows = batch.num_rows
+        batch, (user_ids, item_ids) = _valid_rows(
+            batch, [user_id_column, item_id_column], first_row, on_invalid
+        )
+        first_row += num_rows
+        if not batch.num_rows:
+            continue
+        rows = _records(
+            [
+                ("user_id", _json_strings(user_ids)),
+                ("item_id", _json_strings(item_ids)),
+                (
+                    "interaction_property_name",
+                    (
+                        json_values(batch.column(property_name_column))
+                        if property_name_column in names
+                        else _constant(interaction_property_name)
+                    ),
+                ),
+                (
+                    "weight",
+                    (
+                        json_values(pc.cast(batch.column(weight_column), pa.float64()))
+                        if weight_column in names
+                        else _constant(1.0)
+                    ),
+                ),
+                (
+                    "created_at",
+                    (
+                        json_values(batch.column(created_at_column))
+                        if created_at_column in names
+                        else _constant(get_datetime())
+                    ),
+                ),
+                (
+                    "remove_previous_interactions",
+                    _constant(remove_previous_interactions),
+                ),
+            ]
+        )
+        yield from _chunks(rows, user_ids, max_count, max_bytes)
+
+
+def chunk_failure(index: int, ids: pa.Array, error: Exception) -> BatchChunkFailure:
+    return BatchChunkFailure(chunk_index=index, ids=ids.to_pylist(), message=str(error))
@@ -0,0 +1,67 @@
+from typing import List, Literal, Optional
+
+from pydantic import BaseModel
+
+
+class BatchChunkFailure(BaseModel):
+    chunk_index: int
+    ids: List[str]
+    message: str
+
+
+class AddItemsStreamResponse(BaseModel):
+    num_items_added: int
+    num_chunks: int
+    failures: List[BatchChunkFailure]
+    # positions in the source of the rows skipped by the columnar loaders, for invalid IDs
+    invalid_rows: List[int] = []
+
+
+class AddInteractionsStreamResponse(BaseModel):
+    num_interactions_added: int
+    num_chunks: int
+    failures: List[BatchChunkFailure]
+    invalid_rows: List[int] = []
+
+
+class BulkRecommendationsResponse(BaseModel):
+    num_succeeded: int
+    num_failed: int
+    num_skipped: int
+    failed_user_ids: List[str]
+
+
+class UserUpsertOutcome(BaseModel):
+    index: int
+    user_id: str
+    operation: Optional[Literal["created", "updated"]]
+    error: Optional[str] = None
+
+
+class BulkUpsertUsersResponse(BaseModel):
+    num_created: int
+    num_updated: int
+    num_failed: int
+    failures: List[UserUpsertOutcome]
+
+
+class ExportInteractionsResponse(BaseModel):
+    num_succeeded: int
+    num_failed: int
+    num_skipped: int
+    num_interactions: int
+    failed_user_ids: List[str]
+
+
+class DeleteOutcome(BaseModel):
+    index: int
+    id: str
+    status: Literal["deleted", "not_found", "failed"]
+    error: Optional[str] = None
+
+
+class BulkDeleteResponse(BaseModel):
+    num_deleted: int
+    num_not_found: int
+    num_failed: int
+    failures: List[DeleteOutcome]
@@ -1,4 +1,5 @@
-from typing import List, Literal, Union
+import json
+from typing import Any, Dict, Iterable, Iterator, List, Literal, Union
 
 from pydantic import BaseModel, field_validator
 
@@ -50,3 +51,80 @@ class FilterConfig(BaseModel):
             elif v["type"] == "UserPropertyReference":
                 return UserPropertyReference(**v)
         return v
+
+
+class CompiledFilters:
+    """
+    An immutable, hashable set of filters, meant to be reused as a cache or dict key.
+
+    Compiled filters compare by value, so equal filter sets find the same cache entries. They
+    are accepted wherever a `List[FilterConfig]` is, and skip dumping the pydantic models of the
+    filters on every call; the request body itself is still built and encoded per request.
+
+    ```python
+    in_stock = CompiledFilters([FilterConfig(property_name="stock", operator="GreaterThan", value=0)])
+    client.recommendation.item.from_item(item_id, filters=in_stock)
+    ```
+    """
+
+    __slots__ = ("filters", "_params", "_key", "_hash")
+
+    def __init__(self, filters: Iterable[FilterConfig]):
+        filters = tuple(filters)
+        params = tuple(filter_config.model_dump() for filter_config in filters)
+        set_attribute = object.__setattr__
+        set_attribute(self, "filters", filters)
+        set_attribute(self, "_params", params)
+        # canonical key, equal filter sets always serialize to the same string
+        set_attribute(self, "_key", json.dumps(params, sort_keys=True))
+        set_attribute(self, "_hash", hash(self._key))
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("CompiledFilters is immutable")
+
+    @property
+    def params(self) -> List[Dict[str, Any]]:
+        """
+        The filters as sent to the service. A copy, so modifying it leaves the filters intact.
+        """
+        return [
+            {
+                **params,
+                # values are scalars, flat lists or flat reference dicts
+                "value": (
+                    params["value"].copy()
+                    if isinstance(params["value"], (list, dict))
+                    else params["value"]
+                ),
+            }
+            for params in self._params
+        ]
+
+    def __len__(self) -> int:
+        return len(self.filters)
+
+    def __iter__(self) -> Iterator[FilterConfig]:
+        return iter(self.filters)
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, CompiledFilters):
+            return NotImplemented
+        return self._hash == other._hash and self._key == other._key
+
+    def __repr__(self) -> str:
+        return f"CompiledFilters({list(self.filters)!r})"
+
+
+Filters = Union[List[FilterConfig], CompiledFilters]
+
+
+def dump_filters(filters: Filters) -> List[Dict[str, Any]]:
+    """
+    Returns the request parameters of `filters`, without dumping compiled filters again.
+    """
+    if isinstance(filters, CompiledFilters):
+        return filters.params
+    return [filter_config.model_dump() for filter_config in filters]
@@ -0,0 +1,17 @@
+from typing import List, Optional, Union
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict
+
+from weaviate_recommend.models.filter import CompiledFilters, FilterConfig
+
+
+class SearchQuery(BaseModel):
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    text: str
+    user_id: Union[str, UUID]
+    limit: int = 10
+    influence_factor: float = 0.2
+    filters: Union[List[FilterConfig], CompiledFilters, None] = None
+    return_properties: Optional[List[str]] = None
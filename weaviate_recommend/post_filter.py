@@ -0,0 +1,249 @@
+"""
+Client-side evaluation of recommendation filters over an over-fetched candidate set.
+
+Filters are evaluated a column at a time: the values of a property are gathered once for all
+candidates, every filter turns a column into a bitmask stored as a Python integer, and the
+masks of a filter set are combined with a bitwise AND. Masks are cached per filter, and per
+set of compiled filters, so toggling filters on and off only combines cached integers.
+"""
+
+import operator
+import re
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
+
+from pydantic import BaseModel
+
+from weaviate_recommend.decoding import constructor
+from weaviate_recommend.models.filter import CompiledFilters, Filters
+from weaviate_recommend.models.responses import (
+    PersonalisedSearchResponse,
+    RecommendationsResponse,
+)
+
+R = TypeVar("R", RecommendationsResponse, PersonalisedSearchResponse)
+
+# maps the bytes of a list of booleans to the digits of a binary number
+_BINARY_DIGITS = bytes.maketrans(b"\x00\x01", b"01")
+
+_construct_recommendations = constructor(RecommendationsResponse)
+_construct_search_results = constructor(PersonalisedSearchResponse)
+
+_COMPARISONS: Dict[str, Callable[[Any, Any], bool]] = {
+    "LessThan": operator.lt,
+    "LessThanEqual": operator.le,
+    "GreaterThan": operator.gt,
+    "GreaterThanEqual": operator.ge,
+}
+
+
+def _to_mask(matches: Sequence[bool]) -> int:
+    """
+    Packs booleans in an integer, the first one being the lowest bit.
+    """
+    if not matches:
+        return 0
+    return int(bytes(matches[::-1]).translate(_BINARY_DIGITS), 2)
+
+
+def _like_pattern(value: Any) -> "re.Pattern[str]":
+    # `*` matches any sequence of characters and `?` a single one, like the service
+    pattern = "".join(
+        ".*" if char == "*" else "." if char == "?" else re.escape(char)
+        for char in str(value)
+    )
+    return re.compile(pattern, re.IGNORECASE | re.DOTALL)
+
+
+def _compare(op: Callable[[Any, Any], bool], value: Any) -> Callable[[Any], bool]:
+    def compare(candidate: Any) -> bool:
+        if candidate is None or isinstance(candidate, list):
+            return False
+        try:
+            return op(candidate, value)
+        except TypeError:
+            # a value of another type, like a string compared to a number
+            return False
+
+    return compare
+
+
+def _evaluate(column: List[Any], operator_: str, value: Any) -> List[bool]:
+    """
+    Evaluates a filter over the values of a property, returns whether each candidate matches.
+    """
+    if isinstance(value, dict) and "type" in value:
+        raise ValueError(
+            f"{value['type']} filters depend on the reference of the request and cannot "
+            "be evaluated locally, pass them to the service instead"
+        )
+    if operator_ in ("Equal", "NotEqual"):
+        matches = [
+            value in candidate if isinstance(candidate, list) else candidate == value
+            for candidate in column
+        ]
+        if operator_ == "NotEqual":
+            return [not match for match in matches]
+        return matches
+    if operator_ in _COMPARISONS:
+        compare = _compare(_COMPARISONS[operator_], value)
+        return [compare(candidate) for candidate in column]
+    if operator_ == "Like":
+        match = _like_pattern(value).fullmatch
+        return [
+            (
+                any(isinstance(v, str) and match(v) for v in candidate)
+                if isinstance(candidate, list)
+                else isinstance(candidate, str) and match(candidate) is not None
+            )
+            for candidate in column
+        ]
+    if operator_ == "IsNull":
+        return [(candidate is None) == bool(value) for candidate in column]
+    if operator_ in ("ContainsAny", "ContainsAll"):
+        values = value if isinstance(value, list) else [value]
+        if operator_ == "ContainsAny":
+            return [
+                (
+                    any(v in candidate for v in values)
+                    if isinstance(candidate, list)
+                    else candidate in values
+                )
+                for candidate in column
+            ]
+        return [
+            (
+                all(v in candidate for v in values)
+                if isinstance(candidate, list)
+                else all(v == candidate for v in values)
+            )
+            for candidate in column
+        ]
+    raise ValueError(f"Unsupported filter operator {operator_!r}")
+
+
+class RecommendationCandidates(Generic[R]):
+    """
+    Filters an over-fetched recommendation or search response locally, so changing the
+    filters does not need a request to the service.
+
+    Fetch more results than displayed once, then call `filter` every time the filters change:
+
+    ```python
+    response = client.recommendation.item.from_item(item_id, limit=500)
+    candidates = RecommendationCandidates(response)
+    page = candidates.filter([FilterConfig(property_name="price", operator="LessThan", value=50)], limit=10)
+    ```
+
+    Results keep the order of the response. Filters apply to the `properties` of the results,
+    and a filter set matches the results matching every filter. A result missing a property,
+    or whose property is null, matches `NotEqual` and `IsNull` filters on it, like on the
+    service, and no other filter. Filters referencing the properties of the reference item or
+    user cannot be evaluated locally and raise a `ValueError`.
+
+    Args:
+        response (Union[RecommendationsResponse, PersonalisedSearchResponse]): The over-fetched
+            response. Its results are shared with the filtered responses, so don't modify them.
+    """
+
+    def __init__(self, response: R):
+        self.response = response
+        self._search = isinstance(response, PersonalisedSearchResponse)
+        self._results: List[Any] = (
+            response.results if self._search else response.recommendations  # type: ignore[union-attr]
+        )
+        self._columns: Dict[str, List[Any]] = {}
+        # masks of single filters, and of sets of compiled filters
+        self._filter_masks: Dict[Tuple[str, str, str], int] = {}
+        self._masks: Dict[CompiledFilters, int] = {}
+        self._all = (1 << len(self._results)) - 1
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def _column(self, property_name: str) -> List[Any]:
+        column = self._columns.get(property_name)
+        if column is None:
+            column = self._columns[property_name] = [
+                result.properties.get(property_name) for result in self._results
+            ]
+        return column
+
+    def _filter_mask(self, property_name: str, operator_: str, value: Any) -> int:
+        key = (property_name, operator_, repr(value))
+        mask = self._filter_masks.get(key)
+        if mask is None:
+            if isinstance(value, BaseModel):
+                value = value.model_dump()
+            mask = self._filter_masks[key] = _to_mask(
+                _evaluate(self._column(property_name), operator_, value)
+            )
+        return mask
+
+    def mask(self, filters: Optional[Filters] = None) -> int:
+        """
+        Returns the results matching `filters` as a bitmask, bit i being set when the i-th
+        result matches.
+        """
+        if not filters:
+            return self._all
+        if isinstance(filters, CompiledFilters):
+            mask = self._masks.get(filters)
+            if mask is not None:
+                return mask
+        mask = self._all
+        if isinstance(filters, CompiledFilters):
+            for params in filters.params:
+                mask &= self._filter_mask(
+                    params["property_name"], params["operator"], params["value"]
+                )
+            self._masks[filters] = mask
+        else:
+            for filter_config in filters:
+                mask &= self._filter_mask(
+                    filter_config.property_name,
+                    filter_config.operator,
+                    filter_config.value,
+                )
+        return mask
+
+    def count(self, filters: Optional[Filters] = None) -> int:
+        """
+        Returns the number of results matching `filters`, for instance to show facet counts.
+        """
+        return bin(self.mask(filters)).count("1")
+
+    def filter(
+        self, filters: Optional[Filters] = None, limit: Optional[int] = None
+    ) -> R:
+        """
+        Returns the first `limit` results matching `filters`, as a response of the same type as
+        the over-fetched one. Returns every matching result if `limit` is None.
+        """
+        mask = self.mask(filters)
+        results: List[Any] = []
+        while mask and (limit is None or len(results) < limit):
+            lowest = mask & -mask
+            results.append(self._results[lowest.bit_length() - 1])
+            mask ^= lowest
+        if self._search:
+            return _construct_search_results({"results": results})  # type: ignore[return-value]
+        return _construct_recommendations({"recommendations": results})  # type: ignore[return-value]
+
+
+def post_filter(
+    response: R, filters: Optional[Filters] = None, limit: Optional[int] = None
+) -> R:
+    """
+    Filters a response once, see `RecommendationCandidates` to filter it repeatedly.
+    """
+    return RecommendationCandidates(response).filter(filters, limit)
@@ -0,0 +1,107 @@
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Literal, Optional
+
+from weaviate_recommend.config import CircuitBreakerConfig, RetryConfig
+from weaviate_recommend.exceptions import CircuitOpenException
+
+CIRCUIT_STATE = Literal["closed", "open", "half_open"]
+
+IDEMPOTENT_METHODS = frozenset(["GET", "HEAD", "PUT", "DELETE", "OPTIONS"])
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parses a `Retry-After` header, given either in seconds or as an HTTP date.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class _RetryPolicy:
+    def __init__(self, config: RetryConfig):
+        self.config = config
+
+    def can_retry(self, retries: int, method: str, idempotent: Optional[bool]) -> bool:
+        """
+        Whether a request that was already retried `retries` times may be retried again.
+        """
+        if retries >= self.config.max_retries:
+            return False
+        if idempotent is None:
+            idempotent = method in IDEMPOTENT_METHODS
+        return idempotent or self.config.retry_non_idempotent
+
+    def is_retryable_status(self, status_code: int) -> bool:
+        return status_code in self.config.retry_on_status
+
+    def backoff(self, retries: int, retry_after: Optional[float] = None) -> float:
+        """
+        Seconds to wait before retrying a request that was already retried `retries` times.
+        """
+        if retry_after is not None:
+            return min(retry_after, self.config.max_backoff)
+        delay = min(self.config.max_backoff, self.config.backoff_factor * 2**retries)
+        return random.uniform(0, delay) if self.config.jitter else delay
+
+
+class _CircuitBreaker:
+    """
+    Thread-safe circuit breaker shared by all requests of a transport.
+    """
+
+    def __init__(self, config: CircuitBreakerConfig):
+        self.config = config
+        self.state: CIRCUIT_STATE = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def before_request(self) -> bool:
+        """
+        Returns True if the caller must probe the service before sending its request.
+
+        Raises:
+            CircuitOpenException: While the circuit is open, or another caller is probing.
+        """
+        with self._lock:
+            if self.state == "closed":
+                return False
+            if (
+                self.state == "open"
+                and time.monotonic() - self._opened_at >= self.config.recovery_timeout
+            ):
+                self.state = "half_open"
+                return True
+        raise CircuitOpenException(
+            "The service is considered unhealthy, the request was not sent"
+        )
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self.state = "closed"
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if (
+                self.state == "half_open"
+                or self._failures >= self.config.failure_threshold
+            ):
+                self.state = "open"
+                self._opened_at = time.monotonic()
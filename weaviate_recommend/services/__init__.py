@@ -1,8 +1,56 @@
-from .configured_endpoints import _ConfiguredEndpoints  # noqa: F401
-from .data.item import _Item  # noqa: F401
-from .data.user import _User  # noqa: F401
-from .personalised_search import _PersonalisedSearch  # noqa: F401
-from .recommendations.base import _Recommendation  # noqa: F401
-from .recommendations.item import _ItemRecommendation  # noqa: F401
-from .recommender_management import _RecommenderManagement  # noqa: F401
-from .trainer import _Trainer  # noqa: F401
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .configured_endpoints import (  # noqa: F401
+        _AsyncConfiguredEndpoints,
+        _ConfiguredEndpoints,
+    )
+    from .data.item import _AsyncItem, _Item  # noqa: F401
+    from .data.user import _AsyncUser, _User  # noqa: F401
+    from .personalised_search import (  # noqa: F401
+        _AsyncPersonalisedSearch,
+        _PersonalisedSearch,
+    )
+    from .recommendations.base import (  # noqa: F401
+        _AsyncRecommendation,
+        _Recommendation,
+    )
+    from .recommendations.item import (  # noqa: F401
+        _AsyncItemRecommendation,
+        _ItemRecommendation,
+    )
+    from .recommender_management import (  # noqa: F401
+        _AsyncRecommenderManagement,
+        _RecommenderManagement,
+    )
+    from .trainer import _AsyncTrainer, _Trainer  # noqa: F401
+
+# the services are imported on first access, so using one service does not load the others
+_LAZY_ATTRIBUTES = {
+    "_AsyncConfiguredEndpoints": ".configured_endpoints",
+    "_ConfiguredEndpoints": ".configured_endpoints",
+    "_AsyncItem": ".data.item",
+    "_Item": ".data.item",
+    "_AsyncUser": ".data.user",
+    "_User": ".data.user",
+    "_AsyncPersonalisedSearch": ".personalised_search",
+    "_PersonalisedSearch": ".personalised_search",
+    "_AsyncRecommendation": ".recommendations.base",
+    "_Recommendation": ".recommendations.base",
+    "_AsyncItemRecommendation": ".recommendations.item",
+    "_ItemRecommendation": ".recommendations.item",
+    "_AsyncRecommenderManagement": ".recommender_management",
+    "_RecommenderManagement": ".recommender_management",
+    "_AsyncTrainer": ".trainer",
+    "_Trainer": ".trainer",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+
+    value = getattr(import_module(_LAZY_ATTRIBUTES[name], __name__), name)
+    globals()[name] = value
+    return value
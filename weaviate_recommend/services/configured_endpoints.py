@@ -1,19 +1,15 @@
-from typing import TYPE_CHECKING, List
+from typing import TYPE_CHECKING
 
-import requests
-
-from weaviate_recommend.exceptions import RecommendApiException
 from weaviate_recommend.models.configured import FROM_TO_OPTIONS
-from weaviate_recommend.models.filter import FilterConfig
+from weaviate_recommend.models.filter import Filters, dump_filters
 from weaviate_recommend.models.responses import (
     CreateConfiguredEndpointResponse,
     DeleteConfiguredEndpointResponse,
     ListConfiguredEndpointsResponse,
 )
-from weaviate_recommend.utils import get_auth_header
 
 if TYPE_CHECKING:
-    from weaviate_recommend import WeaviateRecommendClient
+    from weaviate_recommend import AsyncWeaviateRecommendClient, WeaviateRecommendClient
 
 
 class _ConfiguredEndpoints:
@@ -26,7 +22,7 @@ class _ConfiguredEndpoints:
         endpoint_name: str,
         from_type: FROM_TO_OPTIONS,
         to_type: FROM_TO_OPTIONS,
-        filters: List[FilterConfig],
+        filters: Filters,
     ) -> CreateConfiguredEndpointResponse:
         """
         Create a new configured endpoint.
@@ -35,36 +31,62 @@ class _ConfiguredEndpoints:
             "endpoint_name": endpoint_name,
             "from": from_type,
             "to": to_type,
-            "filters": [filter.model_dump() for filter in filters],
+            "filters": dump_filters(filters),
         }
-        response = requests.post(
-            self.endpoint_url,
-            json=params,
-            headers=get_auth_header(self.client._api_key),
-        )
-        if response.status_code != 200:
-            raise RecommendApiException(response.text)
-        return CreateConfiguredEndpointResponse.model_validate(response.json())
+        response = self.client._transport.post(self.endpoint_url, json=params)
+        return CreateConfiguredEndpointResponse.model_validate(response)
 
     def list(self) -> ListConfiguredEndpointsResponse:
         """
         List all configured endpoints, and details about their configuration.
         """
-        response = requests.get(
-            self.endpoint_url + "details", headers=get_auth_header(self.client._api_key)
-        )
-        if response.status_code != 200:
-            raise RecommendApiException(response.text)
-        return ListConfiguredEndpointsResponse.model_validate(response.json())
+        response = self.client._transport.get(self.endpoint_url + "details")
+        return ListConfiguredEndpointsResponse.model_validate(response)
 
     def delete(self, endpoint_name: str) -> DeleteConfiguredEndpointResponse:
         """
         Delete a configured endpoint.
         """
-        response = requests.delete(
-            self.endpoint_url + endpoint_name,
-            headers=get_auth_header(self.client._api_key),
+        response = self.client._transport.delete(self.endpoint_url + endpoint_name)
+        return DeleteConfiguredEndpointResponse.model_validate(response)
+
+
+class _AsyncConfiguredEndpoints:
+    def __init__(self, client: "AsyncWeaviateRecommendClient"):
+        self.client = client
+        self.endpoint_url = f"{client.base_url}/configured/"
+
+    async def create(
+        self,
+        endpoint_name: str,
+        from_type: FROM_TO_OPTIONS,
+        to_type: FROM_TO_OPTIONS,
+        filters: Filters,
+    ) -> CreateConfiguredEndpointResponse:
+        """
+        Create a new configured endpoint.
+        """
+        params = {
+            "endpoint_name": endpoint_name,
+            "from": from_type,
+            "to": to_type,
+            "filters": dump_filters(filters),
+        }
+        response = await self.client._transport.post(self.endpoint_url, json=params)
+        return CreateConfiguredEndpointResponse.model_validate(response)
+
+    async def list(self) -> ListConfiguredEndpointsResponse:
+        """
+        List all configured endpoints, and details about their configuration.
+        """
+        response = await self.client._transport.get(self.endpoint_url + "details")
+        return ListConfiguredEndpointsResponse.model_validate(response)
+
+    async def delete(self, endpoint_name: str) -> DeleteConfiguredEndpointResponse:
+        """
+        Delete a configured endpoint.
+        """
+        response = await self.client._transport.delete(
+            self.endpoint_url + endpoint_name
         )
-        if response.status_code != 200:
-            raise RecommendApiException(response.text)
-        return DeleteConfiguredEndpointResponse.model_validate(response.json())
+        return DeleteConfiguredEndpointResponse.model_validate(response)
@@ -0,0 +1,79 @@
+from typing import Any, Callable, Iterable, Iterator, Optional, Tuple, Union
+from uuid import UUID
+
+from weaviate_recommend.exceptions import RecommendApiException
+from weaviate_recommend.models.batch import BulkDeleteResponse, DeleteOutcome
+
+DeleteOutcomeCallback = Callable[[DeleteOutcome], None]
+
+# a user ID, or a (user ID, item ID) pair
+InteractionTarget = Union[str, UUID, Tuple[Union[str, UUID], Union[str, UUID]]]
+
+
+def target_id(target: Any) -> str:
+    """
+    Returns the ID reported in the outcome of a deleted item, user, or interaction target.
+    """
+    if isinstance(target, tuple):
+        return "/".join(str(part) for part in target)
+    return str(target)
+
+
+def interactions_path(
+    target: InteractionTarget, interaction_property_name: Optional[str]
+) -> str:
+    """
+    Returns the path, below the user endpoint, deleting the interactions of a user, of a user
+    with a property, or of a user with an item for a property.
+    """
+    if isinstance(target, tuple):
+        user_id, item_id = target
+        if interaction_property_name is None:
+            raise ValueError(
+                "deleting the interactions with an item requires interaction_property_name"
+            )
+        return (
+            f"{UUID(str(user_id))}/interactions/{interaction_property_name}/"
+            f"{UUID(str(item_id))}"
+        )
+    if interaction_property_name is not None:
+        return f"{UUID(str(target))}/interactions/{interaction_property_name}"
+    return f"{UUID(str(target))}/interactions"
+
+
+class _BulkDeleteJob:
+    """
+    Bookkeeping shared by the sync and async bulk deletions: aggregating the outcome of every
+    ID. A 404 means there was nothing to delete, and is not counted as a failure.
+    """
+
+    def __init__(self, on_outcome: Optional[DeleteOutcomeCallback]):
+        self.on_outcome = on_outcome
+        self.response = BulkDeleteResponse(
+            num_deleted=0, num_not_found=0, num_failed=0, failures=[]
+        )
+
+    def inputs(self, targets: Iterable[Any]) -> Iterator[Tuple[int, Any]]:
+        return enumerate(targets)
+
+    def record(self, index: int, target: Any, result: Union[Any, Exception]) -> None:
+        if isinstance(result, RecommendApiException) and result.status_code == 404:
+            outcome = DeleteOutcome(
+                index=index, id=target_id(target), status="not_found"
+            )
+            self.response.num_not_found += 1
+        elif isinstance(result, Exception):
+            outcome = DeleteOutcome(
+                index=index, id=target_id(target), status="failed", error=str(result)
+            )
+            self.response.num_failed += 1
+            self.response.failures.append(outcome)
+        else:
+            outcome = DeleteOutcome(index=index, id=target_id(target), status="deleted")
+            self.response.num_deleted += 1
+        if self.on_outcome is not None:
+            self.on_outcome(outcome)
+
+    def finish(self) -> BulkDeleteResponse:
+        self.response.failures.sort(key=lambda failure: failure.index)
+        return self.response
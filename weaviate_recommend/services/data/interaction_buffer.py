@@ -0,0 +1,412 @@
+import atexit
+import logging
+import queue
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable, List, Literal, Optional, Union
+from uuid import UUID
+
+from weaviate_recommend.exceptions import InteractionBufferFullException
+from weaviate_recommend.models.data import UserInteraction
+from weaviate_recommend.utils import get_datetime
+
+if TYPE_CHECKING:
+    import asyncio
+
+    from weaviate_recommend.services.data.user import _AsyncUser, _User
+
+logger = logging.getLogger(__name__)
+
+ON_FULL_OPTIONS = Literal["block", "drop", "raise"]
+
+DEFAULT_MAX_BATCH_SIZE = 500
+DEFAULT_MAX_DELAY = 1.0
+DEFAULT_MAX_QUEUE_SIZE = 10_000
+
+# put on the queue by `close` to stop the worker once everything before it was sent
+_STOP = object()
+
+
+def _validate_options(
+    max_batch_size: int, max_delay: float, max_queue_size: int, on_full: str
+) -> None:
+    if max_batch_size < 1:
+        raise ValueError("max_batch_size must be positive")
+    if max_delay < 0:
+        raise ValueError("max_delay must not be negative")
+    if max_queue_size < 1:
+        raise ValueError("max_queue_size must be positive")
+    if on_full not in ("block", "drop", "raise"):
+        raise ValueError("on_full must be one of 'block', 'drop' or 'raise'")
+
+
+def _make_interaction(
+    user_id: Union[str, UUID],
+    item_id: Union[str, UUID],
+    interaction_property_name: str,
+    weight: float,
+    created_at: Union[str, None],
+    remove_previous_interactions: bool,
+) -> UserInteraction:
+    return UserInteraction(
+        user_id=str(user_id),
+        item_id=str(item_id),
+        interaction_property_name=interaction_property_name,
+        weight=weight,
+        created_at=created_at or get_datetime(),
+        remove_previous_interactions=remove_previous_interactions,
+    )
+
+
+def _stamp(interaction: UserInteraction) -> UserInteraction:
+    # the interaction happened when it was buffered, not when the buffer is flushed
+    if interaction.created_at:
+        return interaction
+    return interaction.model_copy(update={"created_at": get_datetime()})
+
+
+def _report(
+    on_error: Optional[Callable[[Exception, List[UserInteraction]], None]],
+    error: Exception,
+    batch: List[UserInteraction],
+) -> None:
+    if on_error is None:
+        logger.error(
+            "Failed to send %d buffered interactions", len(batch), exc_info=error
+        )
+        return
+    try:
+        on_error(error, batch)
+    except Exception:
+        # the worker must outlive a failing callback, or `add` and `flush` would hang
+        logger.exception("The on_error callback of the interaction buffer failed")
+
+
+class InteractionBuffer:
+    """
+    Queues user interactions in memory and sends them with `add_interactions` from a
+    background thread, once `max_batch_size` interactions are queued or the oldest queued
+    interaction waited for `max_delay` seconds.
+
+    Create it with `client.user.interaction_buffer(...)`. Remaining interactions are sent when
+    the buffer, or the client that created it, is closed, and at interpreter exit.
+
+    Args:
+        max_batch_size (int): Maximum number of interactions sent in a single request.
+        max_delay (float): Maximum number of seconds an interaction waits before it is sent.
+        max_queue_size (int): Maximum number of interactions waiting to be sent.
+        on_full (str): What `add` does when the queue is full: "block" until there is room,
+            "drop" the interaction, or "raise" an `InteractionBufferFullException`.
+        on_error (Callable, optional): Called with the exception and the interactions of a
+            failed request. Failures are logged if it is not set.
+    """
+
+    def __init__(
+        self,
+        user: "_User",
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        max_delay: float = DEFAULT_MAX_DELAY,
+        max_queue_size: int = DEFAULT_MAX_QUEUE_SIZE,
+        on_full: ON_FULL_OPTIONS = "block",
+        on_error: Optional[Callable[[Exception, List[UserInteraction]], None]] = None,
+    ):
+        _validate_options(max_batch_size, max_delay, max_queue_size, on_full)
+        self._user = user
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self.on_full = on_full
+        self.on_error = on_error
+        self.num_sent = 0
+        self.num_failed = 0
+        self.num_dropped = 0
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max_queue_size)
+        self._lock = threading.Lock()
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._run, name="weaviate-recommend-interactions", daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.close)
+
+    def __enter__(self) -> "InteractionBuffer":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def add(self, interaction: UserInteraction) -> None:
+        """
+        Queue an interaction to be sent in the background.
+        """
+        if self._closed:
+            raise RuntimeError("The interaction buffer is closed")
+        interaction = _stamp(interaction)
+        if self.on_full == "block":
+            self._queue.put(interaction)
+            return
+        try:
+            self._queue.put_nowait(interaction)
+        except queue.Full:
+            if self.on_full == "raise":
+                raise InteractionBufferFullException(
+                    f"{self._queue.maxsize} interactions are already waiting to be sent"
+                )
+            with self._lock:
+                self.num_dropped += 1
+
+    def add_interaction(
+        self,
+        user_id: Union[str, UUID],
+        item_id: Union[str, UUID],
+        interaction_property_name: str,
+        weight: float = 1.0,
+        created_at: Union[str, None] = None,
+        remove_previous_interactions: bool = False,
+    ) -> None:
+        """
+        Queue a user interaction, takes the same arguments as `client.user.add_interaction`.
+        """
+        self.add(
+            _make_interaction(
+                user_id,
+                item_id,
+                interaction_property_name,
+                weight,
+                created_at,
+                remove_previous_interactions,
+            )
+        )
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Send every interaction queued so far, returns False if `timeout` expired first.
+        """
+        if self._closed:
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """
+        Send the remaining interactions and stop the background thread.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        atexit.unregister(self.close)
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while True:
+            batch: List[UserInteraction] = []
+            markers: List[threading.Event] = []
+            stop = False
+            item = self._queue.get()
+            deadline = time.monotonic() + self.max_delay
+            while True:
+                if item is _STOP:
+                    stop = True
+                    break
+                if isinstance(item, threading.Event):
+                    markers.append(item)
+                    break
+                batch.append(item)
+                if len(batch) >= self.max_batch_size:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+            if stop:
+                # interactions added concurrently with `close` may still follow the sentinel
+                while True:
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if isinstance(item, threading.Event):
+                        markers.append(item)
+                    elif item is not _STOP:
+                        batch.append(item)
+            for start in range(0, len(batch), self.max_batch_size):
+                self._send(batch[start : start + self.max_batch_size])
+            for marker in markers:
+                marker.set()
+            if stop:
+                return
+
+    def _send(self, batch: List[UserInteraction]) -> None:
+        try:
+            self._user.add_interactions(batch)
+        except Exception as e:
+            with self._lock:
+                self.num_failed += len(batch)
+            _report(self.on_error, e, batch)
+        else:
+            with self._lock:
+                self.num_sent += len(batch)
+
+
+class AsyncInteractionBuffer:
+    """
+    The asyncio counterpart of `InteractionBuffer`, sending interactions from a background task
+    of the running event loop. Create it with `client.user.interaction_buffer(...)` and close
+    it with `await buffer.close()` before the event loop stops.
+    """
+
+    def __init__(
+        self,
+        user: "_AsyncUser",
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        max_delay: float = DEFAULT_MAX_DELAY,
+        max_queue_size: int = DEFAULT_MAX_QUEUE_SIZE,
+        on_full: ON_FULL_OPTIONS = "block",
+        on_error: Optional[Callable[[Exception, List[UserInteraction]], None]] = None,
+    ):
+        _validate_options(max_batch_size, max_delay, max_queue_size, on_full)
+        self._user = user
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self.max_queue_size = max_queue_size
+        self.on_full = on_full
+        self.on_error = on_error
+        self.num_sent = 0
+        self.num_failed = 0
+        self.num_dropped = 0
+        self._queue: Optional["asyncio.Queue[Any]"] = None
+        self._task: Optional["asyncio.Task[None]"] = None
+        self._closed = False
+
+    async def __aenter__(self) -> "AsyncInteractionBuffer":
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.close()
+
+    def _ensure_started(self) -> "asyncio.Queue[Any]":
+        import asyncio
+
+        # the queue and the worker task are bound to the loop of the first `add`
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        return self._queue
+
+    async def add(self, interaction: UserInteraction) -> None:
+        """
+        Queue an interaction to be sent in the background.
+        """
+        import asyncio
+
+        if self._closed:
+            raise RuntimeError("The interaction buffer is closed")
+        queue_ = self._ensure_started()
+        interaction = _stamp(interaction)
+        if self.on_full == "block":
+            await queue_.put(interaction)
+            return
+        try:
+            queue_.put_nowait(interaction)
+        except asyncio.QueueFull:
+            if self.on_full == "raise":
+                raise InteractionBufferFullException(
+                    f"{self.max_queue_size} interactions are already waiting to be sent"
+                )
+            self.num_dropped += 1
+
+    async def add_interaction(
+        self,
+        user_id: Union[str, UUID],
+        item_id: Union[str, UUID],
+        interaction_property_name: str,
+        weight: float = 1.0,
+        created_at: Union[str, None] = None,
+        remove_previous_interactions: bool = False,
+    ) -> None:
+        """
+        Queue a user interaction, takes the same arguments as `client.user.add_interaction`.
+        """
+        await self.add(
+            _make_interaction(
+                user_id,
+                item_id,
+                interaction_property_name,
+                weight,
+                created_at,
+                remove_previous_interactions,
+            )
+        )
+
+    async def flush(self) -> None:
+        """
+        Send every interaction queued so far.
+        """
+        import asyncio
+
+        if self._closed or self._queue is None:
+            return
+        done = asyncio.Event()
+        await self._queue.put(done)
+        await done.wait()
+
+    async def close(self) -> None:
+        """
+        Send the remaining interactions and stop the background task.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        if self._queue is None or self._task is None:
+            return
+        await self._queue.put(_STOP)
+        await self._task
+
+    async def _run(self) -> None:
+        import asyncio
+
+        assert self._queue is not None
+        loop = asyncio.get_running_loop()
+        while True:
+            batch: List[UserInteraction] = []
+            markers: List[asyncio.Event] = []
+            stop = False
+            item = await self._queue.get()
+            deadline = loop.time() + self.max_delay
+            while True:
+                if item is _STOP:
+                    stop = True
+                    break
+                if isinstance(item, asyncio.Event):
+                    markers.append(item)
+                    break
+                batch.append(item)
+                if len(batch) >= self.max_batch_size:
+                    break
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+            for start in range(0, len(batch), self.max_batch_size):
+                await self._send(batch[start : start + self.max_batch_size])
+            for marker in markers:
+                marker.set()
+            if stop:
+                return
+
+    async def _send(self, batch: List[UserInteraction]) -> None:
+        try:
+            await self._user.add_interactions(batch)
+        except Exception as e:
+            self.num_failed += len(batch)
+            _report(self.on_error, e, batch)
+        else:
+            self.num_sent += len(batch)
@@ -0,0 +1,95 @@
+import itertools
+import threading
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple, Union
+from uuid import UUID
+
+from weaviate_recommend.checkpoint import Checkpoint
+from weaviate_recommend.models.batch import ExportInteractionsResponse
+from weaviate_recommend.models.data import UserInteraction
+from weaviate_recommend.sinks import Sink
+
+InteractionCallback = Callable[[UserInteraction], None]
+
+DEFAULT_CHECKPOINT_EVERY = 1000
+
+# interactions of a user written to the sink at once, bounding the memory used per user
+EXPORT_WRITE_BATCH_SIZE = 1000
+
+
+def interaction_record(interaction: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Maps an interaction returned by the service to the fields of `UserInteraction`.
+    """
+    return {
+        "user_id": interaction["id"],
+        "item_id": interaction["item_id"],
+        "interaction_property_name": interaction["interaction_property_name"],
+        "weight": interaction["weight"],
+        "created_at": interaction["created_at"],
+    }
+
+
+class _InteractionExportJob:
+    """
+    Bookkeeping shared by the sync and async interaction exports: writing the interactions of
+    concurrent users to the sink, skipping the users completed by a previous run and
+    checkpointing progress.
+    """
+
+    def __init__(
+        self,
+        sink: Union[Sink, InteractionCallback],
+        checkpoint_path: Union[str, None],
+        checkpoint_every: int,
+    ):
+        self.sink = sink
+        self.checkpoint = Checkpoint(checkpoint_path, checkpoint_every)
+        self.response = ExportInteractionsResponse(
+            num_succeeded=0,
+            num_failed=0,
+            num_skipped=self.checkpoint.start,
+            num_interactions=0,
+            failed_user_ids=[],
+        )
+        # users are exported from several threads, and sinks are not thread safe
+        self._lock = threading.Lock()
+
+    def inputs(
+        self, user_ids: Iterable[Union[str, UUID]]
+    ) -> Iterator[Tuple[int, Union[str, UUID]]]:
+        return itertools.islice(enumerate(user_ids), self.checkpoint.start, None)
+
+    def write(self, records: List[Dict[str, Any]]) -> None:
+        with self._lock:
+            if isinstance(self.sink, Sink):
+                for record in records:
+                    self.sink.write(record)
+            else:
+                for record in records:
+                    self.sink(UserInteraction(**record))
+            self.response.num_interactions += len(records)
+
+    def record(
+        self, index: int, user_id: Union[str, UUID], result: Union[Any, Exception]
+    ) -> None:
+        if isinstance(result, Exception):
+            self.response.num_failed += 1
+            self.response.failed_user_ids.append(str(user_id))
+            # transient failures are not marked done, so a resumed export retries them
+            if self.checkpoint.mark_failed(index, str(user_id), result):
+                self._save()
+        else:
+            self.response.num_succeeded += 1
+            if self.checkpoint.mark_done(index):
+                self._save()
+
+    def _save(self) -> None:
+        with self._lock:
+            # interactions must be persisted before the checkpoint claims they are done
+            if isinstance(self.sink, Sink):
+                self.sink.flush()
+            self.checkpoint.save()
+
+    def finish(self) -> ExportInteractionsResponse:
+        self._save()
+        return self.response
@@ -0,0 +1,795 @@
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    BinaryIO,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+from uuid import UUID
+
+from weaviate_recommend.decoding import dumps, loads
+from weaviate_recommend.exceptions import (
+    InteractionSpoolFullException,
+    InteractionSpoolLockedException,
+    RecommendApiException,
+)
+from weaviate_recommend.models.data import UserInteraction
+from weaviate_recommend.services.data.interaction_buffer import (
+    DEFAULT_MAX_DELAY,
+    ON_FULL_OPTIONS,
+    _make_interaction,
+    _stamp,
+)
+
+if TYPE_CHECKING:
+    import asyncio
+
+    from weaviate_recommend.services.data.user import _AsyncUser, _User
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SPOOL_BATCH_SIZE = 5000
+DEFAULT_SEGMENT_BYTES = 16 * 1024 * 1024
+DEFAULT_MAX_SPOOL_BYTES = 1024 * 1024 * 1024
+DEFAULT_SYNC_INTERVAL = 1.0
+MIN_BACKOFF = 0.5
+MAX_BACKOFF = 30.0
+
+CHECKPOINT_FILE = "checkpoint.json"
+LOCK_FILE = "lock"
+SEGMENT_SUFFIX = ".log"
+
+# a segment and a byte offset in it
+Position = Tuple[int, int]
+
+
+def _segment_name(segment: int) -> str:
+    return f"{segment:016d}{SEGMENT_SUFFIX}"
+
+
+def _lock_directory(directory: str) -> BinaryIO:
+    """
+    Takes an exclusive lock on the spool directory, held until the returned file is closed.
+    Two spools on the same directory would send the same interactions and truncate each
+    other's lines.
+    """
+    lock_file = open(os.path.join(directory, LOCK_FILE), "a+b")
+    try:
+        if os.name == "nt":
+            import msvcrt
+
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.close()
+        raise InteractionSpoolLockedException(
+            f"The interaction spool {directory} is used by another spool"
+        ) from None
+    return lock_file
+
+
+def _is_transient(error: Exception) -> bool:
+    """
+    Whether a failed batch can succeed later, rather than being rejected by the server.
+    """
+    if isinstance(error, RecommendApiException) and error.status_code is not None:
+        return error.status_code in (408, 429) or error.status_code >= 500
+    return True
+
+
+class _SpoolLog:
+    """
+    An append-only log of JSON lines, split in numbered segment files, with a persisted read
+    position. Thread-safe for a single reader and any number of writers.
+
+    Lines are written to the operating system as they are appended, so they survive a crash of
+    the process. A line torn by a crash while it was written is removed when the log is opened.
+    The directory is locked while the log is open, so only one spool uses it at a time.
+    """
+
+    def __init__(self, directory: str, segment_bytes: int, max_bytes: Optional[int]):
+        if segment_bytes < 1:
+            raise ValueError("segment_bytes must be positive")
+        # the segment being written is only removed once it is full and was sent
+        if max_bytes is not None and max_bytes < 2 * segment_bytes:
+            raise ValueError("max_bytes must be at least twice segment_bytes")
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._lock_file = _lock_directory(directory)
+        try:
+            self._open()
+        except BaseException:
+            self._lock_file.close()
+            raise
+
+    def _open(self) -> None:
+        """
+        Loads the segments and the read position left by previous spools.
+        """
+        directory = self.directory
+        self._sizes: Dict[int, int] = {}
+        for name in os.listdir(directory):
+            if name.endswith(SEGMENT_SUFFIX):
+                segment = int(name[: -len(SEGMENT_SUFFIX)])
+                self._sizes[segment] = os.path.getsize(self._path(segment))
+        self.position = self._read_checkpoint()
+        for segment in [s for s in self._sizes if s < self.position[0]]:
+            # consumed segments left behind by a crash
+            self._remove(segment)
+        if not self._sizes:
+            self._sizes[self.position[0]] = 0
+        self._segment = max(self._sizes)
+        self._truncate_torn_line(self._segment)
+        self._file: BinaryIO = open(self._path(self._segment), "ab", buffering=0)
+        self._reader: Optional[Tuple[int, BinaryIO]] = None
+        self._closed = False
+
+    def _path(self, segment: int) -> str:
+        return os.path.join(self.directory, _segment_name(segment))
+
+    def _read_checkpoint(self) -> Position:
+        path = os.path.join(self.directory, CHECKPOINT_FILE)
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                checkpoint = json.load(f)
+            return checkpoint["segment"], checkpoint["offset"]
+        return (min(self._sizes) if self._sizes else 0), 0
+
+    def _write_checkpoint(self) -> None:
+        path = os.path.join(self.directory, CHECKPOINT_FILE)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"segment": self.position[0], "offset": self.position[1]}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def _truncate_torn_line(self, segment: int) -> None:
+        size = self._sizes[segment]
+        if size == 0:
+            return
+        with open(self._path(segment), "r+b") as f:
+            end = size
+            while end > 0:
+                start = max(0, end - 65536)
+                f.seek(start)
+                newline = f.read(end - start).rfind(b"\n")
+                if newline >= 0:
+                    end = start + newline + 1
+                    break
+                end = start
+            if end == size:
+                return
+            logger.warning(
+                "Removing a torn interaction from the spool %s", self.directory
+            )
+            f.truncate(end)
+        self._sizes[segment] = end
+
+    def _remove(self, segment: int) -> None:
+        os.remove(self._path(segment))
+        del self._sizes[segment]
+
+    @property
+    def size(self) -> int:
+        """
+        Bytes of the segments on disk.
+        """
+        with self._lock:
+            return sum(self._sizes.values())
+
+    @property
+    def end(self) -> Position:
+        with self._lock:
+            return self._segment, self._sizes[self._segment]
+
+    def append(self, line: bytes) -> bool:
+        """
+        Appends a line, returns False if the log reached `max_bytes`.
+        """
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("The interaction spool is closed")
+            if (
+                self.max_bytes is not None
+                and sum(self._sizes.values()) + len(line) > self.max_bytes
+            ):
+                return False
+            self._file.write(line)
+            self._sizes[self._segment] += len(line)
+            if self._sizes[self._segment] >= self.segment_bytes:
+                self._file.close()
+                self._segment += 1
+                self._sizes[self._segment] = 0
+                self._file = open(self._path(self._segment), "ab", buffering=0)
+            return True
+
+    def sync(self) -> None:
+        """
+        Flushes the appended lines to the disk, so they also survive a crash of the machine.
+        """
+        with self._lock:
+            if not self._closed:
+                os.fsync(self._file.fileno())
+
+    def read(self, max_lines: int) -> Tuple[List[bytes], Position]:
+        """
+        Returns up to `max_lines` lines after the read position, and the position after them.
+        """
+        lines: List[bytes] = []
+        segment, offset = self.position
+        while len(lines) < max_lines:
+            with self._lock:
+                last = self._segment
+                size = self._sizes.get(segment, 0)
+            if offset >= size:
+                if segment >= last:
+                    break
+                segment, offset = segment + 1, 0
+                continue
+            if self._reader is None or self._reader[0] != segment:
+                if self._reader is not None:
+                    self._reader[1].close()
+                self._reader = (segment, open(self._path(segment), "rb"))
+            reader = self._reader[1]
+            reader.seek(offset)
+            while len(lines) < max_lines and offset < size:
+                line = reader.readline(size - offset)
+                offset += len(line)
+                lines.append(line)
+        return lines, (segment, offset)
+
+    def commit(self, position: Position) -> None:
+        """
+        Moves the read position, and removes the segments before it.
+        """
+        self.position = position
+        self._write_checkpoint()
+        with self._lock:
+            consumed = [segment for segment in self._sizes if segment < position[0]]
+            for segment in consumed:
+                if self._reader is not None and self._reader[0] == segment:
+                    self._reader[1].close()
+                    self._reader = None
+                self._remove(segment)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            os.fsync(self._file.fileno())
+            self._file.close()
+            if self._reader is not None:
+                self._reader[1].close()
+                self._reader = None
+            self._lock_file.close()
+
+
+def _encode(interaction: UserInteraction) -> bytes:
+    return dumps(_stamp(interaction).model_dump(mode="json")) + b"\n"
+
+
+def _decode(lines: List[bytes]) -> List[UserInteraction]:
+    return [UserInteraction(**loads(line)) for line in lines]
+
+
+def _report(
+    on_error: Optional[Callable[[Exception, List[UserInteraction]], None]],
+    error: Exception,
+    lines: List[bytes],
+) -> None:
+    if on_error is None:
+        logger.error(
+            "The service rejected %d spooled interactions: %r", len(lines), error
+        )
+        return
+    try:
+        on_error(error, _decode(lines))
+    except Exception:
+        # the shipper must outlive a failing callback, or the spool would stop shipping
+        logger.exception("The on_error callback of the interaction spool failed")
+
+
+class InteractionSpool:
+    """
+    Appends user interactions to a write-ahead log on disk, and ships them to the service in
+    large batches from a background thread.
+
+    Unlike an `InteractionBuffer`, interactions that were not sent yet survive a crash of the
+    process and outages of the service: `add` only writes to the local log, so it keeps its
+    speed while the service is unreachable, and the interactions are sent once it is back, or
+    by the next spool opened on the same directory. Delivery is at least once: interactions
+    sent just before a crash can be sent again.
+
+    Create it with `client.user.interaction_spool(directory, ...)`. The log is split in
+    segments of `segment_bytes`, removed once all their interactions were sent.
+
+    Args:
+        directory (str): Directory of the log, created if it does not exist.
+        max_batch_size (int): Maximum number of interactions sent in a single request.
+        max_delay (float): Seconds between two attempts to send the spooled interactions.
+        segment_bytes (int): Size of the log segments. Defaults to 16 MiB.
+        max_bytes (int, optional): Maximum disk usage of the log. Defaults to 1 GiB.
+        on_full (str): What `add` does when the log reached `max_bytes`: "drop" the
+            interaction, "block" until interactions were sent, or "raise" an
+            `InteractionSpoolFullException`. Defaults to "drop", so a long outage does not
+            stop the application.
+        sync_interval (float, optional): Seconds between two flushes of the log to the disk,
+            which bounds the interactions lost if the machine, rather than the process,
+            crashes. None leaves it to the operating system. Defaults to 1.0.
+        on_error (Callable, optional): Called with the exception and the interactions of a
+            batch rejected by the service, which is skipped. Failures are logged if it is not
+            set. Batches failing with a server or connection error are retried until they
+            succeed.
+    """
+
+    def __init__(
+        self,
+        user: "_User",
+        directory: str,
+        max_batch_size: int = DEFAULT_SPOOL_BATCH_SIZE,
+        max_delay: float = DEFAULT_MAX_DELAY,
+        segment_bytes: int = DEFAULT_SEGMENT_BYTES,
+        max_bytes: Optional[int] = DEFAULT_MAX_SPOOL_BYTES,
+        on_full: ON_FULL_OPTIONS = "drop",
+        sync_interval: Optional[float] = DEFAULT_SYNC_INTERVAL,
+        on_error: Optional[Callable[[Exception, List[UserInteraction]], None]] = None,
+    ):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be positive")
+        if on_full not in ("block", "drop", "raise"):
+            raise ValueError("on_full must be one of 'block', 'drop' or 'raise'")
+        self._user = user
+        self._log = _SpoolLog(directory, segment_bytes, max_bytes)
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self.on_full = on_full
+        self.sync_interval = sync_interval
+        self.on_error = on_error
+        self.num_sent = 0
+        self.num_failed = 0
+        self.num_dropped = 0
+        self._added = 0
+        # number of `flush` calls waiting, which send incomplete batches right away
+        self._draining = 0
+        self._lock = threading.Lock()
+        # notified when interactions were sent, or the spool is closed
+        self._shipped = threading.Condition(self._lock)
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._run, name="weaviate-recommend-spool", daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.close)
+
+    def __enter__(self) -> "InteractionSpool":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    @property
+    def size(self) -> int:
+        """
+        Bytes of the log on disk.
+        """
+        return self._log.size
+
+    def add(self, interaction: UserInteraction) -> None:
+        """
+        Append an interaction to the log, to be sent in the background.
+        """
+        if self._closed:
+            raise RuntimeError("The interaction spool is closed")
+        line = _encode(interaction)
+        while not self._log.append(line):
+            if self.on_full == "raise":
+                raise InteractionSpoolFullException(
+                    f"The interaction spool reached {self._log.max_bytes} bytes"
+                )
+            if self.on_full == "drop":
+                with self._lock:
+                    self.num_dropped += 1
+                return
+            with self._shipped:
+                self._wakeup.set()
+                self._shipped.wait(self.max_delay)
+                if self._closed:
+                    raise RuntimeError("The interaction spool is closed")
+        with self._lock:
+            self._added += 1
+            if self._added % self.max_batch_size == 0:
+                self._wakeup.set()
+
+    def add_interaction(
+        self,
+        user_id: Union[str, UUID],
+        item_id: Union[str, UUID],
+        interaction_property_name: str,
+        weight: float = 1.0,
+        created_at: Union[str, None] = None,
+        remove_previous_interactions: bool = False,
+    ) -> None:
+        """
+        Spool a user interaction, takes the same arguments as `client.user.add_interaction`.
+        """
+        self.add(
+            _make_interaction(
+                user_id,
+                item_id,
+                interaction_property_name,
+                weight,
+                created_at,
+                remove_previous_interactions,
+            )
+        )
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Send every interaction spooled so far, returns False if `timeout` expired first, for
+        instance while the service is unreachable.
+        """
+        target = self._log.end
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._shipped:
+            self._draining += 1
+            try:
+                while self._log.position < target and not self._closed:
+                    self._wakeup.set()
+                    remaining = (
+                        None if deadline is None else deadline - time.monotonic()
+                    )
+                    if remaining is not None and remaining <= 0:
+                        return False
+                    self._shipped.wait(remaining)
+            finally:
+                self._draining -= 1
+        return self._log.position >= target
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """
+        Send the spooled interactions while the service accepts them, and stop the background
+        thread. Interactions that could not be sent stay in the log for the next spool.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        atexit.unregister(self.close)
+        self._stop.set()
+        self._wakeup.set()
+        self._thread.join(timeout)
+        with self._shipped:
+            self._shipped.notify_all()
+
+    def _run(self) -> None:
+        backoff = MIN_BACKOFF
+        last_sync = last_drain = time.monotonic()
+        try:
+            while True:
+                stopping = self._stop.is_set()
+                # full batches are sent as soon as they are spooled, the rest every max_delay
+                drain = (
+                    stopping
+                    or self._draining > 0
+                    or time.monotonic() - last_drain >= self.max_delay
+                )
+                if self._ship(drain):
+                    backoff = MIN_BACKOFF
+                    if stopping:
+                        return
+                    if drain:
+                        last_drain = time.monotonic()
+                    if (
+                        self.sync_interval is not None
+                        and time.monotonic() - last_sync >= self.sync_interval
+                    ):
+                        self._log.sync()
+                        last_sync = time.monotonic()
+                    self._wakeup.wait(last_drain + self.max_delay - time.monotonic())
+                    self._wakeup.clear()
+                elif stopping:
+                    # the service is unreachable, the interactions stay in the log
+                    return
+                else:
+                    # interrupted by `close`, which makes a last attempt
+                    self._stop.wait(backoff)
+                    backoff = min(MAX_BACKOFF, backoff * 2)
+        finally:
+            self._log.close()
+
+    def _ship(self, drain: bool) -> bool:
+        """
+        Sends the spooled full batches, and the last incomplete one if `drain` is set. Returns
+        False when a batch failed and must be retried.
+        """
+        while True:
+            lines, position = self._log.read(self.max_batch_size)
+            if not lines or (len(lines) < self.max_batch_size and not drain):
+                return True
+            try:
+                self._user._add_interactions_data(b"[" + b",".join(lines) + b"]")
+            except Exception as e:
+                if _is_transient(e):
+                    logger.warning(
+                        "Failed to send %d spooled interactions, retrying: %r",
+                        len(lines),
+                        e,
+                    )
+                    return False
+                self._failed(e, lines)
+            else:
+                with self._lock:
+                    self.num_sent += len(lines)
+            self._log.commit(position)
+            with self._shipped:
+                self._shipped.notify_all()
+
+    def _failed(self, error: Exception, lines: List[bytes]) -> None:
+        with self._lock:
+            self.num_failed += len(lines)
+        _report(self.on_error, error, lines)
+
+
+async def _wait(event: "asyncio.Event", timeout: float) -> None:
+    import asyncio
+
+    try:
+        await asyncio.wait_for(event.wait(), timeout)
+    except asyncio.TimeoutError:
+        pass
+
+
+class AsyncInteractionSpool:
+    """
+    The asyncio counterpart of `InteractionSpool`, sending interactions from a background task
+    of the running event loop. Create it with `client.user.interaction_spool(...)` and close
+    it with `await spool.close()` before the event loop stops.
+
+    `add` writes to the log without awaiting, like a write to a local file.
+    """
+
+    def __init__(
+        self,
+        user: "_AsyncUser",
+        directory: str,
+        max_batch_size: int = DEFAULT_SPOOL_BATCH_SIZE,
+        max_delay: float = DEFAULT_MAX_DELAY,
+        segment_bytes: int = DEFAULT_SEGMENT_BYTES,
+        max_bytes: Optional[int] = DEFAULT_MAX_SPOOL_BYTES,
+        on_full: ON_FULL_OPTIONS = "drop",
+        sync_interval: Optional[float] = DEFAULT_SYNC_INTERVAL,
+        on_error: Optional[Callable[[Exception, List[UserInteraction]], None]] = None,
+    ):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be positive")
+        if on_full not in ("block", "drop", "raise"):
+            raise ValueError("on_full must be one of 'block', 'drop' or 'raise'")
+        self._user = user
+        self._log = _SpoolLog(directory, segment_bytes, max_bytes)
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self.on_full = on_full
+        self.sync_interval = sync_interval
+        self.on_error = on_error
+        self.num_sent = 0
+        self.num_failed = 0
+        self.num_dropped = 0
+        self._added = 0
+        self._draining = 0
+        self._task: Optional["asyncio.Task[None]"] = None
+        self._wakeup: Optional["asyncio.Event"] = None
+        self._stop: Optional["asyncio.Event"] = None
+        self._shipped: Optional["asyncio.Condition"] = None
+        self._closed = False
+
+    async def __aenter__(self) -> "AsyncInteractionSpool":
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.close()
+
+    @property
+    def size(self) -> int:
+        """
+        Bytes of the log on disk.
+        """
+        return self._log.size
+
+    def _ensure_started(self) -> Tuple["asyncio.Event", "asyncio.Condition"]:
+        import asyncio
+
+        # the events and the worker task are bound to the loop of the first call
+        if self._task is None:
+            self._wakeup = asyncio.Event()
+            self._stop = asyncio.Event()
+            self._shipped = asyncio.Condition()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        assert self._wakeup is not None and self._shipped is not None
+        return self._wakeup, self._shipped
+
+    async def add(self, interaction: UserInteraction) -> None:
+        """
+        Append an interaction to the log, to be sent in the background.
+        """
+        import asyncio
+
+        if self._closed:
+            raise RuntimeError("The interaction spool is closed")
+        wakeup, shipped = self._ensure_started()
+        line = _encode(interaction)
+        while not self._log.append(line):
+            if self.on_full == "raise":
+                raise InteractionSpoolFullException(
+                    f"The interaction spool reached {self._log.max_bytes} bytes"
+                )
+            if self.on_full == "drop":
+                self.num_dropped += 1
+                return
+            async with shipped:
+                wakeup.set()
+                try:
+                    await asyncio.wait_for(shipped.wait(), self.max_delay)
+                except asyncio.TimeoutError:
+                    pass
+            if self._closed:
+                raise RuntimeError("The interaction spool is closed")
+        self._added += 1
+        if self._added % self.max_batch_size == 0:
+            wakeup.set()
+
+    async def add_interaction(
+        self,
+        user_id: Union[str, UUID],
+        item_id: Union[str, UUID],
+        interaction_property_name: str,
+        weight: float = 1.0,
+        created_at: Union[str, None] = None,
+        remove_previous_interactions: bool = False,
+    ) -> None:
+        """
+        Spool a user interaction, takes the same arguments as `client.user.add_interaction`.
+        """
+        await self.add(
+            _make_interaction(
+                user_id,
+                item_id,
+                interaction_property_name,
+                weight,
+                created_at,
+                remove_previous_interactions,
+            )
+        )
+
+    async def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Send every interaction spooled so far, returns False if `timeout` expired first.
+        """
+        import asyncio
+
+        if self._closed:
+            return self._log.position >= self._log.end
+        wakeup, shipped = self._ensure_started()
+        target = self._log.end
+
+        async def shipped_target() -> None:
+            async with shipped:
+                while self._log.position < target and not self._closed:
+                    wakeup.set()
+                    await shipped.wait()
+
+        self._draining += 1
+        try:
+            await asyncio.wait_for(shipped_target(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            self._draining -= 1
+        return self._log.position >= target
+
+    async def close(self) -> None:
+        """
+        Send the spooled interactions while the service accepts them, and stop the background
+        task. Interactions that could not be sent stay in the log for the next spool.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        if self._task is None:
+            # interactions left by a previous spool
+            try:
+                await self._ship(drain=True)
+            finally:
+                self._log.close()
+            return
+        assert self._stop is not None and self._wakeup is not None
+        self._stop.set()
+        self._wakeup.set()
+        await self._task
+
+    async def _run(self) -> None:
+        import asyncio
+
+        assert self._wakeup is not None and self._stop is not None
+        backoff = MIN_BACKOFF
+        loop = asyncio.get_running_loop()
+        last_sync = last_drain = loop.time()
+        try:
+            while True:
+                stopping = self._stop.is_set()
+                drain = (
+                    stopping
+                    or self._draining > 0
+                    or loop.time() - last_drain >= self.max_delay
+                )
+                if await self._ship(drain):
+                    backoff = MIN_BACKOFF
+                    if stopping:
+                        return
+                    if drain:
+                        last_drain = loop.time()
+                    if (
+                        self.sync_interval is not None
+                        and loop.time() - last_sync >= self.sync_interval
+                    ):
+                        await asyncio.to_thread(self._log.sync)
+                        last_sync = loop.time()
+                    await _wait(self._wakeup, last_drain + self.max_delay - loop.time())
+                    self._wakeup.clear()
+                elif stopping:
+                    # the service is unreachable, the interactions stay in the log
+                    return
+                else:
+                    # interrupted by `close`, which makes a last attempt
+                    await _wait(self._stop, backoff)
+                    backoff = min(MAX_BACKOFF, backoff * 2)
+        finally:
+            self._log.close()
+
+    async def _ship(self, drain: bool) -> bool:
+        import asyncio
+
+        while True:
+            # reading and committing touch the disk, which must not block the event loop
+            lines, position = await asyncio.to_thread(
+                self._log.read, self.max_batch_size
+            )
+            if not lines or (len(lines) < self.max_batch_size and not drain):
+                return True
+            try:
+                await self._user._add_interactions_data(b"[" + b",".join(lines) + b"]")
+            except Exception as e:
+                if _is_transient(e):
+                    logger.warning(
+                        "Failed to send %d spooled interactions, retrying: %r",
+                        len(lines),
+                        e,
+                    )
+                    return False
+                self.num_failed += len(lines)
+                _report(self.on_error, e, lines)
+            else:
+                self.num_sent += len(lines)
+            await asyncio.to_thread(self._log.commit, position)
+            if self._shipped is not None:
+                async with self._shipped:
+                    self._shipped.notify_all()
@@ -1,19 +1,71 @@
-from typing import TYPE_CHECKING, Any, Dict, List, Union
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 from uuid import UUID
 
-import requests
-
-from weaviate_recommend.exceptions import RecommendApiException
+from weaviate_recommend.batching import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_MAX_BATCH_BYTES,
+    DEFAULT_MAX_IN_FLIGHT,
+    async_bounded_map,
+    bounded_map,
+    iter_chunks,
+    join_json_array,
+    serialize_record,
+)
+from weaviate_recommend.models.batch import (
+    AddItemsStreamResponse,
+    BatchChunkFailure,
+    BulkDeleteResponse,
+)
 from weaviate_recommend.models.data import RecommenderItem
 from weaviate_recommend.models.responses import (
     AddItemResponse,
     AddItemsResponse,
     DeleteItemResponse,
 )
-from weaviate_recommend.utils import get_auth_header
+from weaviate_recommend.services.data.bulk_delete import (
+    DeleteOutcomeCallback,
+    _BulkDeleteJob,
+)
 
 if TYPE_CHECKING:
-    from weaviate_recommend import WeaviateRecommendClient
+    from weaviate_recommend import AsyncWeaviateRecommendClient, WeaviateRecommendClient
+
+
+def _serialize_items(items: Iterable[RecommenderItem]) -> Iterator[Tuple[str, bytes]]:
+    for item in items:
+        item_id = str(item.id)
+        yield item_id, serialize_record({"id": item_id, "properties": item.properties})
+
+
+def _aggregate_chunk_result(
+    response: AddItemsStreamResponse,
+    chunk: Tuple[int, List[Tuple[str, bytes]]],
+    result: Any,
+) -> None:
+    index, records = chunk
+    response.num_chunks += 1
+    if isinstance(result, Exception):
+        response.failures.append(
+            BatchChunkFailure(
+                chunk_index=index,
+                ids=[item_id for item_id, _ in records],
+                message=str(result),
+            )
+        )
+    else:
+        response.num_items_added += AddItemsResponse.model_validate(
+            result
+        ).num_items_added
 
 
 class _Item:
@@ -35,14 +87,8 @@ class _Item:
             "properties": properties,
         }
 
-        response = requests.post(
-            self.endpoint_url,
-            json=params,
-            headers=get_auth_header(self.client._api_key),
-        )
-        if response.status_code != 200:
-            raise RecommendApiException(response.text)
-        return AddItemResponse.model_validate(response.json())
+        response = self.client._transport.post(self.endpoint_url, json=params)
+        return AddItemResponse.model_validate(response)
 
     def add_batch(self, items: List[RecommenderItem]) -> AddItemsResponse:
         """
@@ -56,14 +102,87 @@ class _Item:
             for item in items
         ]
 
-        response = requests.post(
-            self.endpoint_url + "batch",
-            json=params,
-            headers=get_auth_header(self.client._api_key),
+        response = self.client._transport.post(self.endpoint_url + "batch", json=params)
+        return AddItemsResponse.model_validate(response)
+
+    def add_batch_stream(
+        self,
+        items: Iterable[RecommenderItem],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_batch_bytes: int = DEFAULT_MAX_BATCH_BYTES,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+    ) -> AddItemsStreamResponse:
+        """
+        Add an arbitrarily large iterable of items to the recommender.
+
+        The items are consumed lazily and sent in chunks of at most `batch_size` items and
+        `max_batch_bytes` bytes, with at most `max_in_flight` chunks being sent concurrently.
+        A failed chunk does not stop the import, it is reported in `failures` instead.
+        """
+
+        def send(chunk: Tuple[int, List[Tuple[str, bytes]]]) -> Any:
+            return self.client._transport.post(
+                self.endpoint_url + "batch",
+                data=join_json_array([record for _, record in chunk[1]]),
+            )
+
+        response = AddItemsStreamResponse(num_items_added=0, num_chunks=0, failures=[])
+        chunks = enumerate(
+            iter_chunks(_serialize_items(items), batch_size, max_batch_bytes)
         )
-        if response.status_code != 200:
-            raise RecommendApiException(response.text)
-        return AddItemsResponse.model_validate(response.json())
+        for chunk, result in bounded_map(send, chunks, max_in_flight):
+            _aggregate_chunk_result(response, chunk, result)
+        response.failures.sort(key=lambda failure: failure.chunk_index)
+        return response
+
+    def add_batch_columnar(
+        self,
+        source: Any,
+        id_column: str = "id",
+        property_columns: Optional[List[str]] = None,
+        format: Optional[str] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_batch_bytes: int = DEFAULT_MAX_BATCH_BYTES,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+    ) -> AddItemsStreamResponse:
+        """
+        Add the rows of a Parquet, CSV or Arrow file, or of a pyarrow Table or pandas DataFrame,
+        as items. Requires pyarrow.
+
+        Every column other than `id_column` is a property, unless `property_columns` is given.
+        The file is read in batches, validated and serialized with vectorized kernels, and sent
+        like `add_batch_stream`. Rows whose ID is not a UUID are skipped and reported in
+        `invalid_rows`.
+        """
+        from weaviate_recommend import loaders
+
+        def send(chunk: Tuple[int, "loaders.EncodedChunk"]) -> Any:
+            return self.client._transport.post(
+                self.endpoint_url + "batch", data=chunk[1][1]
+            )
+
+        response = AddItemsStreamResponse(num_items_added=0, num_chunks=0, failures=[])
+        columns = [id_column] + property_columns if property_columns else None
+        encoded = loaders.encode_items(
+            loaders.read_batches(source, format, columns),
+            id_column,
+            property_columns,
+            batch_size,
+            max_batch_bytes,
+            response.invalid_rows.extend,
+        )
+        for (index, (ids, _)), result in bounded_map(
+            send, enumerate(encoded), max_in_flight
+        ):
+            response.num_chunks += 1
+            if isinstance(result, Exception):
+                response.failures.append(loaders.chunk_failure(index, ids, result))
+            else:
+                response.num_items_added += AddItemsResponse.model_validate(
+                    result
+                ).num_items_added
+        response.failures.sort(key=lambda failure: failure.chunk_index)
+        return response
 
     def delete(self, uuid: UUID | str) -> DeleteItemResponse:
         """
@@ -72,9 +191,184 @@ class _Item:
         if isinstance(uuid, str):
             uuid = UUID(uuid)
 
-        response = requests.delete(
-            self.endpoint_url + str(uuid), headers=get_auth_header(self.client._api_key)
+        response = self.client._transport.delete(self.endpoint_url + str(uuid))
+        return DeleteItemResponse.model_validate(response)
+
+    def delete_batch(
+        self,
+        item_ids: Iterable[Union[str, UUID]],
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        on_outcome: Optional[DeleteOutcomeCallback] = None,
+    ) -> BulkDeleteResponse:
+        """
+        Delete every item of `item_ids`, consumed lazily, with at most `max_in_flight` requests
+        running concurrently.
+
+        Items that do not exist are counted in `num_not_found`. A failed deletion does not stop
+        the others, it is reported in `failures`. `on_outcome` is called with the outcome of
+        every item, as they complete.
+        """
+        job = _BulkDeleteJob(on_outcome)
+
+        def delete(indexed_item_id: Tuple[int, Union[str, UUID]]) -> Any:
+            return self.client._transport.delete(
+                self.endpoint_url + str(UUID(str(indexed_item_id[1])))
+            )
+
+        for (index, item_id), result in bounded_map(
+            delete, job.inputs(item_ids), max_in_flight
+        ):
+            job.record(index, item_id, result)
+        return job.finish()
+
+
+class _AsyncItem:
+    def __init__(self, client: "AsyncWeaviateRecommendClient"):
+        self.client = client
+        self.endpoint_url = f"{self.client.base_url}/item/"
+
+    async def add(
+        self, item_id: Union[str, UUID], properties: Dict[str, Any]
+    ) -> AddItemResponse:
+        """
+        Add a new item to the recommender.
+        """
+        if isinstance(item_id, str):
+            item_id = UUID(item_id)
+
+        params = {
+            "id": str(item_id),
+            "properties": properties,
+        }
+
+        response = await self.client._transport.post(self.endpoint_url, json=params)
+        return AddItemResponse.model_validate(response)
+
+    async def add_batch(self, items: List[RecommenderItem]) -> AddItemsResponse:
+        """
+        Add multiple items to the recommender.
+        """
+        params = [
+            {
+                "id": str(item.id),
+                "properties": item.properties,
+            }
+            for item in items
+        ]
+
+        response = await self.client._transport.post(
+            self.endpoint_url + "batch", json=params
         )
-        if response.status_code != 200:
-            raise RecommendApiException(response.text)
-        return DeleteItemResponse.model_validate(response.json())
+        return AddItemsResponse.model_validate(response)
+
+    async def add_batch_stream(
+        self,
+        items: Iterable[RecommenderItem],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_batch_bytes: int = DEFAULT_MAX_BATCH_BYTES,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+    ) -> AddItemsStreamResponse:
+        """
+        Add an arbitrarily large iterable of items to the recommender.
+
+        The items are consumed lazily and sent in chunks of at most `batch_size` items and
+        `max_batch_bytes` bytes, with at most `max_in_flight` chunks being sent concurrently.
+        A failed chunk does not stop the import, it is reported in `failures` instead.
+        """
+
+        async def send(chunk: Tuple[int, List[Tuple[str, bytes]]]) -> Any:
+            return await self.client._transport.post(
+                self.endpoint_url + "batch",
+                data=join_json_array([record for _, record in chunk[1]]),
+            )
+
+        response = AddItemsStreamResponse(num_items_added=0, num_chunks=0, failures=[])
+        chunks = enumerate(
+            iter_chunks(_serialize_items(items), batch_size, max_batch_bytes)
+        )
+        async for chunk, result in async_bounded_map(send, chunks, max_in_flight):
+            _aggregate_chunk_result(response, chunk, result)
+        response.failures.sort(key=lambda failure: failure.chunk_index)
+        return response
+
+    async def add_batch_columnar(
+        self,
+        source: Any,
+        id_column: str = "id",
+        property_columns: Optional[List[str]] = None,
+        format: Optional[str] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_batch_bytes: int = DEFAULT_MAX_BATCH_BYTES,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+    ) -> AddItemsStreamResponse:
+        """
+        Add the rows of a Parquet, CSV or Arrow file, or of a pyarrow Table or pandas DataFrame,
+        as items. Requires pyarrow.
+
+        Every column other than `id_column` is a property, unless `property_columns` is given.
+        The file is read in batches, validated and serialized with vectorized kernels, and sent
+        like `add_batch_stream`. Rows whose ID is not a UUID are skipped and reported in
+        `invalid_rows`.
+        """
+        from weaviate_recommend import loaders
+
+        async def send(chunk: Tuple[int, "loaders.EncodedChunk"]) -> Any:
+            return await self.client._transport.post(
+                self.endpoint_url + "batch", data=chunk[1][1]
+            )
+
+        response = AddItemsStreamResponse(num_items_added=0, num_chunks=0, failures=[])
+        columns = [id_column] + property_columns if property_columns else None
+        encoded = loaders.encode_items(
+            loaders.read_batches(source, format, columns),
+            id_column,
+            property_columns,
+            batch_size,
+            max_batch_bytes,
+            response.invalid_rows.extend,
+        )
+        async for (index, (ids, _)), result in async_bounded_map(
+            send, enumerate(encoded), max_in_flight
+        ):
+            response.num_chunks += 1
+            if isinstance(result, Exception):
+                response.failures.append(loaders.chunk_failure(index, ids, result))
+            else:
+                response.num_items_added += AddItemsResponse.model_validate(
+                    result
+                ).num_items_added
+        response.failures.sort(key=lambda failure: failure.chunk_index)
+        return response
+
+    async def delete(self, uuid: UUID | str) -> DeleteItemResponse:
+        """
+        Delete an item from the recommender.
+        """
+        if isinstance(uuid, str):
+            uuid = UUID(uuid)
+
+        response = await self.client._transport.delete(self.endpoint_url + str(uuid))
+        return DeleteItemResponse.model_validate(response)
+
+    async def delete_batch(
+        self,
+        item_ids: Iterable[Union[str, UUID]],
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        on_outcome: Optional[DeleteOutcomeCallback] = None,
+    ) -> BulkDeleteResponse:
+        """
+        Delete every item of `item_ids`, consumed lazily, with at most `max_in_flight` requests
+        running concurrently. See `_Item.delete_batch`.
+        """
+        job = _BulkDeleteJob(on_outcome)
+
+        async def delete(indexed_item_id: Tuple[int, Union[str, UUID]]) -> Any:
+            return await self.client._transport.delete(
+                self.endpoint_url + str(UUID(str(indexed_item_id[1])))
+            )
+
+        async for (index, item_id), result in async_bounded_map(
+            delete, job.inputs(item_ids), max_in_flight
+        ):
+            job.record(index, item_id, result)
+        return job.finish()
@@ -1,9 +1,34 @@
-from typing import TYPE_CHECKING, List, Union
+import itertools
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 from uuid import UUID
 
-import requests
-
+from weaviate_recommend.batching import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_MAX_BATCH_BYTES,
+    DEFAULT_MAX_IN_FLIGHT,
+    async_bounded_map,
+    bounded_map,
+)
+from weaviate_recommend.decoding import aiter_json_array, iter_json_array
 from weaviate_recommend.exceptions import RecommendApiException
+from weaviate_recommend.models.batch import (
+    AddInteractionsStreamResponse,
+    BulkDeleteResponse,
+    BulkUpsertUsersResponse,
+    ExportInteractionsResponse,
+)
 from weaviate_recommend.models.data import User, UserInteraction
 from weaviate_recommend.models.responses import (
     AddUserInteractionResponse,
@@ -12,10 +37,46 @@ from weaviate_recommend.models.responses import (
     DeleteUserResponse,
     UpdateUserResponse,
 )
-from weaviate_recommend.utils import get_auth_header, get_datetime
+from weaviate_recommend.services.data.bulk_delete import (
+    DeleteOutcomeCallback,
+    InteractionTarget,
+    _BulkDeleteJob,
+    interactions_path,
+)
+from weaviate_recommend.services.data.interaction_buffer import (
+    DEFAULT_MAX_BATCH_SIZE,
+    DEFAULT_MAX_DELAY,
+    DEFAULT_MAX_QUEUE_SIZE,
+    ON_FULL_OPTIONS,
+    AsyncInteractionBuffer,
+    InteractionBuffer,
+)
+from weaviate_recommend.services.data.interaction_export import (
+    DEFAULT_CHECKPOINT_EVERY,
+    EXPORT_WRITE_BATCH_SIZE,
+    InteractionCallback,
+    _InteractionExportJob,
+    interaction_record,
+)
+from weaviate_recommend.services.data.interaction_spool import (
+    DEFAULT_MAX_SPOOL_BYTES,
+    DEFAULT_SEGMENT_BYTES,
+    DEFAULT_SPOOL_BATCH_SIZE,
+    DEFAULT_SYNC_INTERVAL,
+    AsyncInteractionSpool,
+    InteractionSpool,
+)
+from weaviate_recommend.services.data.user_upsert import (
+    UPSERT_PREFERENCE,
+    UpsertOutcomeCallback,
+    _is_wrong_guess,
+    _UserUpsertJob,
+)
+from weaviate_recommend.sinks import Sink
+from weaviate_recommend.utils import get_datetime
 
 if TYPE_CHECKING:
-    from weaviate_recommend import WeaviateRecommendClient
+    from weaviate_recommend import AsyncWeaviateRecommendClient, WeaviateRecommendClient
 
 
 class _User:
@@ -49,12 +110,8 @@ class _User:
             "created_at": created_at,
         }
 
-        response = requests.post(
-            self.endpoint_url, json=data, headers=get_auth_header(self.client._api_key)
-        )
-        if response.status_code != 200:
-            raise RecommendApiException(response.text)
-        return AddUserInteractionResponse.model_validate(response.json())
+        response = self.client._transport.post(self.endpoint_url, json=data)
+        return AddUserInteractionResponse.model_validate(response)
 
     def add_interactions(
         self, interactions: List[UserInteraction]
@@ -62,18 +119,129 @@ class _User:
         """
         Add multiple user interactions.
         """
-        data = [interaction.model_dump() for interaction in interactions]
+        data = [interaction.model_dump(mode="json") for interaction in interactions]
         for interaction in data:
             if not interaction["created_at"]:
                 interaction["created_at"] = get_datetime()
-        response = requests.post(
-            self.endpoint_url + "batch",
-            json=data,
-            headers=get_auth_header(self.client._api_key),
+        response = self.client._transport.post(self.endpoint_url + "batch", json=data)
+        return AddUserInteractionsResponse.model_validate(response)
+
+    def _add_interactions_data(self, data: bytes) -> AddUserInteractionsResponse:
+        # `data` is a serialized JSON array of interactions
+        response = self.client._transport.post(self.endpoint_url + "batch", data=data)
+        return AddUserInteractionsResponse.model_validate(response)
+
+    def add_interactions_columnar(
+        self,
+        source: Any,
+        interaction_property_name: Optional[str] = None,
+        user_id_column: str = "user_id",
+        item_id_column: str = "item_id",
+        property_name_column: str = "interaction_property_name",
+        weight_column: str = "weight",
+        created_at_column: str = "created_at",
+        remove_previous_interactions: bool = False,
+        format: Optional[str] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_batch_bytes: int = DEFAULT_MAX_BATCH_BYTES,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+    ) -> AddInteractionsStreamResponse:
+        """
+        Add the rows of a Parquet, CSV or Arrow file, or of a pyarrow Table or pandas DataFrame,
+        as user interactions. Requires pyarrow.
+
+        `interaction_property_name` is used for every row when the source has no property name
+        column. Weights default to 1.0 and creation times to the time the rows are read when
+        their column is missing. Rows are sent in chunks of at most `batch_size` interactions
+        and `max_batch_bytes` bytes, with at most `max_in_flight` chunks being sent
+        concurrently. Rows whose user or item ID is not a UUID are skipped and reported in
+        `invalid_rows`.
+        """
+        from weaviate_recommend import loaders
+
+        def send(chunk: Tuple[int, "loaders.EncodedChunk"]) -> Any:
+            return self.client._transport.post(
+                self.endpoint_url + "batch", data=chunk[1][1]
+            )
+
+        response = AddInteractionsStreamResponse(
+            num_interactions_added=0, num_chunks=0, failures=[]
+        )
+        encoded = loaders.encode_interactions(
+            loaders.read_batches(source, format),
+            user_id_column,
+            item_id_column,
+            property_name_column,
+            weight_column,
+            created_at_column,
+            interaction_property_name,
+            remove_previous_interactions,
+            batch_size,
+            max_batch_bytes,
+            response.invalid_rows.extend,
+        )
+        for (index, (ids, _)), result in bounded_map(
+            send, enumerate(encoded), max_in_flight
+        ):
+            response.num_chunks += 1
+            if isinstance(result, Exception):
+                response.failures.append(loaders.chunk_failure(index, ids, result))
+            else:
+                response.num_interactions_added += (
+                    AddUserInteractionsResponse.model_validate(
+                        result
+                    ).num_interactions_added
+                )
+        response.failures.sort(key=lambda failure: failure.chunk_index)
+        return response
+
+    def interaction_buffer(
+        self,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        max_delay: float = DEFAULT_MAX_DELAY,
+        max_queue_size: int = DEFAULT_MAX_QUEUE_SIZE,
+        on_full: ON_FULL_OPTIONS = "block",
+        on_error: Optional[Callable[[Exception, List[UserInteraction]], None]] = None,
+    ) -> InteractionBuffer:
+        """
+        Create a buffer that queues user interactions and sends them in batches from a background thread,
+        taking the requests off the caller's hot path. See `InteractionBuffer` for the options.
+        """
+        buffer = InteractionBuffer(
+            self, max_batch_size, max_delay, max_queue_size, on_full, on_error
+        )
+        self.client._background_writers.add(buffer)
+        return buffer
+
+    def interaction_spool(
+        self,
+        directory: str,
+        max_batch_size: int = DEFAULT_SPOOL_BATCH_SIZE,
+        max_delay: float = DEFAULT_MAX_DELAY,
+        segment_bytes: int = DEFAULT_SEGMENT_BYTES,
+        max_bytes: Optional[int] = DEFAULT_MAX_SPOOL_BYTES,
+        on_full: ON_FULL_OPTIONS = "drop",
+        sync_interval: Optional[float] = DEFAULT_SYNC_INTERVAL,
+        on_error: Optional[Callable[[Exception, List[UserInteraction]], None]] = None,
+    ) -> InteractionSpool:
+        """
+        Create a spool that appends user interactions to a log in `directory` and sends them in
+        batches from a background thread. Interactions that were not sent survive crashes and
+        outages of the service. See `InteractionSpool` for the options.
+        """
+        spool = InteractionSpool(
+            self,
+            directory,
+            max_batch_size,
+            max_delay,
+            segment_bytes,
+            max_bytes,
+            on_full,
+            sync_interval,
+            on_error,
         )
-        if response.status_code != 200:
-            raise RecommendApiException(response.text)
-        return AddUserInteractionsResponse.model_validate(response.json())
+        self.client._background_writers.add(spool)
+        return spool
 
     def get_user_interactions(self, user_id: Union[str, UUID]) -> List[UserInteraction]:
         """
@@ -82,12 +250,9 @@ class _User:
         if isinstance(user_id, UUID):
             user_id = str(user_id)
 
-        response = requests.get(
-            f"{self.endpoint_url}interactions/{user_id}",
-            headers=get_auth_header(self.client._api_key),
+        response = self.client._transport.get(
+            f"{self.endpoint_url}interactions/{user_id}"
         )
-        if response.status_code != 200:
-            raise RecommendApiException(response.text)
         return [
             UserInteraction(
                 user_id=interaction["id"],
@@ -96,21 +261,77 @@ class _User:
                 weight=interaction["weight"],
                 created_at=interaction["created_at"],
             )
-            for interaction in response.json()
+            for interaction in response
         ]
 
+    def _stream_interaction_records(
+        self, user_id: Union[str, UUID]
+    ) -> Iterator[Dict[str, Any]]:
+        chunks = self.client._transport.stream(
+            f"{self.endpoint_url}interactions/{user_id}"
+        )
+        for interaction in iter_json_array(chunks):
+            yield interaction_record(interaction)
+
+    def iter_user_interactions(
+        self, user_id: Union[str, UUID]
+    ) -> Iterator[UserInteraction]:
+        """
+        Lazily yield the interactions of a user while they are received, without loading them
+        all in memory, unlike `get_user_interactions`.
+        """
+        for record in self._stream_interaction_records(user_id):
+            yield UserInteraction(**record)
+
+    def export_interactions(
+        self,
+        user_ids: Iterable[Union[str, UUID]],
+        sink: Union[Sink, InteractionCallback],
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        checkpoint_path: Optional[str] = None,
+        checkpoint_every: int = DEFAULT_CHECKPOINT_EVERY,
+    ) -> ExportInteractionsResponse:
+        """
+        Stream the interactions of every user of `user_ids` to `sink`, exporting up to
+        `max_in_flight` users concurrently.
+
+        Args:
+            user_ids (Iterable[Union[str, UUID]]): The users, consumed lazily.
+            sink (Union[Sink, Callable[[UserInteraction], None]]): A `JsonlSink`, a
+                `ParquetSink`, or a callback called with each interaction.
+            checkpoint_path (str, optional): File the progress is saved to every
+                `checkpoint_every` users. When it exists, the users completed by the previous
+                run are skipped, which requires `user_ids` to be in the same order. The
+                checkpoint only stops at a user that failed with a transient error, like a
+                5xx, so resuming retries it. The IDs of the users that failed for good, like
+                a 404, are appended to `checkpoint_path + ".failed"`.
+
+        Returns:
+            The number of users that succeeded, failed or were skipped, the number of exported
+            interactions, and the failed user IDs. The interactions received for a user before
+            it failed are still written to the sink.
+        """
+        job = _InteractionExportJob(sink, checkpoint_path, checkpoint_every)
+
+        def export(indexed_user_id: Tuple[int, Union[str, UUID]]) -> None:
+            records = self._stream_interaction_records(indexed_user_id[1])
+            while batch := list(itertools.islice(records, EXPORT_WRITE_BATCH_SIZE)):
+                job.write(batch)
+
+        for (index, user_id), result in bounded_map(
+            export, job.inputs(user_ids), max_in_flight
+        ):
+            job.record(index, user_id, result)
+        return job.finish()
+
     def create_user(self, user: User) -> CreateUserResponse:
         """
         Create a new user in the recommender with the given properties, not including interactions.
         """
-        response = requests.post(
-            f"{self.endpoint_url}create",
-            json=user.model_dump(),
-            headers=get_auth_header(self.client._api_key),
+        response = self.client._transport.post(
+            f"{self.endpoint_url}create", json=user.model_dump()
         )
-        if response.status_code != 200:
-            raise RecommendApiException(response.text)
-        return CreateUserResponse.model_validate(response.json())
+        return CreateUserResponse.model_validate(response)
 
     def get_user(self, user_id: Union[str, UUID]) -> User:
         """
@@ -119,27 +340,70 @@ class _User:
         if isinstance(user_id, UUID):
             user_id = str(user_id)
 
-        response = requests.get(
-            f"{self.endpoint_url}{user_id}",
-            headers=get_auth_header(self.client._api_key),
-        )
-        if response.status_code != 200:
-            raise RecommendApiException(response.text)
-        return User.model_validate(response.json())
+        response = self.client._transport.get(f"{self.endpoint_url}{user_id}")
+        return User.model_validate(response)
 
     def update_user(self, user: User) -> UpdateUserResponse:
         """
         Update a user by ID.
         """
-        response = requests.post(
-            f"{self.endpoint_url}update",
-            json=user.model_dump(),
-            headers=get_auth_header(self.client._api_key),
+        response = self.client._transport.post(
+            f"{self.endpoint_url}update", json=user.model_dump()
         )
+        return UpdateUserResponse.model_validate(response)
+
+    def upsert_users(
+        self,
+        users: Union[Iterable[User], Any],
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        prefer: UPSERT_PREFERENCE = "auto",
+        id_column: str = "id",
+        on_outcome: Optional[UpsertOutcomeCallback] = None,
+    ) -> BulkUpsertUsersResponse:
+        """
+        Create or update every user of `users`, with at most `max_in_flight` requests running
+        concurrently.
+
+        Each user is optimistically created or updated, and the other operation is only tried if
+        the service rejects the first one because the user exists (409) or does not (404), so no
+        `exists` call is needed. With `prefer="auto"` the operation that last succeeded is
+        tried first.
 
-        if response.status_code != 200:
-            raise RecommendApiException(response.text)
-        return UpdateUserResponse.model_validate(response.json())
+        Args:
+            users (Union[Iterable[User], Any]): `User` objects, consumed lazily, or columnar data:
+                a dict of equal length lists, a pyarrow Table or a pandas DataFrame. Rows have an
+                `id_column`, and either a `properties` column or one column per property.
+            on_outcome (Callable[[UserUpsertOutcome], None], optional): Called with the outcome
+                of every user, as they complete.
+
+        Returns:
+            The number of users created, updated and failed, and the failures in input order.
+        """
+        job = _UserUpsertJob(prefer, on_outcome)
+
+        def upsert(indexed_user: Tuple[int, Dict[str, Any]]) -> str:
+            user = indexed_user[1]
+            first, second = job.operations()
+            try:
+                self.client._transport.post(
+                    self.endpoint_url + first, json=user, idempotent=True
+                )
+                operation = first
+            except RecommendApiException as e:
+                if not _is_wrong_guess(e):
+                    raise
+                self.client._transport.post(
+                    self.endpoint_url + second, json=user, idempotent=True
+                )
+                operation = second
+            job.succeeded(operation)
+            return operation
+
+        for (index, user), result in bounded_map(
+            upsert, job.inputs(users, id_column), max_in_flight
+        ):
+            job.record(index, user, result)
+        return job.finish()
 
     def delete_user(self, user_id: Union[str, UUID]) -> DeleteUserResponse:
         """
@@ -148,13 +412,8 @@ class _User:
         if isinstance(user_id, UUID):
             user_id = str(user_id)
 
-        response = requests.delete(
-            f"{self.endpoint_url}{user_id}",
-            headers=get_auth_header(self.client._api_key),
-        )
-        if response.status_code != 200:
-            raise RecommendApiException(response.text)
-        return DeleteUserResponse.model_validate(response.json())
+        response = self.client._transport.delete(f"{self.endpoint_url}{user_id}")
+        return DeleteUserResponse.model_validate(response)
 
     def exists(self, user_id: Union[str, UUID]) -> bool:
         """
@@ -163,13 +422,8 @@ class _User:
         if isinstance(user_id, UUID):
             user_id = str(user_id)
 
-        response = requests.get(
-            f"{self.endpoint_url}exists/{user_id}",
-            headers=get_auth_header(self.client._api_key),
-        )
-        if response.status_code != 200:
-            raise RecommendApiException(response.text)
-        return response.json()
+        response = self.client._transport.get(f"{self.endpoint_url}exists/{user_id}")
+        return response
 
     def delete_all_interactions(
         self,
@@ -181,13 +435,10 @@ class _User:
         if isinstance(user_id, UUID):
             user_id = str(user_id)
 
-        response = requests.delete(
-            f"{self.endpoint_url}{user_id}/interactions",
-            headers=get_auth_header(self.client._api_key),
+        response = self.client._transport.delete(
+            f"{self.endpoint_url}{user_id}/interactions"
         )
-        if response.status_code != 200:
-            raise RecommendApiException(response.text)
-        return DeleteUserResponse.model_validate(response.json())
+        return DeleteUserResponse.model_validate(response)
 
     def delete_interactions_by_property(
         self,
@@ -200,13 +451,10 @@ class _User:
         if isinstance(user_id, UUID):
             user_id = str(user_id)
 
-        response = requests.delete(
-            f"{self.endpoint_url}{user_id}/interactions/{interaction_property_name}",
-            headers=get_auth_header(self.client._api_key),
+        response = self.client._transport.delete(
+            f"{self.endpoint_url}{user_id}/interactions/{interaction_property_name}"
         )
-        if response.status_code != 200:
-            raise RecommendApiException(response.text)
-        return DeleteUserResponse.model_validate(response.json())
+        return DeleteUserResponse.model_validate(response)
 
     def delete_interactions_by_property_and_item(
         self,
@@ -222,10 +470,494 @@ class _User:
         if isinstance(item_id, UUID):
             item_id = str(item_id)
 
-        response = requests.delete(
-            f"{self.endpoint_url}{user_id}/interactions/{interaction_property_name}/{item_id}",
-            headers=get_auth_header(self.client._api_key),
+        response = self.client._transport.delete(
+            f"{self.endpoint_url}{user_id}/interactions/{interaction_property_name}/{item_id}"
+        )
+        return DeleteUserResponse.model_validate(response)
+
+    def delete_users(
+        self,
+        user_ids: Iterable[Union[str, UUID]],
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        on_outcome: Optional[DeleteOutcomeCallback] = None,
+    ) -> BulkDeleteResponse:
+        """
+        Delete every user of `user_ids`, consumed lazily, with at most `max_in_flight` requests
+        running concurrently.
+
+        Users that do not exist are counted in `num_not_found`. A failed deletion does not stop
+        the others, it is reported in `failures`. `on_outcome` is called with the outcome of
+        every user, as they complete.
+        """
+        job = _BulkDeleteJob(on_outcome)
+
+        def delete(indexed_user_id: Tuple[int, Union[str, UUID]]) -> Any:
+            return self.client._transport.delete(
+                self.endpoint_url + str(UUID(str(indexed_user_id[1])))
+            )
+
+        for (index, user_id), result in bounded_map(
+            delete, job.inputs(user_ids), max_in_flight
+        ):
+            job.record(index, user_id, result)
+        return job.finish()
+
+    def delete_interactions_batch(
+        self,
+        targets: Iterable[InteractionTarget],
+        interaction_property_name: Optional[str] = None,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        on_outcome: Optional[DeleteOutcomeCallback] = None,
+    ) -> BulkDeleteResponse:
+        """
+        Delete the interactions of many users, with at most `max_in_flight` requests running
+        concurrently.
+
+        Args:
+            targets (Iterable): Consumed lazily. A user ID deletes all the interactions of the
+                user, or only those of `interaction_property_name` when it is given. A
+                `(user_id, item_id)` pair deletes the interactions of the user with the item
+                for `interaction_property_name`, which is then required. Outcomes of pairs are
+                reported with the `user_id/item_id` ID.
+            on_outcome (Callable[[DeleteOutcome], None], optional): Called with the outcome of
+                every target, as they complete.
+        """
+        job = _BulkDeleteJob(on_outcome)
+
+        def delete(indexed_target: Tuple[int, InteractionTarget]) -> Any:
+            return self.client._transport.delete(
+                self.endpoint_url
+                + interactions_path(indexed_target[1], interaction_property_name)
+            )
+
+        for (index, target), result in bounded_map(
+            delete, job.inputs(targets), max_in_flight
+        ):
+            job.record(index, target, result)
+        return job.finish()
+
+
+class _AsyncUser:
+
+    def __init__(self, client: "AsyncWeaviateRecommendClient"):
+        self.client = client
+        self.endpoint_url = f"{self.client.base_url}/user/"
+
+    async def add_interaction(
+        self,
+        user_id: Union[str, UUID],
+        item_id: Union[str, UUID],
+        interaction_property_name: str,
+        weight: float = 1.0,
+        created_at: Union[str, None] = None,
+    ) -> AddUserInteractionResponse:
+        """
+        Add a user interaction.
+        """
+        if isinstance(user_id, str):
+            user_id = UUID(user_id)
+        if isinstance(item_id, str):
+            item_id = UUID(item_id)
+        if not created_at:
+            created_at = get_datetime()
+        data = {
+            "id": str(user_id),
+            "item_id": str(item_id),
+            "interaction_property_name": interaction_property_name,
+            "weight": weight,
+            "created_at": created_at,
+        }
+
+        response = await self.client._transport.post(self.endpoint_url, json=data)
+        return AddUserInteractionResponse.model_validate(response)
+
+    async def add_interactions(
+        self, interactions: List[UserInteraction]
+    ) -> AddUserInteractionsResponse:
+        """
+        Add multiple user interactions.
+        """
+        data = [interaction.model_dump(mode="json") for interaction in interactions]
+        for interaction in data:
+            if not interaction["created_at"]:
+                interaction["created_at"] = get_datetime()
+        response = await self.client._transport.post(
+            self.endpoint_url + "batch", json=data
+        )
+        return AddUserInteractionsResponse.model_validate(response)
+
+    async def _add_interactions_data(self, data: bytes) -> AddUserInteractionsResponse:
+        # `data` is a serialized JSON array of interactions
+        response = await self.client._transport.post(
+            self.endpoint_url + "batch", data=data
+        )
+        return AddUserInteractionsResponse.model_validate(response)
+
+    async def add_interactions_columnar(
+        self,
+        source: Any,
+        interaction_property_name: Optional[str] = None,
+        user_id_column: str = "user_id",
+        item_id_column: str = "item_id",
+        property_name_column: str = "interaction_property_name",
+        weight_column: str = "weight",
+        created_at_column: str = "created_at",
+        remove_previous_interactions: bool = False,
+        format: Optional[str] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_batch_bytes: int = DEFAULT_MAX_BATCH_BYTES,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+    ) -> AddInteractionsStreamResponse:
+        """
+        Add the rows of a Parquet, CSV or Arrow file, or of a pyarrow Table or pandas DataFrame,
+        as user interactions. Requires pyarrow.
+
+        `interaction_property_name` is used for every row when the source has no property name
+        column. Weights default to 1.0 and creation times to the time the rows are read when
+        their column is missing. Rows are sent in chunks of at most `batch_size` interactions
+        and `max_batch_bytes` bytes, with at most `max_in_flight` chunks being sent
+        concurrently. Rows whose user or item ID is not a UUID are skipped and reported in
+        `invalid_rows`.
+        """
+        from weaviate_recommend import loaders
+
+        async def send(chunk: Tuple[int, "loaders.EncodedChunk"]) -> Any:
+            return await self.client._transport.post(
+                self.endpoint_url + "batch", data=chunk[1][1]
+            )
+
+        response = AddInteractionsStreamResponse(
+            num_interactions_added=0, num_chunks=0, failures=[]
+        )
+        encoded = loaders.encode_interactions(
+            loaders.read_batches(source, format),
+            user_id_column,
+            item_id_column,
+            property_name_column,
+            weight_column,
+            created_at_column,
+            interaction_property_name,
+            remove_previous_interactions,
+            batch_size,
+            max_batch_bytes,
+            response.invalid_rows.extend,
+        )
+        async for (index, (ids, _)), result in async_bounded_map(
+            send, enumerate(encoded), max_in_flight
+        ):
+            response.num_chunks += 1
+            if isinstance(result, Exception):
+                response.failures.append(loaders.chunk_failure(index, ids, result))
+            else:
+                response.num_interactions_added += (
+                    AddUserInteractionsResponse.model_validate(
+                        result
+                    ).num_interactions_added
+                )
+        response.failures.sort(key=lambda failure: failure.chunk_index)
+        return response
+
+    def interaction_buffer(
+        self,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        max_delay: float = DEFAULT_MAX_DELAY,
+        max_queue_size: int = DEFAULT_MAX_QUEUE_SIZE,
+        on_full: ON_FULL_OPTIONS = "block",
+        on_error: Optional[Callable[[Exception, List[UserInteraction]], None]] = None,
+    ) -> AsyncInteractionBuffer:
+        """
+        Create a buffer that queues user interactions and sends them in batches from a background task,
+        taking the requests off the caller's hot path. See `AsyncInteractionBuffer` for the options.
+        """
+        buffer = AsyncInteractionBuffer(
+            self, max_batch_size, max_delay, max_queue_size, on_full, on_error
+        )
+        self.client._background_writers.add(buffer)
+        return buffer
+
+    def interaction_spool(
+        self,
+        directory: str,
+        max_batch_size: int = DEFAULT_SPOOL_BATCH_SIZE,
+        max_delay: float = DEFAULT_MAX_DELAY,
+        segment_bytes: int = DEFAULT_SEGMENT_BYTES,
+        max_bytes: Optional[int] = DEFAULT_MAX_SPOOL_BYTES,
+        on_full: ON_FULL_OPTIONS = "drop",
+        sync_interval: Optional[float] = DEFAULT_SYNC_INTERVAL,
+        on_error: Optional[Callable[[Exception, List[UserInteraction]], None]] = None,
+    ) -> AsyncInteractionSpool:
+        """
+        Create a spool that appends user interactions to a log in `directory` and sends them in
+        batches from a background task. Interactions that were not sent survive crashes and
+        outages of the service. See `AsyncInteractionSpool` for the options.
+        """
+        spool = AsyncInteractionSpool(
+            self,
+            directory,
+            max_batch_size,
+            max_delay,
+            segment_bytes,
+            max_bytes,
+            on_full,
+            sync_interval,
+            on_error,
+        )
+        self.client._background_writers.add(spool)
+        return spool
+
+    async def get_user_interactions(
+        self, user_id: Union[str, UUID]
+    ) -> List[UserInteraction]:
+        """
+        Get all interactions for a user.
+        """
+        if isinstance(user_id, UUID):
+            user_id = str(user_id)
+
+        response = await self.client._transport.get(
+            f"{self.endpoint_url}interactions/{user_id}"
+        )
+        return [
+            UserInteraction(
+                user_id=interaction["id"],
+                item_id=interaction["item_id"],
+                interaction_property_name=interaction["interaction_property_name"],
+                weight=interaction["weight"],
+                created_at=interaction["created_at"],
+            )
+            for interaction in response
+        ]
+
+    async def _stream_interaction_records(
+        self, user_id: Union[str, UUID]
+    ) -> AsyncIterator[Dict[str, Any]]:
+        chunks = self.client._transport.stream(
+            f"{self.endpoint_url}interactions/{user_id}"
+        )
+        async for interaction in aiter_json_array(chunks):
+            yield interaction_record(interaction)
+
+    async def iter_user_interactions(
+        self, user_id: Union[str, UUID]
+    ) -> AsyncIterator[UserInteraction]:
+        """
+        Lazily yield the interactions of a user while they are received, without loading them
+        all in memory, unlike `get_user_interactions`.
+        """
+        async for record in self._stream_interaction_records(user_id):
+            yield UserInteraction(**record)
+
+    async def export_interactions(
+        self,
+        user_ids: Iterable[Union[str, UUID]],
+        sink: Union[Sink, InteractionCallback],
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        checkpoint_path: Optional[str] = None,
+        checkpoint_every: int = DEFAULT_CHECKPOINT_EVERY,
+    ) -> ExportInteractionsResponse:
+        """
+        Stream the interactions of every user of `user_ids` to `sink`, exporting up to
+        `max_in_flight` users concurrently. See `_User.export_interactions`.
+        """
+        job = _InteractionExportJob(sink, checkpoint_path, checkpoint_every)
+
+        async def export(indexed_user_id: Tuple[int, Union[str, UUID]]) -> None:
+            batch: List[Dict[str, Any]] = []
+            async for record in self._stream_interaction_records(indexed_user_id[1]):
+                batch.append(record)
+                if len(batch) >= EXPORT_WRITE_BATCH_SIZE:
+                    job.write(batch)
+                    batch = []
+            if batch:
+                job.write(batch)
+
+        async for (index, user_id), result in async_bounded_map(
+            export, job.inputs(user_ids), max_in_flight
+        ):
+            job.record(index, user_id, result)
+        return job.finish()
+
+    async def create_user(self, user: User) -> CreateUserResponse:
+        """
+        Create a new user in the recommender with the given properties, not including interactions.
+        """
+        response = await self.client._transport.post(
+            f"{self.endpoint_url}create", json=user.model_dump()
+        )
+        return CreateUserResponse.model_validate(response)
+
+    async def get_user(self, user_id: Union[str, UUID]) -> User:
+        """
+        Get all properties for a user by ID.
+        """
+        if isinstance(user_id, UUID):
+            user_id = str(user_id)
+
+        response = await self.client._transport.get(f"{self.endpoint_url}{user_id}")
+        return User.model_validate(response)
+
+    async def update_user(self, user: User) -> UpdateUserResponse:
+        """
+        Update a user by ID.
+        """
+        response = await self.client._transport.post(
+            f"{self.endpoint_url}update", json=user.model_dump()
+        )
+        return UpdateUserResponse.model_validate(response)
+
+    async def upsert_users(
+        self,
+        users: Union[Iterable[User], Any],
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        prefer: UPSERT_PREFERENCE = "auto",
+        id_column: str = "id",
+        on_outcome: Optional[UpsertOutcomeCallback] = None,
+    ) -> BulkUpsertUsersResponse:
+        """
+        The asyncio counterpart of `_User.upsert_users`.
+        """
+        job = _UserUpsertJob(prefer, on_outcome)
+
+        async def upsert(indexed_user: Tuple[int, Dict[str, Any]]) -> str:
+            user = indexed_user[1]
+            first, second = job.operations()
+            try:
+                await self.client._transport.post(
+                    self.endpoint_url + first, json=user, idempotent=True
+                )
+                operation = first
+            except RecommendApiException as e:
+                if not _is_wrong_guess(e):
+                    raise
+                await self.client._transport.post(
+                    self.endpoint_url + second, json=user, idempotent=True
+                )
+                operation = second
+            job.succeeded(operation)
+            return operation
+
+        async for (index, user), result in async_bounded_map(
+            upsert, job.inputs(users, id_column), max_in_flight
+        ):
+            job.record(index, user, result)
+        return job.finish()
+
+    async def delete_user(self, user_id: Union[str, UUID]) -> DeleteUserResponse:
+        """
+        Delete a user by ID.
+        """
+        if isinstance(user_id, UUID):
+            user_id = str(user_id)
+
+        response = await self.client._transport.delete(f"{self.endpoint_url}{user_id}")
+        return DeleteUserResponse.model_validate(response)
+
+    async def exists(self, user_id: Union[str, UUID]) -> bool:
+        """
+        Check if a user exists by ID.
+        """
+        if isinstance(user_id, UUID):
+            user_id = str(user_id)
+
+        response = await self.client._transport.get(
+            f"{self.endpoint_url}exists/{user_id}"
+        )
+        return response
+
+    async def delete_all_interactions(
+        self,
+        user_id: Union[str, UUID],
+    ) -> DeleteUserResponse:
+        """
+        Delete all interactions for a user.
+        """
+        if isinstance(user_id, UUID):
+            user_id = str(user_id)
+
+        response = await self.client._transport.delete(
+            f"{self.endpoint_url}{user_id}/interactions"
+        )
+        return DeleteUserResponse.model_validate(response)
+
+    async def delete_interactions_by_property(
+        self,
+        user_id: Union[str, UUID],
+        interaction_property_name: str,
+    ) -> DeleteUserResponse:
+        """
+        Delete all interactions for a user and a specific property.
+        """
+        if isinstance(user_id, UUID):
+            user_id = str(user_id)
+
+        response = await self.client._transport.delete(
+            f"{self.endpoint_url}{user_id}/interactions/{interaction_property_name}"
+        )
+        return DeleteUserResponse.model_validate(response)
+
+    async def delete_interactions_by_property_and_item(
+        self,
+        user_id: Union[str, UUID],
+        interaction_property_name: str,
+        item_id: Union[str, UUID],
+    ) -> DeleteUserResponse:
+        """
+        Delete specific interactions for a user, property, and item.
+        """
+        if isinstance(user_id, UUID):
+            user_id = str(user_id)
+        if isinstance(item_id, UUID):
+            item_id = str(item_id)
+
+        response = await self.client._transport.delete(
+            f"{self.endpoint_url}{user_id}/interactions/{interaction_property_name}/{item_id}"
         )
-        if response.status_code != 200:
-            raise RecommendApiException(response.text)
-        return DeleteUserResponse.model_validate(response.json())
+        return DeleteUserResponse.model_validate(response)
+
+    async def delete_users(
+        self,
+        user_ids: Iterable[Union[str, UUID]],
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        on_outcome: Optional[DeleteOutcomeCallback] = None,
+    ) -> BulkDeleteResponse:
+        """
+        Delete every user of `user_ids`, consumed lazily, with at most `max_in_flight` requests
+        running concurrently. See `_User.delete_users`.
+        """
+        job = _BulkDeleteJob(on_outcome)
+
+        async def delete(indexed_user_id: Tuple[int, Union[str, UUID]]) -> Any:
+            return await self.client._transport.delete(
+                self.endpoint_url + str(UUID(str(indexed_user_id[1])))
+            )
+
+        async for (index, user_id), result in async_bounded_map(
+            delete, job.inputs(user_ids), max_in_flight
+        ):
+            job.record(index, user_id, result)
+        return job.finish()
+
+    async def delete_interactions_batch(
+        self,
+        targets: Iterable[InteractionTarget],
+        interaction_property_name: Optional[str] = None,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        on_outcome: Optional[DeleteOutcomeCallback] = None,
+    ) -> BulkDeleteResponse:
+        """
+        Delete the interactions of many users, with at most `max_in_flight` requests running
+        concurrently. See `_User.delete_interactions_batch`.
+        """
+        job = _BulkDeleteJob(on_outcome)
+
+        async def delete(indexed_target: Tuple[int, InteractionTarget]) -> Any:
+            return await self.client._transport.delete(
+                self.endpoint_url
+                + interactions_path(indexed_target[1], interaction_property_name)
+            )
+
+        async for (index, target), result in async_bounded_map(
+            delete, job.inputs(targets), max_in_flight
+        ):
+            job.record(index, target, result)
+        return job.finish()
@@ -0,0 +1,120 @@
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    Literal,
+    Optional,
+    Tuple,
+    Union,
+)
+from uuid import UUID
+
+from weaviate_recommend.columnar import is_columnar, iter_rows
+from weaviate_recommend.exceptions import RecommendApiException
+from weaviate_recommend.models.batch import BulkUpsertUsersResponse, UserUpsertOutcome
+from weaviate_recommend.models.data import User
+
+UPSERT_PREFERENCE = Literal["auto", "create", "update"]
+
+UpsertOutcomeCallback = Callable[[UserUpsertOutcome], None]
+
+_OPERATIONS = {"create": "created", "update": "updated"}
+
+
+def _user_record(row: Dict[str, Any], id_column: str) -> Dict[str, Any]:
+    row = dict(row)
+    user_id = row.pop(id_column)
+    # a `properties` column holds all properties, otherwise every other column is one
+    properties = row.pop("properties") if "properties" in row else row
+    return {"id": str(UUID(str(user_id))), "properties": properties}
+
+
+def iter_user_records(users: Any, id_column: str = "id") -> Iterator[Dict[str, Any]]:
+    """
+    Lazily converts `User` objects, or the rows of columnar data, to user request bodies.
+    """
+    if is_columnar(users):
+        for row in iter_rows(users):
+            yield _user_record(row, id_column)
+    else:
+        for user in users:
+            if not isinstance(user, User):
+                raise TypeError(f"expected User objects, got {type(user).__name__}")
+            yield {"id": str(UUID(str(user.id))), "properties": user.properties}
+
+
+# the service rejects creating an existing user with 409, and updating a missing one with 404
+_WRONG_GUESS_STATUS_CODES = frozenset([404, 409])
+
+
+def _is_wrong_guess(error: Exception) -> bool:
+    """
+    Whether a create or update was rejected because the user does or does not exist yet,
+    rather than because of an authentication, validation, transient or server error.
+    """
+    return (
+        isinstance(error, RecommendApiException)
+        and error.status_code in _WRONG_GUESS_STATUS_CODES
+    )
+
+
+class _UserUpsertJob:
+    """
+    Bookkeeping shared by the sync and async user upserts: choosing which operation to try first
+    and aggregating the outcomes.
+
+    Without a way to know whether a user exists, every user is optimistically created or updated,
+    and the other operation is only tried if the first one is rejected. With `prefer="auto"` the
+    operation that last succeeded is tried first, so an import of mostly new, or mostly existing,
+    users costs about one request per user.
+    """
+
+    def __init__(
+        self, prefer: UPSERT_PREFERENCE, on_outcome: Optional[UpsertOutcomeCallback]
+    ):
+        if prefer not in ("auto", "create", "update"):
+            raise ValueError("prefer must be 'auto', 'create' or 'update'")
+        self.prefer = prefer
+        self.on_outcome = on_outcome
+        self._last_success = "create"
+        self.response = BulkUpsertUsersResponse(
+            num_created=0, num_updated=0, num_failed=0, failures=[]
+        )
+
+    def operations(self) -> Tuple[str, str]:
+        first = self._last_success if self.prefer == "auto" else self.prefer
+        return (first, "update" if first == "create" else "create")
+
+    def succeeded(self, operation: str) -> None:
+        self._last_success = operation
+
+    def inputs(
+        self, users: Any, id_column: str
+    ) -> Iterable[Tuple[int, Dict[str, Any]]]:
+        return enumerate(iter_user_records(users, id_column))
+
+    def record(
+        self, index: int, user: Dict[str, Any], result: Union[str, Exception]
+    ) -> None:
+        if isinstance(result, Exception):
+            outcome = UserUpsertOutcome(
+                index=index, user_id=user["id"], operation=None, error=str(result)
+            )
+            self.response.num_failed += 1
+            self.response.failures.append(outcome)
+        else:
+            outcome = UserUpsertOutcome(
+                index=index, user_id=user["id"], operation=_OPERATIONS[result]
+            )
+            if result == "create":
+                self.response.num_created += 1
+            else:
+                self.response.num_updated += 1
+        if self.on_outcome is not None:
+            self.on_outcome(outcome)
+
+    def finish(self) -> BulkUpsertUsersResponse:
+        self.response.failures.sort(key=lambda failure: failure.index)
+        return self.response
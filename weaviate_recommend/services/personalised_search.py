@@ -1,15 +1,18 @@
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple, Union
 from uuid import UUID
 
-import requests
-
-from weaviate_recommend.exceptions import RecommendApiException
-from weaviate_recommend.models.filter import FilterConfig
+from weaviate_recommend.batching import (
+    DEFAULT_MAX_IN_FLIGHT,
+    async_bounded_map,
+    bounded_map,
+)
+from weaviate_recommend.decoding import decode_search_results
+from weaviate_recommend.models.filter import Filters, dump_filters
 from weaviate_recommend.models.responses import PersonalisedSearchResponse
-from weaviate_recommend.utils import get_auth_header
+from weaviate_recommend.models.search import SearchQuery
 
 if TYPE_CHECKING:
-    from weaviate_recommend import WeaviateRecommendClient
+    from weaviate_recommend import AsyncWeaviateRecommendClient, WeaviateRecommendClient
 
 
 class _PersonalisedSearch:
@@ -23,18 +26,89 @@ class _PersonalisedSearch:
         user_id: str | UUID,
         limit: int = 10,
         influence_factor: float = 0.2,
-        filters: list[FilterConfig] | None = None,
+        filters: Optional[Filters] = None,
+        return_properties: Optional[Sequence[str]] = None,
     ) -> PersonalisedSearchResponse:
         """
         Search for text in the Weaviate database and return the results personalised for the user.
+        Only the `return_properties` of the items are returned, when they are set.
         """
         if not isinstance(user_id, UUID):
             user_id = UUID(user_id)
 
-        _filters = (
-            [filter_config.model_dump() for filter_config in filters] if filters else []
+        _filters = dump_filters(filters) if filters else []
+
+        params = {
+            "text": text,
+            "user_id": str(user_id),
+            "limit": limit,
+            "influence_factor": influence_factor,
+            "filters": _filters,
+        }
+        if return_properties is not None:
+            params["return_properties"] = list(return_properties)
+
+        return self.client._transport.post(
+            self.endpoint_url,
+            json=params,
+            idempotent=True,
+            hedge=True,
+            decode=lambda payload: decode_search_results(
+                payload, self.client.decode_mode, return_properties
+            ),
         )
 
+    def search_many(
+        self,
+        queries: Sequence[SearchQuery],
+        max_concurrency: int = DEFAULT_MAX_IN_FLIGHT,
+    ) -> List[Union[PersonalisedSearchResponse, Exception]]:
+        """
+        Run multiple personalised searches concurrently, with at most `max_concurrency` requests
+        in flight. Results are returned in the order of `queries`, a failed query is returned as
+        the exception it raised without failing the other queries.
+        """
+
+        def run(indexed_query: Tuple[int, SearchQuery]) -> PersonalisedSearchResponse:
+            query = indexed_query[1]
+            return self.search(
+                query.text,
+                query.user_id,
+                query.limit,
+                query.influence_factor,
+                query.filters,
+                query.return_properties,
+            )
+
+        results: Dict[int, Union[PersonalisedSearchResponse, Exception]] = {}
+        for (index, _), result in bounded_map(run, enumerate(queries), max_concurrency):
+            results[index] = result
+        return [results[index] for index in range(len(queries))]
+
+
+class _AsyncPersonalisedSearch:
+    def __init__(self, client: "AsyncWeaviateRecommendClient"):
+        self.client = client
+        self.endpoint_url = f"{self.client.base_url}/search/"
+
+    async def search(
+        self,
+        text: str,
+        user_id: str | UUID,
+        limit: int = 10,
+        influence_factor: float = 0.2,
+        filters: Optional[Filters] = None,
+        return_properties: Optional[Sequence[str]] = None,
+    ) -> PersonalisedSearchResponse:
+        """
+        Search for text in the Weaviate database and return the results personalised for the user.
+        Only the `return_properties` of the items are returned, when they are set.
+        """
+        if not isinstance(user_id, UUID):
+            user_id = UUID(user_id)
+
+        _filters = dump_filters(filters) if filters else []
+
         params = {
             "text": text,
             "user_id": str(user_id),
@@ -42,12 +116,46 @@ class _PersonalisedSearch:
             "influence_factor": influence_factor,
             "filters": _filters,
         }
+        if return_properties is not None:
+            params["return_properties"] = list(return_properties)
 
-        response = requests.post(
+        return await self.client._transport.post(
             self.endpoint_url,
             json=params,
-            headers=get_auth_header(self.client._api_key),
+            idempotent=True,
+            hedge=True,
+            decode=lambda payload: decode_search_results(
+                payload, self.client.decode_mode, return_properties
+            ),
         )
-        if response.status_code != 200:
-            raise RecommendApiException(response.text)
-        return PersonalisedSearchResponse.model_validate(response.json())
+
+    async def search_many(
+        self,
+        queries: Sequence[SearchQuery],
+        max_concurrency: int = DEFAULT_MAX_IN_FLIGHT,
+    ) -> List[Union[PersonalisedSearchResponse, Exception]]:
+        """
+        Run multiple personalised searches concurrently, with at most `max_concurrency` requests
+        in flight. Results are returned in the order of `queries`, a failed query is returned as
+        the exception it raised without failing the other queries.
+        """
+
+        async def run(
+            indexed_query: Tuple[int, SearchQuery]
+        ) -> PersonalisedSearchResponse:
+            query = indexed_query[1]
+            return await self.search(
+                query.text,
+                query.user_id,
+                query.limit,
+                query.influence_factor,
+                query.filters,
+                query.return_properties,
+            )
+
+        results: Dict[int, Union[PersonalisedSearchResponse, Exception]] = {}
+        async for (index, _), result in async_bounded_map(
+            run, enumerate(queries), max_concurrency
+        ):
+            results[index] = result
+        return [results[index] for index in range(len(queries))]
@@ -1,9 +1,12 @@
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
-    from weaviate_recommend import WeaviateRecommendClient
+    from weaviate_recommend import AsyncWeaviateRecommendClient, WeaviateRecommendClient
 
-from weaviate_recommend.services.recommendations.item import _ItemRecommendation
+from weaviate_recommend.services.recommendations.item import (
+    _AsyncItemRecommendation,
+    _ItemRecommendation,
+)
 
 
 class _Recommendation:
@@ -12,3 +15,11 @@ class _Recommendation:
         self.endpoint_url = f"{self.client.base_url}/recommendation/"
         self.item = _ItemRecommendation(client)
         self.user = None
+
+
+class _AsyncRecommendation:
+    def __init__(self, client: "AsyncWeaviateRecommendClient"):
+        self.client = client
+        self.endpoint_url = f"{self.client.base_url}/recommendation/"
+        self.item = _AsyncItemRecommendation(client)
+        self.user = None
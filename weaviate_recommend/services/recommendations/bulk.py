@@ -0,0 +1,75 @@
+import itertools
+from typing import Callable, Iterable, Iterator, Optional, Tuple, Union
+from uuid import UUID
+
+from weaviate_recommend.checkpoint import Checkpoint
+from weaviate_recommend.models.batch import BulkRecommendationsResponse
+from weaviate_recommend.models.responses import RecommendationsResponse
+from weaviate_recommend.sinks import Sink
+
+RecommendationCallback = Callable[[str, RecommendationsResponse], None]
+
+DEFAULT_CHECKPOINT_EVERY = 10_000
+
+
+class _BulkRecommendationJob:
+    """
+    Bookkeeping shared by the sync and async bulk recommendation jobs: skipping the inputs
+    completed by a previous run, writing results to the sink and checkpointing progress.
+    """
+
+    def __init__(
+        self,
+        sink: Union[Sink, RecommendationCallback],
+        checkpoint_path: Optional[str],
+        checkpoint_every: int,
+    ):
+        self.sink = sink
+        self.checkpoint = Checkpoint(checkpoint_path, checkpoint_every)
+        self.response = BulkRecommendationsResponse(
+            num_succeeded=0,
+            num_failed=0,
+            num_skipped=self.checkpoint.start,
+            failed_user_ids=[],
+        )
+
+    def inputs(
+        self, user_ids: Iterable[Union[str, UUID]]
+    ) -> Iterator[Tuple[int, Union[str, UUID]]]:
+        return itertools.islice(enumerate(user_ids), self.checkpoint.start, None)
+
+    def record(
+        self,
+        index: int,
+        user_id: Union[str, UUID],
+        result: Union[RecommendationsResponse, Exception],
+    ) -> None:
+        if isinstance(result, Exception):
+            self.response.num_failed += 1
+            self.response.failed_user_ids.append(str(user_id))
+            # transient failures are not marked done, so a resumed job retries them
+            if self.checkpoint.mark_failed(index, str(user_id), result):
+                self._save()
+        else:
+            if isinstance(self.sink, Sink):
+                self.sink.write(
+                    {
+                        "user_id": str(user_id),
+                        "recommendations": result.model_dump()["recommendations"],
+                    }
+                )
+            else:
+                self.sink(str(user_id), result)
+            self.response.num_succeeded += 1
+            if self.checkpoint.mark_done(index):
+                self._save()
+
+    def _save(self) -> None:
+        # results must be persisted before the checkpoint claims they are done
+        if isinstance(self.sink, Sink):
+            self.sink.flush()
+        self.checkpoint.save()
+
+    def finish(self) -> BulkRecommendationsResponse:
+        self._save()
+        return self.response
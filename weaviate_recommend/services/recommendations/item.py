@@ -1,15 +1,42 @@
-from typing import TYPE_CHECKING, List, Union
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 from uuid import UUID
 
-import requests
-
-from weaviate_recommend.exceptions import RecommendApiException
-from weaviate_recommend.models.filter import FilterConfig
+from weaviate_recommend.batching import (
+    DEFAULT_MAX_IN_FLIGHT,
+    RateLimiter,
+    async_bounded_map,
+    bounded_map,
+)
+from weaviate_recommend.cache import make_cache_key
+from weaviate_recommend.decoding import decode_recommendations
+from weaviate_recommend.models.batch import BulkRecommendationsResponse
+from weaviate_recommend.models.filter import Filters, dump_filters
 from weaviate_recommend.models.responses import RecommendationsResponse
-from weaviate_recommend.utils import get_auth_header
+from weaviate_recommend.services.recommendations.bulk import (
+    DEFAULT_CHECKPOINT_EVERY,
+    RecommendationCallback,
+    _BulkRecommendationJob,
+)
+from weaviate_recommend.sinks import Sink
 
 if TYPE_CHECKING:
-    from weaviate_recommend import WeaviateRecommendClient
+    from weaviate_recommend import AsyncWeaviateRecommendClient, WeaviateRecommendClient
+
+# recommendations based on items only change when the recommender is retrained, the ones
+# based on users also change with every new interaction, so they are never cached
+CACHEABLE_ENDPOINTS = frozenset(
+    ["item", "items", "item/configured", "items/configured"]
+)
 
 
 class _ItemRecommendation:
@@ -18,24 +45,81 @@ class _ItemRecommendation:
         self.client = client
         self.endpoint_url = f"{self.client.base_url}/item-recommendations/"
 
+    def _recommend(
+        self,
+        endpoint: str,
+        params: Dict[str, Any],
+        return_properties: Optional[Sequence[str]] = None,
+    ) -> RecommendationsResponse:
+        if return_properties is not None:
+            # sent along so the service can project, and part of the cache key
+            params["return_properties"] = list(return_properties)
+        cache = self.client.recommendation_cache
+        key = None
+        if cache is not None and endpoint in CACHEABLE_ENDPOINTS:
+            key = make_cache_key(endpoint, params)
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+        single_flight = self.client._single_flight
+        if single_flight is None or params.get("shuffle"):
+            # every caller of a shuffled call expects its own order
+            return self._fetch(endpoint, params, key)
+        key = key or make_cache_key(endpoint, params)
+        return single_flight.do(key, lambda: self._fetch(endpoint, params, key))
+
+    def _fetch(
+        self, endpoint: str, params: Dict[str, Any], key: Optional[str]
+    ) -> RecommendationsResponse:
+        url = self.endpoint_url + endpoint
+        cache = self.client.recommendation_cache
+        # read before sending, a response requested before training must not be cached after it
+        generation = cache.generation if cache is not None else None
+        fallback = self.client.recommendation_fallback
+        stale = False
+
+        def decode(payload: Dict[str, Any]) -> RecommendationsResponse:
+            return decode_recommendations(
+                payload, self.client.decode_mode, params.get("return_properties")
+            )
+
+        if fallback is None:
+            recommendations = self.client._transport.post(
+                url, json=params, idempotent=True, hedge=True, decode=decode
+            )
+        else:
+            # the fallback stores the JSON body, it is decoded after the call
+            response, stale = fallback.fetch(
+                key or make_cache_key(endpoint, params),
+                lambda: self.client._transport.post(
+                    url, json=params, idempotent=True, hedge=True
+                ),
+            )
+            recommendations = decode(response)
+        # a stale response would outlive the outage it was served for
+        if cache is not None and endpoint in CACHEABLE_ENDPOINTS and not stale:
+            cache.put(
+                key or make_cache_key(endpoint, params), recommendations, generation
+            )
+        return recommendations
+
     def from_item(
         self,
         item_id: Union[str, UUID],
         limit: int = 10,
         remove_reference: bool = False,
-        filters: List[FilterConfig] | None = None,
+        filters: Optional[Filters] = None,
+        return_properties: Optional[Sequence[str]] = None,
     ) -> RecommendationsResponse:
         """
         Get recommendations for a single item.
+        Only the `return_properties` of the items are returned, when they are set.
         """
         # if uuid is a string, convert it to a UUID object
         if isinstance(item_id, str):
             item_id = UUID(item_id)
 
-        if filters:
-            _filters = [filter_config.model_dump() for filter_config in filters]
-        else:
-            _filters = None
+        _filters = dump_filters(filters) if filters else None
 
         params = {
             "id": str(item_id),
@@ -43,24 +127,19 @@ class _ItemRecommendation:
             "remove_reference": remove_reference,
             "filters": _filters,
         }
-        response = requests.post(
-            self.endpoint_url + "item",
-            json=params,
-            headers=get_auth_header(self.client._api_key),
-        )
-        if response.status_code != 200:
-            raise RecommendApiException(response.text)
-        return RecommendationsResponse.model_validate(response.json())
+        return self._recommend("item", params, return_properties)
 
     def from_items(
         self,
         item_ids: list[UUID | str],
         limit: int = 10,
         remove_reference: bool = True,
-        filters: list[FilterConfig] | None = None,
+        filters: Optional[Filters] = None,
+        return_properties: Optional[Sequence[str]] = None,
     ) -> RecommendationsResponse:
         """
         Get recommendations for multiple items.
+        Only the `return_properties` of the items are returned, when they are set.
         """
 
         item_ids = [
@@ -68,10 +147,7 @@ class _ItemRecommendation:
             for item_id in item_ids
         ]
 
-        if filters:
-            _filters = [filter_config.model_dump() for filter_config in filters]
-        else:
-            _filters = None
+        _filters = dump_filters(filters) if filters else None
 
         params = {
             "ids": item_ids,
@@ -79,14 +155,7 @@ class _ItemRecommendation:
             "remove_reference": remove_reference,
             "filters": _filters,
         }
-        response = requests.post(
-            self.endpoint_url + "items",
-            json=params,
-            headers=get_auth_header(self.client._api_key),
-        )
-        if response.status_code != 200:
-            raise RecommendApiException(response.text)
-        return RecommendationsResponse.model_validate(response.json())
+        return self._recommend("items", params, return_properties)
 
     def from_item_configured(
         self,
@@ -94,9 +163,11 @@ class _ItemRecommendation:
         item_id: Union[str, UUID],
         limit: int = 10,
         remove_reference: bool = True,
+        return_properties: Optional[Sequence[str]] = None,
     ) -> RecommendationsResponse:
         """
         Get recommendations for a given item based on a configured endpoint.
+        Only the `return_properties` of the items are returned, when they are set.
         """
         if isinstance(item_id, str):
             item_id = UUID(item_id)
@@ -108,14 +179,7 @@ class _ItemRecommendation:
             "remove_reference": remove_reference,
         }
 
-        response = requests.post(
-            self.endpoint_url + "item/configured",
-            json=params,
-            headers=get_auth_header(self.client._api_key),
-        )
-        if response.status_code != 200:
-            raise RecommendApiException(response.text)
-        return RecommendationsResponse.model_validate(response.json())
+        return self._recommend("item/configured", params, return_properties)
 
     def from_items_configured(
         self,
@@ -123,9 +187,11 @@ class _ItemRecommendation:
         item_ids: List[Union[str, UUID]],
         limit: int = 10,
         remove_reference: bool = True,
+        return_properties: Optional[Sequence[str]] = None,
     ) -> RecommendationsResponse:
         """
         Get recommendations for multiple items based on a configured endpoint.
+        Only the `return_properties` of the items are returned, when they are set.
         """
         item_ids = [
             str(UUID(item_id)) if isinstance(item_id, str) else str(item_id)
@@ -139,14 +205,7 @@ class _ItemRecommendation:
             "remove_reference": remove_reference,
         }
 
-        response = requests.post(
-            self.endpoint_url + "items/configured",
-            json=params,
-            headers=get_auth_header(self.client._api_key),
-        )
-        if response.status_code != 200:
-            raise RecommendApiException(response.text)
-        return RecommendationsResponse.model_validate(response.json())
+        return self._recommend("items/configured", params, return_properties)
 
     def from_user(
         self,
@@ -155,9 +214,11 @@ class _ItemRecommendation:
         remove_reference: bool = True,
         shuffle: bool = True,
         top_n_interactions: int = 100,
+        return_properties: Optional[Sequence[str]] = None,
     ) -> RecommendationsResponse:
         """
         Get recommendations for a given user.
+        Only the `return_properties` of the items are returned, when they are set.
         """
         if isinstance(user_id, str):
             user_id = UUID(user_id)
@@ -168,23 +229,18 @@ class _ItemRecommendation:
             "shuffle": shuffle,
             "top_n_interactions": top_n_interactions,
         }
-        response = requests.post(
-            self.endpoint_url + "user",
-            json=params,
-            headers=get_auth_header(self.client._api_key),
-        )
-        if response.status_code != 200:
-            raise RecommendApiException(response.text)
-        return RecommendationsResponse.model_validate(response.json())
+        return self._recommend("user", params, return_properties)
 
     def from_users(
         self,
         user_ids: list[UUID | str],
         limit: int = 10,
         remove_reference: bool = True,
+        return_properties: Optional[Sequence[str]] = None,
     ) -> RecommendationsResponse:
         """
         Get recommendations for multiple users.
+        Only the `return_properties` of the items are returned, when they are set.
         """
         user_ids = [
             str(UUID(user_id)) if isinstance(user_id, str) else str(user_id)
@@ -195,11 +251,343 @@ class _ItemRecommendation:
             "limit": limit,
             "remove_reference": remove_reference,
         }
-        response = requests.post(
-            self.endpoint_url + "users",
-            json=params,
-            headers=get_auth_header(self.client._api_key),
+        return self._recommend("users", params, return_properties)
+
+    def from_user_bulk(
+        self,
+        user_ids: Iterable[Union[str, UUID]],
+        sink: Union[Sink, RecommendationCallback],
+        limit: int = 10,
+        remove_reference: bool = True,
+        shuffle: bool = True,
+        top_n_interactions: int = 100,
+        max_concurrency: int = DEFAULT_MAX_IN_FLIGHT,
+        max_requests_per_second: Optional[float] = None,
+        checkpoint_path: Optional[str] = None,
+        checkpoint_every: int = DEFAULT_CHECKPOINT_EVERY,
+        return_properties: Optional[Sequence[str]] = None,
+    ) -> BulkRecommendationsResponse:
+        """
+        Get recommendations for every user of `user_ids`, with `from_user` calls running
+        concurrently, and stream them to `sink`.
+
+        Args:
+            user_ids (Iterable[Union[str, UUID]]): The users, consumed lazily.
+            sink (Union[Sink, Callable[[str, RecommendationsResponse], None]]): A `JsonlSink`,
+                a `ParquetSink`, or a callback called with each user ID and its recommendations.
+            max_concurrency (int, optional): Maximum number of requests in flight. Defaults to 4.
+            max_requests_per_second (float, optional): Maximum request rate. Defaults to None.
+            checkpoint_path (str, optional): File the progress is saved to every
+                `checkpoint_every` users. When it exists, the users completed by the previous
+                run are skipped, which requires `user_ids` to be in the same order. Users that
+                completed after the last checkpoint are sent to the sink again. The checkpoint
+                only stops at a user that failed with a transient error, like a 5xx, so
+                resuming retries it. The IDs of the users that failed for good, like a 404,
+                are appended to `checkpoint_path + ".failed"`.
+            return_properties (Sequence[str], optional): Properties of the recommended items
+                to return, see `from_user`. Defaults to None, returning every property.
+
+        Returns:
+            The number of users that succeeded, failed or were skipped, and the failed user IDs.
+        """
+        job = _BulkRecommendationJob(sink, checkpoint_path, checkpoint_every)
+        limiter = (
+            RateLimiter(max_requests_per_second) if max_requests_per_second else None
         )
-        if response.status_code != 200:
-            raise RecommendApiException(response.text)
-        return RecommendationsResponse.model_validate(response.json())
+
+        def recommend(
+            indexed_user_id: Tuple[int, Union[str, UUID]]
+        ) -> RecommendationsResponse:
+            if limiter is not None:
+                limiter.acquire()
+            return self.from_user(
+                indexed_user_id[1],
+                limit,
+                remove_reference,
+                shuffle,
+                top_n_interactions,
+                return_properties=return_properties,
+            )
+
+        for (index, user_id), result in bounded_map(
+            recommend, job.inputs(user_ids), max_concurrency
+        ):
+            job.record(index, user_id, result)
+        return job.finish()
+
+
+class _AsyncItemRecommendation:
+
+    def __init__(self, client: "AsyncWeaviateRecommendClient"):
+        self.client = client
+        self.endpoint_url = f"{self.client.base_url}/item-recommendations/"
+
+    async def _recommend(
+        self,
+        endpoint: str,
+        params: Dict[str, Any],
+        return_properties: Optional[Sequence[str]] = None,
+    ) -> RecommendationsResponse:
+        if return_properties is not None:
+            # sent along so the service can project, and part of the cache key
+            params["return_properties"] = list(return_properties)
+        cache = self.client.recommendation_cache
+        key = None
+        if cache is not None and endpoint in CACHEABLE_ENDPOINTS:
+            key = make_cache_key(endpoint, params)
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+        single_flight = self.client._single_flight
+        if single_flight is None or params.get("shuffle"):
+            # every caller of a shuffled call expects its own order
+            return await self._fetch(endpoint, params, key)
+        key = key or make_cache_key(endpoint, params)
+        return await single_flight.do(key, lambda: self._fetch(endpoint, params, key))
+
+    async def _fetch(
+        self, endpoint: str, params: Dict[str, Any], key: Optional[str]
+    ) -> RecommendationsResponse:
+        url = self.endpoint_url + endpoint
+        cache = self.client.recommendation_cache
+        # read before sending, a response requested before training must not be cached after it
+        generation = cache.generation if cache is not None else None
+        fallback = self.client.recommendation_fallback
+        stale = False
+
+        def decode(payload: Dict[str, Any]) -> RecommendationsResponse:
+            return decode_recommendations(
+                payload, self.client.decode_mode, params.get("return_properties")
+            )
+
+        if fallback is None:
+            recommendations = await self.client._transport.post(
+                url, json=params, idempotent=True, hedge=True, decode=decode
+            )
+        else:
+            # the fallback stores the JSON body, it is decoded after the call
+            response, stale = await fallback.afetch(
+                key or make_cache_key(endpoint, params),
+                lambda: self.client._transport.post(
+                    url, json=params, idempotent=True, hedge=True
+                ),
+            )
+            recommendations = decode(response)
+        # a stale response would outlive the outage it was served for
+        if cache is not None and endpoint in CACHEABLE_ENDPOINTS and not stale:
+            cache.put(
+                key or make_cache_key(endpoint, params), recommendations, generation
+            )
+        return recommendations
+
+    async def from_item(
+        self,
+        item_id: Union[str, UUID],
+        limit: int = 10,
+        remove_reference: bool = False,
+        filters: Optional[Filters] = None,
+        return_properties: Optional[Sequence[str]] = None,
+    ) -> RecommendationsResponse:
+        """
+        Get recommendations for a single item.
+        Only the `return_properties` of the items are returned, when they are set.
+        """
+        # if uuid is a string, convert it to a UUID object
+        if isinstance(item_id, str):
+            item_id = UUID(item_id)
+
+        _filters = dump_filters(filters) if filters else None
+
+        params = {
+            "id": str(item_id),
+            "limit": limit,
+            "remove_reference": remove_reference,
+            "filters": _filters,
+        }
+        return await self._recommend("item", params, return_properties)
+
+    async def from_items(
+        self,
+        item_ids: list[UUID | str],
+        limit: int = 10,
+        remove_reference: bool = True,
+        filters: Optional[Filters] = None,
+        return_properties: Optional[Sequence[str]] = None,
+    ) -> RecommendationsResponse:
+        """
+        Get recommendations for multiple items.
+        Only the `return_properties` of the items are returned, when they are set.
+        """
+
+        item_ids = [
+            str(UUID(item_id)) if isinstance(item_id, str) else str(item_id)
+            for item_id in item_ids
+        ]
+
+        _filters = dump_filters(filters) if filters else None
+
+        params = {
+            "ids": item_ids,
+            "limit": limit,
+            "remove_reference": remove_reference,
+            "filters": _filters,
+        }
+        return await self._recommend("items", params, return_properties)
+
+    async def from_item_configured(
+        self,
+        endpoint_name: str,
+        item_id: Union[str, UUID],
+        limit: int = 10,
+        remove_reference: bool = True,
+        return_properties: Optional[Sequence[str]] = None,
+    ) -> RecommendationsResponse:
+        """
+        Get recommendations for a given item based on a configured endpoint.
+        Only the `return_properties` of the items are returned, when they are set.
+        """
+        if isinstance(item_id, str):
+            item_id = UUID(item_id)
+
+        params = {
+            "configured_endpoint_name": endpoint_name,
+            "id": str(item_id),
+            "limit": limit,
+            "remove_reference": remove_reference,
+        }
+
+        return await self._recommend("item/configured", params, return_properties)
+
+    async def from_items_configured(
+        self,
+        endpoint_name: str,
+        item_ids: List[Union[str, UUID]],
+        limit: int = 10,
+        remove_reference: bool = True,
+        return_properties: Optional[Sequence[str]] = None,
+    ) -> RecommendationsResponse:
+        """
+        Get recommendations for multiple items based on a configured endpoint.
+        Only the `return_properties` of the items are returned, when they are set.
+        """
+        item_ids = [
+            str(UUID(item_id)) if isinstance(item_id, str) else str(item_id)
+            for item_id in item_ids
+        ]
+
+        params = {
+            "configured_endpoint_name": endpoint_name,
+            "ids": item_ids,
+            "limit": limit,
+            "remove_reference": remove_reference,
+        }
+
+        return await self._recommend("items/configured", params, return_properties)
+
+    async def from_user(
+        self,
+        user_id: Union[str, UUID],
+        limit: int = 10,
+        remove_reference: bool = True,
+        shuffle: bool = True,
+        top_n_interactions: int = 100,
+        return_properties: Optional[Sequence[str]] = None,
+    ) -> RecommendationsResponse:
+        """
+        Get recommendations for a given user.
+        Only the `return_properties` of the items are returned, when they are set.
+        """
+        if isinstance(user_id, str):
+            user_id = UUID(user_id)
+        params = {
+            "user_id": str(user_id),
+            "limit": limit,
+            "remove_reference": remove_reference,
+            "shuffle": shuffle,
+            "top_n_interactions": top_n_interactions,
+        }
+        return await self._recommend("user", params, return_properties)
+
+    async def from_users(
+        self,
+        user_ids: list[UUID | str],
+        limit: int = 10,
+        remove_reference: bool = True,
+        return_properties: Optional[Sequence[str]] = None,
+    ) -> RecommendationsResponse:
+        """
+        Get recommendations for multiple users.
+        Only the `return_properties` of the items are returned, when they are set.
+        """
+        user_ids = [
+            str(UUID(user_id)) if isinstance(user_id, str) else str(user_id)
+            for user_id in user_ids
+        ]
+        params = {
+            "user_ids": user_ids,
+            "limit": limit,
+            "remove_reference": remove_reference,
+        }
+        return await self._recommend("users", params, return_properties)
+
+    async def from_user_bulk(
+        self,
+        user_ids: Iterable[Union[str, UUID]],
+        sink: Union[Sink, RecommendationCallback],
+        limit: int = 10,
+        remove_reference: bool = True,
+        shuffle: bool = True,
+        top_n_interactions: int = 100,
+        max_concurrency: int = DEFAULT_MAX_IN_FLIGHT,
+        max_requests_per_second: Optional[float] = None,
+        checkpoint_path: Optional[str] = None,
+        checkpoint_every: int = DEFAULT_CHECKPOINT_EVERY,
+        return_properties: Optional[Sequence[str]] = None,
+    ) -> BulkRecommendationsResponse:
+        """
+        Get recommendations for every user of `user_ids`, with `from_user` calls running
+        concurrently, and stream them to `sink`.
+
+        Args:
+            user_ids (Iterable[Union[str, UUID]]): The users, consumed lazily.
+            sink (Union[Sink, Callable[[str, RecommendationsResponse], None]]): A `JsonlSink`,
+                a `ParquetSink`, or a callback called with each user ID and its recommendations.
+            max_concurrency (int, optional): Maximum number of requests in flight. Defaults to 4.
+            max_requests_per_second (float, optional): Maximum request rate. Defaults to None.
+            checkpoint_path (str, optional): File the progress is saved to every
+                `checkpoint_every` users. When it exists, the users completed by the previous
+                run are skipped, which requires `user_ids` to be in the same order. Users that
+                completed after the last checkpoint are sent to the sink again. The checkpoint
+                only stops at a user that failed with a transient error, like a 5xx, so
+                resuming retries it. The IDs of the users that failed for good, like a 404,
+                are appended to `checkpoint_path + ".failed"`.
+            return_properties (Sequence[str], optional): Properties of the recommended items
+                to return, see `from_user`. Defaults to None, returning every property.
+
+        Returns:
+            The number of users that succeeded, failed or were skipped, and the failed user IDs.
+        """
+        job = _BulkRecommendationJob(sink, checkpoint_path, checkpoint_every)
+        limiter = (
+            RateLimiter(max_requests_per_second) if max_requests_per_second else None
+        )
+
+        async def recommend(
+            indexed_user_id: Tuple[int, Union[str, UUID]]
+        ) -> RecommendationsResponse:
+            if limiter is not None:
+                await limiter.acquire_async()
+            return await self.from_user(
+                indexed_user_id[1],
+                limit,
+                remove_reference,
+                shuffle,
+                top_n_interactions,
+                return_properties=return_properties,
+            )
+
+        async for (index, user_id), result in async_bounded_map(
+            recommend, job.inputs(user_ids), max_concurrency
+        ):
+            job.record(index, user_id, result)
+        return job.finish()
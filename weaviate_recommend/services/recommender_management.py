@@ -1,18 +1,15 @@
 from typing import TYPE_CHECKING, Dict, List, Union
 
-import requests
-from weaviate.classes.config import DataType
-
-from weaviate_recommend.exceptions import RecommendApiException
 from weaviate_recommend.models.responses import (
     CreateRecommenderResponse,
     DeleteRecommenderResponse,
     RecommenderDetailsResponse,
 )
-from weaviate_recommend.utils import get_auth_header
 
 if TYPE_CHECKING:
-    from weaviate_recommend import WeaviateRecommendClient
+    from weaviate.classes.config import DataType
+
+    from weaviate_recommend import AsyncWeaviateRecommendClient, WeaviateRecommendClient
 
 
 class _RecommenderManagement:
@@ -24,8 +21,8 @@ class _RecommenderManagement:
     def create(
         self,
         name: str,
-        properties: Dict[str, DataType],
-        user_properties: Dict[str, DataType],
+        properties: Dict[str, "DataType"],
+        user_properties: Dict[str, "DataType"],
         user_interaction_property_names: List[str],
         text_search_property_name: Union[str, List[str], None] = None,
         trainable_properties: Union[List[str], None] = None,
@@ -42,33 +39,68 @@ class _RecommenderManagement:
             "trainable_properties": trainable_properties,
         }
 
-        response = requests.post(
-            self.endpoint_url,
-            json=params,
-            headers=get_auth_header(self.client._api_key),
-        )
-        if response.status_code != 200:
-            raise RecommendApiException(response.text)
-        return CreateRecommenderResponse.model_validate(response.json())
+        response = self.client._transport.post(self.endpoint_url, json=params)
+        return CreateRecommenderResponse.model_validate(response)
 
     def delete(self):
         """
         Deletes the recommender.
         """
-        response = requests.delete(
-            self.endpoint_url, headers=get_auth_header(self.client._api_key)
-        )
-        if response.status_code != 200:
-            raise RecommendApiException(response.text)
-        return DeleteRecommenderResponse.model_validate(response.json())
+        response = self.client._transport.delete(self.endpoint_url)
+        return DeleteRecommenderResponse.model_validate(response)
 
     def details(self):
         """
         Get details about the recommender.
         """
-        response = requests.get(
-            self.endpoint_url + "details", headers=get_auth_header(self.client._api_key)
-        )
-        if response.status_code != 200:
-            raise RecommendApiException(response.text)
-        return RecommenderDetailsResponse.model_validate(response.json())
+        response = self.client._transport.get(self.endpoint_url + "details")
+        details = RecommenderDetailsResponse.model_validate(response)
+        self.client._observe_training_state(details.training_state)
+        return details
+
+
+class _AsyncRecommenderManagement:
+
+    def __init__(self, client: "AsyncWeaviateRecommendClient"):
+        self.client = client
+        self.endpoint_url = f"{self.client.base_url}/recommender/"
+
+    async def create(
+        self,
+        name: str,
+        properties: Dict[str, "DataType"],
+        user_properties: Dict[str, "DataType"],
+        user_interaction_property_names: List[str],
+        text_search_property_name: Union[str, List[str], None] = None,
+        trainable_properties: Union[List[str], None] = None,
+    ) -> CreateRecommenderResponse:
+        """
+        Creates a new recommender.
+        """
+        params = {
+            "collection_name": name,
+            "properties": properties,
+            "user_properties": user_properties,
+            "user_interaction_property_names": user_interaction_property_names,
+            "text_search_property_name": text_search_property_name,
+            "trainable_properties": trainable_properties,
+        }
+
+        response = await self.client._transport.post(self.endpoint_url, json=params)
+        return CreateRecommenderResponse.model_validate(response)
+
+    async def delete(self):
+        """
+        Deletes the recommender.
+        """
+        response = await self.client._transport.delete(self.endpoint_url)
+        return DeleteRecommenderResponse.model_validate(response)
+
+    async def details(self):
+        """
+        Get details about the recommender.
+        """
+        response = await self.client._transport.get(self.endpoint_url + "details")
+        details = RecommenderDetailsResponse.model_validate(response)
+        self.client._observe_training_state(details.training_state)
+        return details
@@ -1,16 +1,231 @@
-from typing import TYPE_CHECKING
-
-import requests
+import hashlib
+import threading
+import time
+import weakref
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Awaitable,
+    Callable,
+    MutableMapping,
+    Optional,
+    Tuple,
+)
 
-from weaviate_recommend.exceptions import RecommendApiException
+from weaviate_recommend.exceptions import TrainingFailedException
 from weaviate_recommend.models.responses import (
     TrainingStatusResponse,
     TrainRecommenderResponse,
 )
-from weaviate_recommend.utils import get_auth_header
 
 if TYPE_CHECKING:
-    from weaviate_recommend import WeaviateRecommendClient
+    import asyncio
+
+    from weaviate_recommend import AsyncWeaviateRecommendClient, WeaviateRecommendClient
+
+DEFAULT_POLL_INTERVAL = 1.0
+DEFAULT_MAX_POLL_INTERVAL = 30.0
+# growth of the polling interval while the training state does not change
+POLL_BACKOFF = 1.5
+
+TrainingProgressCallback = Callable[[TrainingStatusResponse, float], None]
+
+
+class _PollSchedule:
+    """
+    Adaptive polling intervals: they grow exponentially while the training state is unchanged,
+    and start over from `initial` when it changes.
+    """
+
+    def __init__(self, initial: float, maximum: float, timeout: Optional[float]):
+        if initial <= 0 or maximum < initial:
+            raise ValueError("poll intervals must be positive, and initial <= maximum")
+        self.initial = initial
+        self.maximum = maximum
+        self.interval = initial
+        self.start = time.monotonic()
+        self.deadline = self.start + timeout if timeout is not None else None
+        self._state: Optional[str] = None
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.start
+
+    def next_delay(self, status: TrainingStatusResponse) -> float:
+        """
+        Seconds to wait before the next poll, the last one happens at the deadline.
+
+        Raises:
+            TimeoutError: If the deadline has passed.
+        """
+        if status.status != self._state:
+            self._state = status.status
+            self.interval = self.initial
+        else:
+            self.interval = min(self.maximum, self.interval * POLL_BACKOFF)
+        if self.deadline is None:
+            return self.interval
+        remaining = self.deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError(
+                f"The recommender is still {status.status} after {self.elapsed():.1f}s"
+            )
+        return min(self.interval, remaining)
+
+
+def _is_trained(status: TrainingStatusResponse) -> bool:
+    if status.status == "error":
+        raise TrainingFailedException("The recommender training failed")
+    return status.status == "trained"
+
+
+def _status_key(recommender_url: str, api_key: str) -> Tuple[str, str]:
+    # the API key is hashed, so it is not kept in plain text for the life of the process
+    return recommender_url, hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+
+
+class _SharedTrainingStatus:
+    """
+    The last training status of a recommender, shared by every thread of the process waiting
+    for it with the same API key, so that a single request polls the service at a time. An
+    instance is dropped once no thread waits for it anymore.
+    """
+
+    _instances: (
+        "weakref.WeakValueDictionary[Tuple[str, str], _SharedTrainingStatus]"
+    ) = weakref.WeakValueDictionary()
+    _instances_lock = threading.Lock()
+
+    def __init__(self) -> None:
+        self._condition = threading.Condition()
+        self._status: Optional[TrainingStatusResponse] = None
+        self._polled_at = 0.0
+        self._polling = False
+        self._version = 0
+        # bumped by `invalidate`, the statuses of polls sent before it are dropped
+        self._generation = 0
+
+    @classmethod
+    def of(cls, recommender_url: str, api_key: str) -> "_SharedTrainingStatus":
+        key = _status_key(recommender_url, api_key)
+        with cls._instances_lock:
+            instance = cls._instances.get(key)
+            if instance is None:
+                instance = cls._instances[key] = cls()
+            return instance
+
+    def invalidate(self) -> None:
+        with self._condition:
+            self._status = None
+            self._generation += 1
+
+    def fetch(
+        self, poll: Callable[[], TrainingStatusResponse], max_age: float
+    ) -> TrainingStatusResponse:
+        """
+        Returns a status polled at most `max_age` seconds ago, waits for the poll in flight if
+        there is one, and only polls the service otherwise.
+        """
+        while True:
+            with self._condition:
+                if (
+                    self._status is not None
+                    and time.monotonic() - self._polled_at <= max_age
+                ):
+                    return self._status
+                if self._polling:
+                    version = self._version
+                    while self._polling:
+                        self._condition.wait()
+                    if self._version != version and self._status is not None:
+                        return self._status
+                    # the poll failed, or was sent before an invalidation, try again
+                    continue
+                self._polling = True
+                started = time.monotonic()
+                generation = self._generation
+            status = None
+            current = False
+            try:
+                status = poll()
+            finally:
+                with self._condition:
+                    current = generation == self._generation
+                    if status is not None and current:
+                        self._status, self._polled_at = status, started
+                        self._version += 1
+                    self._polling = False
+                    self._condition.notify_all()
+            if current:
+                return status
+
+
+class _AsyncSharedTrainingStatus:
+    """
+    The asyncio counterpart of `_SharedTrainingStatus`, shared by the coroutines of an event
+    loop waiting for a recommender.
+    """
+
+    _instances: "MutableMapping[asyncio.AbstractEventLoop, MutableMapping[Tuple[str, str], Any]]" = (weakref.WeakKeyDictionary())
+
+    def __init__(self) -> None:
+        self._status: Optional[TrainingStatusResponse] = None
+        self._polled_at = 0.0
+        self._poll: Optional["asyncio.Future[TrainingStatusResponse]"] = None
+        self._generation = 0
+
+    @classmethod
+    def of(cls, recommender_url: str, api_key: str) -> "_AsyncSharedTrainingStatus":
+        import asyncio
+
+        key = _status_key(recommender_url, api_key)
+        instances = cls._instances.setdefault(
+            asyncio.get_running_loop(), weakref.WeakValueDictionary()
+        )
+        instance: Optional[_AsyncSharedTrainingStatus] = instances.get(key)
+        if instance is None:
+            instance = instances[key] = cls()
+        return instance
+
+    def invalidate(self) -> None:
+        self._status = None
+        self._generation += 1
+        # the next fetch polls again rather than waiting for the outdated poll
+        self._poll = None
+
+    async def _polled(
+        self, poll: Callable[[], Awaitable[TrainingStatusResponse]]
+    ) -> TrainingStatusResponse:
+        started = time.monotonic()
+        generation = self._generation
+        poll_task = self._poll
+        try:
+            status = await poll()
+            if generation == self._generation:
+                self._status, self._polled_at = status, started
+            return status
+        finally:
+            if self._poll is poll_task:
+                self._poll = None
+
+    async def fetch(
+        self, poll: Callable[[], Awaitable[TrainingStatusResponse]], max_age: float
+    ) -> TrainingStatusResponse:
+        import asyncio
+
+        while True:
+            if (
+                self._status is not None
+                and time.monotonic() - self._polled_at <= max_age
+            ):
+                return self._status
+            if self._poll is None:
+                self._poll = asyncio.ensure_future(self._polled(poll))
+            generation = self._generation
+            # a cancelled waiter must not cancel the poll shared with the other waiters
+            status = await asyncio.shield(self._poll)
+            if generation == self._generation:
+                return status
+            # training was started during the poll, its status is outdated
 
 
 class _Trainer:
@@ -23,24 +238,91 @@ class _Trainer:
         Triggers the recommender training.
         """
         params = {"overwrite_existing": overwrite}
-        response = requests.post(
-            self.endpoint_url,
-            json=params,
-            headers=get_auth_header(self.client._api_key),
-        )
-        if response.status_code != 200:
-            raise RecommendApiException(response.text)
-
-        return TrainRecommenderResponse.model_validate(response.json())
+        response = self.client._transport.post(self.endpoint_url, json=params)
+        self.client._invalidate_recommendations()
+        _SharedTrainingStatus.of(self.endpoint_url, self.client._api_key).invalidate()
+        return TrainRecommenderResponse.model_validate(response)
 
     def status(self) -> TrainingStatusResponse:
         """
         Get the training status.
         """
-        response = requests.get(
-            self.endpoint_url + "status", headers=get_auth_header(self.client._api_key)
-        )
-        if response.status_code != 200:
-            raise RecommendApiException(response.text)
+        response = self.client._transport.get(self.endpoint_url + "status")
+        status = TrainingStatusResponse.model_validate(response)
+        self.client._observe_training_state(status.status)
+        return status
+
+    def wait_until_trained(
+        self,
+        timeout: Optional[float] = None,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        max_poll_interval: float = DEFAULT_MAX_POLL_INTERVAL,
+        on_progress: Optional[TrainingProgressCallback] = None,
+    ) -> TrainingStatusResponse:
+        """
+        Block until the recommender is trained, polling the training status with intervals
+        growing from `poll_interval` to `max_poll_interval` while it does not change. Threads
+        waiting for the same recommender share their polls.
+
+        Raises:
+            TimeoutError: If the recommender is not trained after `timeout` seconds.
+            TrainingFailedException: If the training ends in the error state.
+        """
+        schedule = _PollSchedule(poll_interval, max_poll_interval, timeout)
+        shared = _SharedTrainingStatus.of(self.endpoint_url, self.client._api_key)
+        while True:
+            status = shared.fetch(self.status, schedule.interval)
+            if on_progress is not None:
+                on_progress(status, schedule.elapsed())
+            if _is_trained(status):
+                return status
+            time.sleep(schedule.next_delay(status))
+
+
+class _AsyncTrainer:
+    def __init__(self, client: "AsyncWeaviateRecommendClient"):
+        self.client = client
+        self.endpoint_url = f"{self.client.base_url}/train/"
+
+    async def train(self, overwrite: bool = False) -> TrainRecommenderResponse:
+        """
+        Triggers the recommender training.
+        """
+        params = {"overwrite_existing": overwrite}
+        response = await self.client._transport.post(self.endpoint_url, json=params)
+        self.client._invalidate_recommendations()
+        _AsyncSharedTrainingStatus.of(
+            self.endpoint_url, self.client._api_key
+        ).invalidate()
+        return TrainRecommenderResponse.model_validate(response)
+
+    async def status(self) -> TrainingStatusResponse:
+        """
+        Get the training status.
+        """
+        response = await self.client._transport.get(self.endpoint_url + "status")
+        status = TrainingStatusResponse.model_validate(response)
+        self.client._observe_training_state(status.status)
+        return status
+
+    async def wait_until_trained(
+        self,
+        timeout: Optional[float] = None,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        max_poll_interval: float = DEFAULT_MAX_POLL_INTERVAL,
+        on_progress: Optional[TrainingProgressCallback] = None,
+    ) -> TrainingStatusResponse:
+        """
+        The asyncio counterpart of `_Trainer.wait_until_trained`.
+        """
+        import asyncio
 
-        return TrainingStatusResponse.model_validate(response.json())
+        schedule = _PollSchedule(poll_interval, max_poll_interval, timeout)
+        shared = _AsyncSharedTrainingStatus.of(self.endpoint_url, self.client._api_key)
+        while True:
+            status = await shared.fetch(self.status, schedule.interval)
+            if on_progress is not None:
+                on_progress(status, schedule.elapsed())
+            if _is_trained(status):
+                return status
+            await asyncio.sleep(schedule.next_delay(status))
@@ -0,0 +1,109 @@
+import json
+import os
+from typing import IO, Any, Dict, List, Protocol, runtime_checkable
+
+
+@runtime_checkable
+class Sink(Protocol):
+    """
+    Destination of the records produced by the bulk jobs of the client.
+    """
+
+    def write(self, record: Dict[str, Any]) -> None: ...
+
+    def flush(self) -> None:
+        """
+        Persists every record written so far. Called before a job checkpoints its progress.
+        """
+        ...
+
+    def close(self) -> None: ...
+
+
+class JsonlSink:
+    """
+    Appends records to a JSON lines file, one JSON object per line.
+
+    Args:
+        path (str): Path of the file, created if it does not exist.
+        append (bool, optional): Append to an existing file instead of truncating it, which is
+            needed to resume a job. Defaults to True.
+    """
+
+    def __init__(self, path: str, append: bool = True):
+        self.path = path
+        self._file: IO[str] = open(path, "a" if append else "w", encoding="utf-8")
+
+    def write(self, record: Dict[str, Any]) -> None:
+        self._file.write(json.dumps(record, default=str))
+        self._file.write("\n")
+
+    def flush(self) -> None:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+
+class ParquetSink:
+    """
+    Writes records to numbered Parquet files in a directory. Nested values such as dicts and
+    lists of dicts are stored as JSON strings. Requires the optional `pyarrow` dependency.
+
+    Args:
+        directory (str): Directory of the Parquet files, created if it does not exist. Existing
+            files are kept and numbering continues after them, so a job can be resumed.
+        rows_per_file (int, optional): Number of records buffered before a file is written.
+            Defaults to 100_000.
+    """
+
+    def __init__(self, directory: str, rows_per_file: int = 100_000):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError as e:
+            raise ImportError(
+                "ParquetSink requires pyarrow, install it with `pip install pyarrow`"
+            ) from e
+        if rows_per_file < 1:
+            raise ValueError("rows_per_file must be positive")
+        self.directory = directory
+        self.rows_per_file = rows_per_file
+        os.makedirs(directory, exist_ok=True)
+        self._part = len(
+            [name for name in os.listdir(directory) if name.endswith(".parquet")]
+        )
+        self._rows: List[Dict[str, Any]] = []
+
+    def write(self, record: Dict[str, Any]) -> None:
+        self._rows.append(
+            {
+                key: (
+                    json.dumps(value, default=str)
+                    if isinstance(value, dict)
+                    or (
+                        isinstance(value, list) and value and isinstance(value[0], dict)
+                    )
+                    else value
+                )
+                for key, value in record.items()
+            }
+        )
+        if len(self._rows) >= self.rows_per_file:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._rows:
+            return
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        path = os.path.join(self.directory, f"part-{self._part:05d}.parquet")
+        pq.write_table(pa.Table.from_pylist(self._rows), path)
+        self._part += 1
+        self._rows = []
+
+    def close(self) -> None:
+        self.flush()
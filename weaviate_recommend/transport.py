@@ -0,0 +1,398 @@
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from weaviate_recommend.compression import _Compressor
+from weaviate_recommend.config import STREAM_CHUNK_SIZE, ConnectionConfig
+from weaviate_recommend.decoding import dumps, loads
+from weaviate_recommend.exceptions import CircuitOpenException, RecommendApiException
+from weaviate_recommend.hedging import _HedgePolicy
+from weaviate_recommend.instrumentation import (
+    RequestHook,
+    _RequestRecorder,
+    endpoint_name,
+)
+from weaviate_recommend.retry import _CircuitBreaker, _RetryPolicy, parse_retry_after
+from weaviate_recommend.utils import get_auth_header
+
+
+def _decodes_zstd() -> bool:
+    # urllib3 2 decodes zstd responses when zstandard is installed, urllib3 1 never does
+    from urllib3 import response
+
+    return bool(getattr(response, "HAS_ZSTD", False))
+
+
+class _Transport:
+    """
+    Pooled HTTP transport shared by all services of a `WeaviateRecommendClient`.
+
+    Connections are kept alive and reused between calls, so only the first request to the
+    server pays for the TCP and TLS handshakes. Failed requests are retried according to the
+    `RetryConfig` of the connection config, and requests fail fast while the optional circuit
+    breaker is open.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        config: ConnectionConfig,
+        health_url: str,
+        hooks: Optional[List[RequestHook]] = None,
+    ):
+        self.config = config
+        # called with a `RequestEvent` after every request, shared with the client
+        self.hooks: List[RequestHook] = hooks if hooks is not None else []
+        self._timeout = (config.connect_timeout, config.read_timeout)
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=config.pool_connections,
+            pool_maxsize=config.pool_maxsize,
+            pool_block=config.pool_block,
+        )
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        self._session.headers.update(get_auth_header(api_key))
+        if not config.keep_alive:
+            self._session.headers["Connection"] = "close"
+        self._compressor = (
+            _Compressor(config.compression, _decodes_zstd())
+            if config.compression is not None
+            else None
+        )
+        if self._compressor is not None:
+            self._session.headers["Accept-Encoding"] = self._compressor.accept_encoding
+        self._health_url = health_url
+        self._retry = _RetryPolicy(config.retry)
+        self._breaker = (
+            _CircuitBreaker(config.circuit_breaker)
+            if config.circuit_breaker is not None
+            else None
+        )
+        self._hedging = _HedgePolicy(config.hedge) if config.hedge is not None else None
+        # runs the attempts of hedged requests, created on the first one
+        self._hedge_executor: Optional[ThreadPoolExecutor] = None
+        self._hedge_executor_lock = threading.Lock()
+        self._hedge_max_workers = max(32, 2 * config.pool_maxsize)
+        # workers running or reserved for an attempt, a call only uses the executor when a
+        # worker is free for both of its attempts, so no attempt waits in its queue
+        self._hedge_workers_busy = 0
+
+    def _probe(self) -> None:
+        assert self._breaker is not None
+        try:
+            response = self._session.get(self._health_url, timeout=self._timeout)
+            healthy = response.status_code == 200
+        except requests.RequestException:
+            healthy = False
+        if not healthy:
+            self._breaker.record_failure()
+            raise CircuitOpenException("The service is still unhealthy")
+        self._breaker.record_success()
+
+    def _record(self, failed: bool) -> None:
+        if self._breaker is not None:
+            if failed:
+                self._breaker.record_failure()
+            else:
+                self._breaker.record_success()
+
+    def _send(
+        self,
+        method: str,
+        url: str,
+        data: Optional[bytes] = None,
+        idempotent: Optional[bool] = None,
+        recorder: Optional[_RequestRecorder] = None,
+        stream: bool = False,
+        headers: Optional[Dict[str, str]] = None,
+        observe: Optional[Callable[[float], None]] = None,
+    ) -> requests.Response:
+        """
+        Sends a request, retrying it according to the retry policy. `observe` is called with
+        the latency of every response received, without the backoff between retries.
+        """
+        retries = 0
+        while True:
+            if self._breaker is not None and self._breaker.before_request():
+                self._probe()
+            retry_after = None
+            start = time.perf_counter()
+            try:
+                response = self._session.request(
+                    method,
+                    url,
+                    data=data,
+                    headers=headers,
+                    timeout=self._timeout,
+                    stream=stream,
+                )
+            except (requests.ConnectionError, requests.Timeout):
+                self._record(failed=True)
+                if not self._retry.can_retry(retries, method, idempotent):
+                    raise
+            else:
+                if observe is not None:
+                    observe(time.perf_counter() - start)
+                if recorder is not None:
+                    recorder.status_code = response.status_code
+                self._record(failed=response.status_code >= 500)
+                if response.status_code == 200:
+                    return response
+                if not (
+                    self._retry.is_retryable_status(response.status_code)
+                    and self._retry.can_retry(retries, method, idempotent)
+                ):
+                    raise RecommendApiException(response.text, response.status_code)
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            time.sleep(self._retry.backoff(retries, retry_after))
+            retries += 1
+            if recorder is not None:
+                recorder.retries = retries
+
+    def _body(
+        self, json: Optional[Any], data: Optional[bytes]
+    ) -> Tuple[Optional[bytes], Optional[Dict[str, str]]]:
+        """
+        Serializes and compresses a request body, returns it with its extra headers.
+        """
+        if json is not None:
+            data = dumps(json)
+        if self._compressor is None:
+            return data, None
+        data, encoding = self._compressor.compress(data)
+        return data, {"Content-Encoding": encoding} if encoding is not None else None
+
+    def _executor(self) -> ThreadPoolExecutor:
+        with self._hedge_executor_lock:
+            if self._hedge_executor is None:
+                self._hedge_executor = ThreadPoolExecutor(
+                    max_workers=self._hedge_max_workers,
+                    thread_name_prefix="weaviate-recommend-hedge",
+                )
+            return self._hedge_executor
+
+    def _reserve_hedge_workers(self) -> bool:
+        with self._hedge_executor_lock:
+            if self._hedge_workers_busy + 2 > self._hedge_max_workers:
+                return False
+            self._hedge_workers_busy += 2
+            return True
+
+    def _release_hedge_worker(self) -> None:
+        with self._hedge_executor_lock:
+            self._hedge_workers_busy -= 1
+
+    def _send_hedged(
+        self,
+        method: str,
+        url: str,
+        data: Optional[bytes] = None,
+        idempotent: Optional[bool] = None,
+        recorder: Optional[_RequestRecorder] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> requests.Response:
+        """
+        `_send`, duplicated when no response arrived within the hedging delay of the endpoint.
+        The first successful response is returned, the other attempt completes in the
+        background and is discarded.
+
+        A blocking request cannot be abandoned, so the attempts run in the hedging executor.
+        When it has no free worker for both attempts, the caller sends the request itself and
+        it is not hedged, rather than queueing behind other calls under load.
+        """
+        hedging = self._hedging
+        assert hedging is not None
+        endpoint = endpoint_name(url)
+        delay = hedging.delay(endpoint)
+
+        def observe(latency: float) -> None:
+            hedging.observe(endpoint, latency)
+
+        if not self._reserve_hedge_workers():
+            return self._send(
+                method,
+                url,
+                data,
+                idempotent,
+                recorder,
+                headers=headers,
+                observe=observe,
+            )
+
+        def attempt(attempt_recorder: Optional[_RequestRecorder]) -> requests.Response:
+            try:
+                return self._send(
+                    method,
+                    url,
+                    data,
+                    idempotent,
+                    attempt_recorder,
+                    headers=headers,
+                    observe=observe,
+                )
+            finally:
+                self._release_hedge_worker()
+
+        def duplicate_attempt(
+            duplicate_recorder: _RequestRecorder,
+        ) -> requests.Response:
+            try:
+                response = attempt(duplicate_recorder)
+                duplicate_recorder.received(response.content)
+            except BaseException as e:
+                duplicate_recorder.finish(e)
+                raise
+            duplicate_recorder.finish()
+            return response
+
+        executor = self._executor()
+        pending: Set["Future[requests.Response]"] = {executor.submit(attempt, recorder)}
+        hedged = False
+        try:
+            done, _ = wait(pending, timeout=delay)
+            if not done and hedging.acquire():
+                hedged = True
+                if recorder is None:
+                    pending.add(executor.submit(attempt, None))
+                else:
+                    pending.add(
+                        executor.submit(duplicate_attempt, recorder.hedge(data))
+                    )
+        finally:
+            if not hedged:
+                # the worker reserved for the duplicate
+                self._release_hedge_worker()
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+                error = error or future.exception()
+        assert error is not None
+        raise error
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        json: Optional[Any] = None,
+        data: Optional[bytes] = None,
+        idempotent: Optional[bool] = None,
+        hedge: bool = False,
+        decode: Optional[Callable[[Any], Any]] = None,
+    ) -> Any:
+        """
+        Send a request and return the decoded JSON body. `data` can be used instead of `json`
+        to send an already serialized JSON body.
+
+        `idempotent` marks whether the request can safely be retried, by default only GET and
+        DELETE requests are. POST requests that only read data should set it to True.
+        `hedge` allows duplicating a slow request when hedging is configured, it must only be
+        set for requests that only read data.
+        `decode` is applied to the JSON body and its result returned instead, it is measured as
+        part of the deserialization of the response.
+
+        Raises:
+            RecommendApiException: If the server does not answer with a 200.
+        """
+        send = self._send_hedged if hedge and self._hedging is not None else self._send
+        if not self.hooks:
+            data, headers = self._body(json, data)
+            result = loads(send(method, url, data, idempotent, headers=headers).content)
+            return decode(result) if decode is not None else result
+        recorder = _RequestRecorder(self.hooks, method, url)
+        try:
+            data, headers = self._body(json, data)
+            recorder.serialized(data)
+            content = send(
+                method, url, data, idempotent, recorder, headers=headers
+            ).content
+            recorder.received(content)
+            result = loads(content)
+            if decode is not None:
+                result = decode(result)
+        except BaseException as e:
+            recorder.finish(e)
+            raise
+        recorder.finish()
+        return result
+
+    def stream(self, url: str, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[bytes]:
+        """
+        Send a GET request and lazily yield the chunks of the response body, without holding
+        the whole body in memory.
+
+        The request is retried like any other until the response starts. A connection lost
+        while the body is being streamed raises, as the body cannot be resumed.
+        """
+        recorder = _RequestRecorder(self.hooks, "GET", url) if self.hooks else None
+        size = 0
+        try:
+            if recorder is not None:
+                recorder.serialized(None)
+            response = self._send("GET", url, recorder=recorder, stream=True)
+            try:
+                for chunk in response.iter_content(chunk_size):
+                    size += len(chunk)
+                    yield chunk
+            finally:
+                response.close()
+            if recorder is not None:
+                recorder.received_size(size)
+        except GeneratorExit:
+            # the caller stopped reading early
+            if recorder is not None:
+                recorder.received_size(size)
+                recorder.finish()
+            raise
+        except BaseException as e:
+            if recorder is not None:
+                recorder.finish(e)
+            raise
+        if recorder is not None:
+            recorder.finish()
+
+    def ping(self, url: str) -> None:
+        """
+        Send a GET request to `url` and only check that it succeeded.
+        """
+        self._send("GET", url)
+
+    def get(self, url: str) -> Any:
+        return self.request("GET", url)
+
+    def post(
+        self,
+        url: str,
+        json: Optional[Any] = None,
+        data: Optional[bytes] = None,
+        idempotent: Optional[bool] = None,
+        hedge: bool = False,
+        decode: Optional[Callable[[Any], Any]] = None,
+    ) -> Any:
+        return self.request(
+            "POST",
+            url,
+            json=json,
+            data=data,
+            idempotent=idempotent,
+            hedge=hedge,
+            decode=decode,
+        )
+
+    def delete(self, url: str) -> Any:
+        return self.request("DELETE", url)
+
+    def close(self) -> None:
+        """
+        Close all pooled connections.
+        """
+        if self._hedge_executor is not None:
+            self._hedge_executor.shutdown(wait=False)
+        self._session.close()